@@ -1,15 +1,17 @@
 import os
 import pickle
+import time
 
 import cv2 as cv
 import face_recognition
 import firebase_admin
 import numpy as np
 import pyttsx3
-import speech_recognition as sr
 from firebase_admin import credentials, firestore
 
 from auth.encode import encode_and_upload_faces
+from scripts.asr import get_backend
+from scripts.audio_capture import AudioCapture
 
 
 # --------- CONFIG ---------
@@ -32,16 +34,39 @@ def speak(audio: str):
 
 
 # --------- SR Helper ----------
+# main.py hands over its capture stream, utterance queue and ASR backend
+# (share_capture), so enrollment doesn't open a second microphone and
+# recognizes with the same backend; run on its own, faceauth starts a
+# capture stream of its own on first use
+_CAPTURE = None
+_UTTERANCES = None
+_ASR_BACKEND = None     # None = $LEO_ASR_BACKEND or "google"
+
+
+def share_capture(capture: AudioCapture, utterances, asr_backend=None):
+    global _CAPTURE, _UTTERANCES, _ASR_BACKEND
+    _CAPTURE, _UTTERANCES, _ASR_BACKEND = capture, utterances, asr_backend
+
+
+def _capture():
+    global _CAPTURE, _UTTERANCES
+    if _CAPTURE is None:
+        _CAPTURE = AudioCapture()
+        _CAPTURE.start()
+        _CAPTURE.calibrate(seconds=0.7)
+        _UTTERANCES = _CAPTURE.subscribe_utterances()
+    return _CAPTURE, _UTTERANCES
+
+
 def listen_for_command() -> str:
-    r = sr.Recognizer()
-    with sr.Microphone() as source:
-        print("Listening for command...")
-        r.adjust_for_ambient_noise(source, duration=0.7)
-        audio = r.listen(source)
+    capture, utterances = _capture()
+    print("Listening for command...")
+    # only speech that starts after the prompt was spoken
+    utt = capture.next_utterance(utterances, since=time.monotonic()).wait()
 
     try:
         print("Recognizing...")
-        command = r.recognize_google(audio, language="en-in")
+        command = get_backend(_ASR_BACKEND).transcribe(utt.pcm, utt.sample_rate)
         print(f"User said: {command}\n")
         return command.lower()
     except Exception as e:
@@ -0,0 +1,123 @@
+"""
+Per-backend ASR latency and word error rate on a WAV fixture set.
+
+Fixtures layout (16-bit mono WAV + reference transcript with the same stem):
+
+    benchmarks/fixtures/asr/turn_on_youtube.wav
+    benchmarks/fixtures/asr/turn_on_youtube.txt   "play arijit singh on youtube"
+
+Frames are fed in 30 ms chunks as if they were live, so for streaming
+backends the numbers include when the first partial appeared and how
+long the final result took after the last frame (end-of-speech latency).
+A small synthesized set is committed (benchmarks/make_fixtures.py).
+
+Usage:
+    python benchmarks/bench_asr.py --backends vosk google [--json]
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+import wave
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.asr import ASRServiceError, UnknownSpeech, get_backend
+
+FRAME_MS = 30
+
+
+def words(text: str):
+    return re.sub(r"[^a-z0-9' ]", " ", text.lower()).split()
+
+
+def word_errors(ref, hyp) -> int:
+    """Levenshtein distance over words."""
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i]
+        for j, h in enumerate(hyp, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h)))
+        prev = cur
+    return prev[-1]
+
+
+def read_wav(path: Path):
+    with wave.open(str(path), "rb") as w:
+        if w.getsampwidth() != 2 or w.getnchannels() != 1:
+            raise ValueError(f"{path.name}: expected 16-bit mono")
+        return w.readframes(w.getnframes()), w.getframerate()
+
+
+def run_backend(name, clips):
+    backend = get_backend(name)
+    errors = ref_words = 0
+    final_lat, first_partial = [], []
+
+    for wav, ref in clips:
+        pcm, rate = read_wav(wav)
+        step = rate * FRAME_MS // 1000 * 2
+        stream = backend.start_stream(rate)
+
+        seen_partial = None
+        for i in range(0, len(pcm), step):
+            if stream.accept(pcm[i:i + step]) and seen_partial is None:
+                seen_partial = (i + step) / 2 / rate
+
+        t0 = time.perf_counter()
+        try:
+            hyp = stream.finish()
+        except (UnknownSpeech, ASRServiceError):
+            hyp = ""
+        final_lat.append(time.perf_counter() - t0)
+        if seen_partial is not None:
+            first_partial.append(seen_partial)
+
+        r = words(ref)
+        errors += word_errors(r, words(hyp))
+        ref_words += len(r)
+
+    def pct(values, q):
+        if not values:
+            return None
+        values = sorted(values)
+        return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+    return {
+        "backend": backend.name,
+        "clips": len(clips),
+        "wer": errors / max(1, ref_words),
+        "final_latency_ms_p50": pct(final_lat, 0.5),
+        "final_latency_ms_p95": pct(final_lat, 0.95),
+        "first_partial_ms_p50": statistics.median(first_partial) * 1000 if first_partial else None,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backends", nargs="+", default=["vosk", "google"])
+    ap.add_argument("--fixtures", default=str(ROOT / "benchmarks" / "fixtures" / "asr"))
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    fixtures = Path(args.fixtures)
+    clips = [(w, w.with_suffix(".txt").read_text().strip())
+             for w in sorted(fixtures.glob("*.wav")) if w.with_suffix(".txt").exists()]
+    if not clips:
+        sys.exit(f"No .wav/.txt fixture pairs under {fixtures}")
+
+    results = [run_backend(name, clips) for name in args.backends]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for res in results:
+        print(" ".join(f"{k}={v}" for k, v in res.items()))
+
+
+if __name__ == "__main__":
+    main()
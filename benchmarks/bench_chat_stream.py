@@ -0,0 +1,100 @@
+"""
+Time-to-first-word of a streamed chat reply vs waiting for the whole reply.
+
+A local fake Gemini endpoint streams a multi-sentence answer in small
+chunks. "blocking" is the old behaviour: wait for the complete text,
+then split it and hand the first sentence to TTS. "streaming" feeds
+chat_stream() through the SentenceChunker and hands over each sentence
+as soon as it is complete. Reported times are from the request to the
+moment the first sentence reaches TTS (synthesis time is the same for
+both and not included).
+
+Usage:
+    python benchmarks/bench_chat_stream.py [--latency 0.3] [--token-delay 0.04] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_llm_server import FakeLLMServer
+from scripts import llm_backend, conversation_llm
+from scripts.response_cache import ResponseCache
+from scripts.tts_stream import SentenceChunker, split_sentences
+
+REPLY = ("Sure, here is the plan for tomorrow. You have a meeting with the design team at ten, "
+         "then lunch with Ashu at one. In the evening the gym closes early, so go before six. "
+         "Oh, and it might rain, so take an umbrella.")
+
+
+async def blocking():
+    t0 = time.perf_counter()
+    text = "".join([f async for f in conversation_llm.chat_stream("plan")])
+    first = split_sentences(text)[0]
+    return time.perf_counter() - t0, first, time.perf_counter() - t0
+
+
+async def streaming():
+    t0 = time.perf_counter()
+    chunker = SentenceChunker()
+    first_at, first = None, None
+    async for fragment in conversation_llm.chat_stream("plan"):
+        for sentence in chunker.feed(fragment):
+            if first_at is None:
+                first_at, first = time.perf_counter() - t0, sentence
+    if first_at is None:
+        first_at, first = time.perf_counter() - t0, chunker.flush()[0]
+    return first_at, first, time.perf_counter() - t0
+
+
+async def run(latency, token_delay, rounds):
+    rows = []
+    # every round must reach the fake server: no reply cache, no growing history
+    conversation_llm.CACHE = ResponseCache(Path(tempfile.mkdtemp()) / "responses.json", max_entries=0)
+    with FakeLLMServer(latency=latency, reply=REPLY, token_delay=token_delay) as server:
+        llm_backend.register_backend("gemini", lambda: llm_backend.GeminiBackend(endpoint=server.url))
+        for name, fn in (("blocking", blocking), ("streaming", streaming)):
+            firsts, totals = [], []
+            for _ in range(rounds):
+                conversation_llm.MEMORY.clear()
+                first_at, first, total = await fn()
+                firsts.append(first_at)
+                totals.append(total)
+            rows.append({
+                "mode": name,
+                "first_sentence_ms": sum(firsts) / rounds * 1000,
+                "full_reply_ms": sum(totals) / rounds * 1000,
+                "first_sentence": first,
+            })
+        await llm_backend.get_backend().aclose()
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", type=float, default=0.3, help="seconds before the first chunk")
+    ap.add_argument("--token-delay", type=float, default=0.04, help="seconds between chunks")
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    rows = asyncio.run(run(args.latency, args.token_delay, args.rounds))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'mode':>10} {'first sentence ms':>18} {'full reply ms':>14}")
+    for r in rows:
+        print(f"{r['mode']:>10} {r['first_sentence_ms']:>18.0f} {r['full_reply_ms']:>14.0f}")
+    print(f"first sentence: {rows[-1]['first_sentence']!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Microbenchmark: table-driven command matching vs the old substring chains.
+
+Generates a few thousand synthetic utterances (YouTube-mode and top-level),
+runs both routers over them and reports throughput plus how often the two
+disagree (the disagreements are the ordering / substring bugs the table
+fixes, e.g. "play next song" toggling playback).
+
+Usage:
+    python benchmarks/bench_commands.py [--n 5000] [--json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.commands import MAIN_COMMANDS, YOUTUBE_COMMANDS
+
+YOUTUBE_UTTERANCES = [
+    "pause", "play", "pause the video", "play next song", "next", "previous song",
+    "skip ad", "skip the ad", "skip", "faster please", "increase speed", "slower",
+    "decrease speed", "set speed to 1.5", "speed 2", "forward", "go forward 10 seconds",
+    "rewind", "go backward", "volume 40", "set the volume to 70", "mute", "unmute",
+    "close youtube", "exit youtube", "what is this song", "play it again",
+]
+MAIN_UTTERANCES = [
+    "open youtube", "play arijit singh", "send hello to ashu", "read messages from sonu",
+    "reply i am coming", "brightness 40", "set brightness to 80", "good night",
+    "exit", "what is the weather today", "tell me a joke", "are you ready",
+    "who made you", "already done with that",
+]
+FILLERS = ["", "leo ", "hey ", "please ", "can you "]
+
+
+def old_youtube(cmd):
+    if "pause" in cmd or "play" in cmd:
+        return "toggle"
+    elif "next" in cmd:
+        return "next"
+    elif "previous" in cmd:
+        return "previous"
+    elif "skip ad" in cmd or "skip the ad" in cmd or cmd.strip() == "skip":
+        return "skip_ad"
+    elif "faster" in cmd or "increase speed" in cmd:
+        return "faster"
+    elif "slower" in cmd or "decrease speed" in cmd:
+        return "slower"
+    elif "speed" in cmd:
+        return "speed"
+    elif "forward" in cmd:
+        return "forward"
+    elif "rewind" in cmd or "backward" in cmd:
+        return "rewind"
+    elif "volume" in cmd:
+        return "volume"
+    elif "mute" in cmd or "unmute" in cmd:
+        return "mute"
+    elif "exit youtube" in cmd or "close youtube" in cmd:
+        return "close"
+    return None
+
+
+def old_main(query):
+    if "youtube" in query or "play" in query:
+        return "youtube"
+    if "send" in query or "read" in query or "reply" in query:
+        return "telegram"
+    if "brightness" in query:
+        return "brightness"
+    if "good night" in query or "exit" in query:
+        return "exit"
+    return None
+
+
+def corpus(base, n, rng):
+    return [rng.choice(FILLERS) + rng.choice(base) for _ in range(n)]
+
+
+def bench(fn, items, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for it in items:
+            fn(it)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=5000)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    results = {}
+    for label, base, old, table in [
+        ("youtube", YOUTUBE_UTTERANCES, old_youtube, YOUTUBE_COMMANDS),
+        ("main", MAIN_UTTERANCES, old_main, MAIN_COMMANDS),
+    ]:
+        items = corpus(base, args.n, rng)
+
+        def new(text, table=table):
+            m = table.match(text)
+            return m.name if m else None
+
+        t_old = bench(old, items)
+        t_new = bench(new, items)
+        disagree = sorted({it for it in items if old(it) != new(it)})
+        results[label] = {
+            "utterances": len(items),
+            "old_us_per_utterance": t_old / len(items) * 1e6,
+            "table_us_per_utterance": t_new / len(items) * 1e6,
+            "routing_changes": len(disagree),
+            "examples": [(it, old(it), new(it)) for it in disagree[:8]],
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for label, r in results.items():
+        print(f"[{label}] {r['utterances']} utterances: "
+              f"old {r['old_us_per_utterance']:.2f} us, table {r['table_us_per_utterance']:.2f} us, "
+              f"{r['routing_changes']} routing changes")
+        for it, o, n in r["examples"]:
+            print(f"    {it!r}: {o} -> {n}")
+
+
+if __name__ == "__main__":
+    main()
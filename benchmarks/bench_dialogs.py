@@ -0,0 +1,132 @@
+"""
+find_dialog() name resolution: the old linear substring scan vs the
+DialogIndex, on synthetic dialog lists of growing size (200 familiar
+names plus a long tail of made-up ones).
+
+Queries are a mix of exact names, surnames, prefixes ("ash") and misses.
+Besides the time per lookup, reports how often the two disagree; the old
+scan returns the first dialog in list order that contains the text.
+A second set of queries is spelled the way ASR hears names ("aashu",
+"preeya"); the old scan finds none of them, the index matches by sound.
+
+Usage:
+    python benchmarks/bench_dialogs.py [--sizes 200 2000 20000] [--json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.dialog_index import DialogIndex
+
+FIRST = ["ashu", "ashwin", "asha", "rahul", "ramesh", "priya", "neha", "amit", "sunil", "kiran",
+         "deepak", "pooja", "vikram", "anil", "meera", "rohit", "sneha", "arjun", "kavya", "yeshu"]
+LAST = ["kumar", "sharma", "rao", "patel", "singh", "gupta", "iyer", "das", "khan", "joshi"]
+GROUPS = ["college", "family", "office", "cricket", "trip", "flat", "gym", "school"]
+
+
+SYLLABLES = ["ka", "ri", "to", "ne", "sa", "mi", "lo", "ve", "du", "pa", "ra", "gi", "ho", "be", "ta",
+             "shi", "va", "no", "ze", "lu", "ma", "ji", "fe", "co", "ya", "na", "de", "bo", "ti", "ru"]
+
+
+def _made_up_name(rng):
+    return " ".join("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+                    for _ in range(2))
+
+
+def make_dialogs(n, rng, known=200):
+    """`known` familiar names (shared first names, groups); the long tail is made-up names."""
+    dialogs = []
+    for i in range(n):
+        if i >= known:
+            name = _made_up_name(rng)
+        elif i % 7 == 0:
+            name = f"{rng.choice(GROUPS).title()} {rng.choice(['Group', 'Gang', 'Friends'])} {i}"
+        else:
+            name = f"{rng.choice(FIRST).title()} {rng.choice(LAST).title()}"
+            if i % 3:
+                name += f" {i}"
+        dialogs.append(SimpleNamespace(id=i, name=name))
+    rng.shuffle(dialogs)
+    # the chats you actually talk to, somewhere down the list
+    for name in ("Ashu", "Mom", "Dad", "Priya Joshi", "Yeshu Iyer", "Kavya Das"):
+        dialogs.insert(rng.randrange(len(dialogs)), SimpleNamespace(id=-len(dialogs), name=name))
+    return dialogs
+
+
+def linear(dialogs, name):
+    name = name.lower().strip()
+    for d in dialogs:
+        if d.name and name in d.name.lower():
+            return d
+    return None
+
+
+MISHEARD = {"aashu": "Ashu", "ashoo": "Ashu", "mum": "Mom", "preeya joshi": "Priya Joshi",
+            "yeshoo iyer": "Yeshu Iyer", "kavia das": "Kavya Das"}
+
+
+def run(sizes, rounds):
+    rng = random.Random(7)
+    queries = ["ashu", "mom", "dad", "kumar", "ash", "college group", "yeshu iyer", "nobody here"]
+    rows = []
+    for n in sizes:
+        dialogs = make_dialogs(n, rng)
+        t0 = time.perf_counter()
+        index = DialogIndex(dialogs)
+        build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            old = [linear(dialogs, q) for q in queries]
+        t_old = (time.perf_counter() - t0) / (rounds * len(queries))
+
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            new = [index.best(q) for q in queries]
+        t_new = (time.perf_counter() - t0) / (rounds * len(queries))
+
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            heard = {q: index.best(q) for q in MISHEARD}
+        t_heard = (time.perf_counter() - t0) / (rounds * len(MISHEARD))
+        resolved = sum(1 for q, m in heard.items() if m and m.dialog.name.startswith(MISHEARD[q]))
+
+        differ = {q: [o.name if o else None, m.dialog.name if m else None]
+                  for q, o, m in zip(queries, old, new) if (o and o.name) != (m and m.dialog.name)}
+        rows.append({"dialogs": len(dialogs), "build_ms": build * 1000,
+                     "linear_us": t_old * 1e6, "index_us": t_new * 1e6,
+                     "misheard_us": t_heard * 1e6, "misheard_resolved": resolved,
+                     "misheard_total": len(MISHEARD), "differ": differ})
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[200, 2000, 20000])
+    ap.add_argument("--rounds", type=int, default=50)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    rows = run(args.sizes, args.rounds)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'dialogs':>8} {'build ms':>9} {'linear us':>10} {'index us':>9} {'misheard us':>12} {'resolved':>9}")
+    for r in rows:
+        print(f"{r['dialogs']:>8} {r['build_ms']:>9.1f} {r['linear_us']:>10.1f} {r['index_us']:>9.1f} "
+              f"{r['misheard_us']:>12.1f} {r['misheard_resolved']:>5}/{r['misheard_total']}")
+    print("different picks (linear -> index):")
+    for q, (old, new) in rows[0]["differ"].items():
+        print(f"  {q!r}: {old!r} -> {new!r}")
+
+
+if __name__ == "__main__":
+    main()
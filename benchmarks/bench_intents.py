@@ -0,0 +1,199 @@
+"""
+Intent-parsing accuracy and latency on the labelled corpus.
+
+benchmarks/data/intents.jsonl holds utterances with the intent they
+should produce ({"text": ..., "expected": {"action": ..., slots...}}).
+Only the slots listed in "expected" are checked.
+
+Two modes are scored:
+  rules     rule_parse_scored() alone
+  pipeline  parse_many(): rules, and the LLM for anything the rules are
+            unsure about. The LLM is a local mock that answers with the
+            labelled intent after a fixed latency plus a per-utterance
+            deterministic jitter, so the mode measures the routing and
+            plumbing (and any rule that is confidently wrong), not the
+            model.
+
+Reports accuracy per action, slot exact-match, p50/p95 latency of the
+rule path and of the LLM path. --json prints the results as JSON, --out
+saves them, --compare prints the difference to a saved run.
+
+Usage:
+    python benchmarks/bench_intents.py [--llm-latency 0.2] [--out run.json] [--compare base.json]
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_llm_server import FakeLLMServer
+from scripts import llm_backend, nlp_controller
+
+CORPUS = ROOT / "benchmarks" / "data" / "intents.jsonl"
+
+
+def load_corpus(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def _norm(v):
+    return v.strip().lower() if isinstance(v, str) else v
+
+
+def slots_match(expected, got):
+    return all(_norm(got.get(k)) == _norm(v) for k, v in expected.items() if k != "action")
+
+
+def score(items, intents):
+    per_action = defaultdict(lambda: {"n": 0, "correct": 0, "slots_exact": 0})
+    failures = []
+    for item, got in zip(items, intents):
+        exp = item["expected"]
+        row = per_action[exp["action"]]
+        row["n"] += 1
+        if got.get("action") == exp["action"]:
+            row["correct"] += 1
+            if slots_match(exp, got):
+                row["slots_exact"] += 1
+                continue
+        failures.append({"text": item["text"], "expected": exp, "got": got})
+
+    for row in per_action.values():
+        row["accuracy"] = row["correct"] / row["n"]
+        row["slot_exact_match"] = row["slots_exact"] / row["n"]
+    n = len(items)
+    return {
+        "accuracy": sum(r["correct"] for r in per_action.values()) / n,
+        "slot_exact_match": sum(r["slots_exact"] for r in per_action.values()) / n,
+        "per_action": dict(sorted(per_action.items())),
+        "failures": failures,
+    }
+
+
+def run_rules(items, repeat):
+    intents, lat = [], []
+    for item in items:
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            intent, _ = nlp_controller.rule_parse_scored(item["text"])
+        lat.append((time.perf_counter() - t0) / repeat)
+        intents.append(intent)
+    return intents, lat
+
+
+async def _pipeline_parse(text):
+    """One utterance through parse_many(), timed on its own."""
+    async for r in nlp_controller.parse_many([text]):
+        return r.intent
+
+
+async def run_pipeline(items, llm_latency, jitter):
+    oracle = {item["text"]: json.dumps(item["expected"]) for item in items}
+    intents, llm_lat = [], []
+    with FakeLLMServer(latency=llm_latency, jitter=jitter,
+                       responder=lambda text: oracle.get(text, '{"action": "none"}')) as server:
+        llm_backend.register_backend("gemini", lambda: llm_backend.GeminiBackend(endpoint=server.url))
+        await _pipeline_parse("warm up")   # connection + imports, not measured
+        for item in items:
+            _, confidence = nlp_controller.rule_parse_scored(item["text"])
+            t0 = time.perf_counter()
+            intents.append(await _pipeline_parse(item["text"]))
+            if confidence < nlp_controller.CONFIDENCE_THRESHOLD:
+                llm_lat.append(time.perf_counter() - t0)
+        await llm_backend.get_backend().aclose()
+    return intents, llm_lat
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(result):
+    for mode in ("rules", "pipeline"):
+        r = result[mode]
+        print(f"== {mode}: accuracy {r['accuracy']:.1%}, slot exact-match {r['slot_exact_match']:.1%}")
+        print(f"   {'action':22s} {'n':>3} {'acc':>6} {'slots':>6}")
+        for action, row in r["per_action"].items():
+            print(f"   {action:22s} {row['n']:>3} {row['accuracy']:>6.0%} {row['slot_exact_match']:>6.0%}")
+    lat = result["latency"]
+    print(f"rule path  p50 {lat['rule_p50_us']:.1f} us   p95 {lat['rule_p95_us']:.1f} us")
+    if lat["llm_p50_ms"] is not None:
+        print(f"LLM path   p50 {lat['llm_p50_ms']:.0f} ms   p95 {lat['llm_p95_ms']:.0f} ms   "
+              f"({lat['llm_calls']} of {result['items']} utterances, mock latency {result['llm_latency_s']}s)")
+
+
+def print_compare(result, base):
+    print(f"-- vs {base.get('commit') or 'baseline'}")
+    for mode in ("rules", "pipeline"):
+        for key in ("accuracy", "slot_exact_match"):
+            d = result[mode][key] - base[mode][key]
+            print(f"   {mode:8s} {key:17s} {base[mode][key]:.1%} -> {result[mode][key]:.1%} ({d:+.1%})")
+    for key in ("rule_p50_us", "rule_p95_us", "llm_p50_ms", "llm_p95_ms"):
+        old, new = base["latency"].get(key), result["latency"].get(key)
+        if old and new:
+            print(f"   {key:26s} {old:.1f} -> {new:.1f} ({(new - old) / old:+.0%})")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default=str(CORPUS))
+    ap.add_argument("--llm-latency", type=float, default=0.2, help="mock LLM base latency (s)")
+    ap.add_argument("--jitter", type=float, default=0.1, help="extra deterministic per-utterance latency (s)")
+    ap.add_argument("--repeat", type=int, default=200, help="rule parser runs per utterance for timing")
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    ap.add_argument("--out", help="save results as JSON")
+    ap.add_argument("--compare", help="previous --out file to diff against")
+    args = ap.parse_args()
+
+    items = load_corpus(args.corpus)
+    rule_intents, rule_lat = run_rules(items, args.repeat)
+    pipe_intents, llm_lat = asyncio.run(run_pipeline(items, args.llm_latency, args.jitter))
+
+    result = {
+        "commit": git_commit(),
+        "items": len(items),
+        "llm_latency_s": args.llm_latency,
+        "rules": score(items, rule_intents),
+        "pipeline": score(items, pipe_intents),
+        "latency": {
+            "rule_p50_us": percentile(rule_lat, 50) * 1e6,
+            "rule_p95_us": percentile(rule_lat, 95) * 1e6,
+            "llm_calls": len(llm_lat),
+            "llm_p50_ms": percentile(llm_lat, 50) * 1000 if llm_lat else None,
+            "llm_p95_ms": percentile(llm_lat, 95) * 1000 if llm_lat else None,
+        },
+    }
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, indent=2))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+    if args.compare:
+        print_compare(result, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+route_within() against a local fake LLM with growing latency.
+
+The utterance is one the rules are unsure about, so the LLM is asked,
+with the rule result as the fallback. Below the deadline the LLM answer
+should win; above it the rule result should come back at the deadline
+and the LLM request be cancelled.
+
+Usage:
+    python benchmarks/bench_parse_deadline.py [--deadline 1.0] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_llm_server import FakeLLMServer
+from scripts import conversation_llm, llm_backend, nlp_controller
+from scripts.response_cache import ResponseCache
+
+UTTERANCE = "send to ashu hi there"   # rules: confidence 0.7, asks the LLM
+LLM_REPLY = '{"action": "send_telegram", "target": "ashu", "message": "from the llm"}'
+
+
+async def run(deadline, latencies):
+    rows = []
+    # every round must reach the fake server: no reply cache, no growing history
+    conversation_llm.CACHE = ResponseCache(Path(tempfile.mkdtemp()) / "responses.json", max_entries=0)
+    fallback = nlp_controller.rule_based_parse(UTTERANCE)
+    with FakeLLMServer(reply=LLM_REPLY) as server:
+        llm_backend.register_backend("gemini", lambda: llm_backend.GeminiBackend(endpoint=server.url))
+        for latency in latencies:
+            server.latency = latency
+            conversation_llm.MEMORY.clear()
+            t0 = time.perf_counter()
+            intent, _ = await conversation_llm.route_within(UTTERANCE, fallback, deadline=deadline)
+            rows.append({
+                "llm_latency_s": latency,
+                "deadline_s": deadline,
+                "wall_ms": (time.perf_counter() - t0) * 1000,
+                "winner": "llm" if intent and intent.get("message") == "from the llm" else "rules",
+            })
+        await llm_backend.get_backend().aclose()
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--deadline", type=float, default=1.0)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    rows = asyncio.run(run(args.deadline, [0.05, 0.25, 0.5, 0.9, 1.5, 3.0]))
+    stats = nlp_controller.parse_stats()
+
+    if args.json:
+        print(json.dumps({"rows": rows, "stats": stats}, indent=2))
+        return
+    print(f"{'llm s':>6} {'deadline':>8} {'wall ms':>8} {'winner':>7}")
+    for r in rows:
+        print(f"{r['llm_latency_s']:>6.2f} {r['deadline_s']:>8.2f} {r['wall_ms']:>8.0f} {r['winner']:>7}")
+    print(f"LLM answers: {stats['routed']}, deadline misses (cancelled): {stats['route_timeout']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Turn latency for utterances the local rules can't place: the old
+two-call path vs one route_or_answer() call.
+
+A local fake Gemini endpoint answers every request after `latency`
+seconds (streamed replies then arrive in small chunks).
+
+  two-call  parse_many() asks the LLM for an intent; when that comes
+            back "none", chat_stream() asks again for an answer
+  routed    route_or_answer(): one request that returns either the
+            intent or the start of the answer
+
+Times are from the request to the intent being known, or to the first
+complete sentence of the answer being ready for TTS.
+
+Usage:
+    python benchmarks/bench_route.py [--latency 0.4] [--token-delay 0.04] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_llm_server import FakeLLMServer
+from scripts import conversation_llm, llm_backend, nlp_controller
+from scripts.response_cache import ResponseCache
+from scripts.tts_stream import SentenceChunker
+
+# "send" routes it to Telegram, but the rules find no action in it
+QUESTION = "what should i send my sister for her birthday"
+ANSWER = ("A nice watch or a book by her favourite author would be lovely. "
+          "If she likes plants, a small bonsai is a fun pick too.")
+ACTION = "message ashu that i'm running ten minutes late"
+INTENT = '{"action": "send_telegram", "target": "ashu", "message": "running ten minutes late"}'
+
+
+async def first_sentence(fragments):
+    chunker = SentenceChunker()
+    async for fragment in fragments:
+        sentences = chunker.feed(fragment)
+        if sentences:
+            await fragments.aclose()
+            return sentences[0]
+    return (chunker.flush() or [""])[0]
+
+
+async def two_call(server, text, answer):
+    server.reply = '{"action": "none"}' if answer else INTENT
+    intent = [r.intent async for r in nlp_controller.parse_many([text])][0]
+    if intent.get("action", "none") != "none":
+        return intent
+    server.reply = answer
+    return await first_sentence(conversation_llm.chat_stream(text))
+
+
+async def routed(server, text, answer):
+    server.reply = answer or INTENT
+    intent, fragments = await conversation_llm.route_or_answer(text)
+    return intent if fragments is None else await first_sentence(fragments)
+
+
+async def run(latency, token_delay, rounds):
+    rows = []
+    # every round must reach the fake server: no reply cache, no growing history
+    conversation_llm.CACHE = ResponseCache(Path(tempfile.mkdtemp()) / "responses.json", max_entries=0)
+    with FakeLLMServer(latency=latency, token_delay=token_delay) as server:
+        llm_backend.register_backend("gemini", lambda: llm_backend.GeminiBackend(endpoint=server.url))
+        for case, text, answer in (("answer", QUESTION, ANSWER), ("action", ACTION, None)):
+            for name, fn in (("two-call", two_call), ("routed", routed)):
+                times, requests = [], server.requests
+                for _ in range(rounds):
+                    conversation_llm.MEMORY.clear()
+                    t0 = time.perf_counter()
+                    result = await fn(server, text, answer)
+                    times.append(time.perf_counter() - t0)
+                rows.append({
+                    "case": case,
+                    "mode": name,
+                    "ms": sum(times) / rounds * 1000,
+                    "llm_calls": (server.requests - requests) / rounds,
+                    "result": result,
+                })
+        await llm_backend.get_backend().aclose()
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", type=float, default=0.4, help="seconds before each reply")
+    ap.add_argument("--token-delay", type=float, default=0.04, help="seconds between streamed chunks")
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    rows = asyncio.run(run(args.latency, args.token_delay, args.rounds))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'case':>7} {'mode':>9} {'ms':>7} {'LLM calls':>10}  result")
+    for r in rows:
+        print(f"{r['case']:>7} {r['mode']:>9} {r['ms']:>7.0f} {r['llm_calls']:>10.0f}  {r['result']}")
+
+
+if __name__ == "__main__":
+    main()
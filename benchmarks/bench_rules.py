@@ -0,0 +1,149 @@
+"""
+Speed of the compiled intent grammar vs the old rule_based_parse().
+
+A synthetic corpus of utterances is generated from command templates
+(random contacts, messages, songs) preceded by growing amounts of
+unrelated chatter, the way long ASR transcripts look. "plain" chatter
+has no command words; "noisy" chatter (someone talking about texts
+and messages in the background) keeps hitting keywords without ever
+completing a command, which is where the old greedy patterns
+backtrack. Reports utterances per second for both parsers (best of
+three runs) and how often they pick a different action.
+
+The grammar is only faster on long transcripts (a couple of hundred
+words of keyword chatter and up). On short commands it runs at roughly
+0.6-0.9x the old parser, lowest when the chatter keeps hitting keywords;
+what it buys there is the earliest-command-wins behaviour, not speed.
+
+Usage:
+    python benchmarks/bench_rules.py [--n 20000] [--json]
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.intent_grammar import INTENT_GRAMMAR
+
+NAMES = ["ashu", "mom", "rahul", "priya", "dad", "office", "family"]
+MESSAGES = ["hello bro", "i will be late", "call me when you are free", "ok", "dinner at eight tonight"]
+SONGS = ["believer", "shape of you", "lofi beats", "kesariya"]
+TEMPLATES = [
+    "set brightness to {n}",
+    "brightness {n}",
+    "increase brightness",
+    "brightness down",
+    "read messages from {name}",
+    "check the latest messages from {name}",
+    "send message to {name} saying {msg}",
+    "send a telegram message to {name} {msg}",
+    "send to {name} {msg}",
+    "send message to the group {name} {msg}",
+    "reply to {name} {msg}",
+    "reply {msg}",
+    "play {song} on youtube",
+    "play {song}",
+    "what is the weather like today",
+    "tell me a joke",
+]
+CHATTER = {
+    "plain": ("so um yeah i was thinking that maybe we could do this now or later "
+              "because the weather is nice and everything is fine really").split(),
+    "noisy": ("i read the text message my friend sent and then we talked about "
+              "the news and checked the messages again").split(),
+}
+
+
+def legacy_rule_parse(text):
+    """rule_based_parse() as it was before the grammar (sequential re.search)."""
+    t = text.lower().strip()
+    m = re.search(r"brightness.*?(\d{1,3})", t)
+    if m:
+        return {"action": "brightness_set", "value": max(0, min(100, int(m.group(1))))}
+    if "increase brightness" in t or "brightness up" in t:
+        return {"action": "brightness_increase", "step": 10}
+    if "decrease brightness" in t or "brightness down" in t:
+        return {"action": "brightness_decrease", "step": 10}
+    m = re.search(r"(?:read|check).*(?:message|messages).*from\s+([a-zA-Z0-9\s]+)", t)
+    if m:
+        return {"action": "read_telegram", "target": m.group(1).strip()}
+    m = re.search(r"(?:send|message|text).*to\s+([a-zA-Z0-9\s]+)\s+(.*)", t)
+    if m:
+        return {"action": "send_telegram", "target": m.group(1).strip(), "message": m.group(2).strip()}
+    m = re.search(r"send\s+to\s+([a-zA-Z0-9\s]+)\s+(.*)", t)
+    if m:
+        return {"action": "send_telegram", "target": m.group(1).strip(), "message": m.group(2).strip()}
+    m = re.search(r"reply\s+to\s+([a-zA-Z0-9\s]+)\s+(.*)", t)
+    if m:
+        return {"action": "reply_telegram", "target": m.group(1).strip(), "message": m.group(2).strip()}
+    m = re.search(r"reply\s+(.*)", t)
+    if m:
+        return {"action": "reply_telegram", "target": None, "message": m.group(1).strip()}
+    if "youtube" in t or "play" in t:
+        return {"action": "open_youtube", "query": t.replace("play", "").replace("on youtube", "").strip()}
+    return {"action": "none"}
+
+
+def make_corpus(n, pool, chatter_words, rng):
+    out = []
+    for _ in range(n):
+        cmd = rng.choice(TEMPLATES).format(
+            n=rng.randint(0, 100), name=rng.choice(NAMES),
+            msg=rng.choice(MESSAGES), song=rng.choice(SONGS))
+        before = [rng.choice(CHATTER[pool]) for _ in range(rng.randint(0, chatter_words))]
+        out.append(" ".join(before + [cmd]))
+    return out
+
+
+def timed(fn, items, repeat=3):
+    """Best rate of `repeat` runs, so one slow run doesn't decide the comparison."""
+    best = 0.0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        results = [fn(it) for it in items]
+        best = max(best, len(items) / (time.perf_counter() - t0))
+    return best, results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    rows = []
+    for pool, chatter in (("plain", 0), ("plain", 10), ("plain", 50),
+                          ("noisy", 50), ("noisy", 200), ("noisy", 800)):
+        # long transcripts are rare, keep the run time reasonable
+        n = args.n if chatter <= 50 else max(1, args.n // 20)
+        items = make_corpus(n, pool, chatter, rng)
+        old_rate, old_res = timed(legacy_rule_parse, items)
+        new_rate, new_res = timed(lambda t: INTENT_GRAMMAR.match(t)[0], items)
+        rows.append({
+            "chatter": pool,
+            "chatter_words": chatter,
+            "old_per_s": old_rate,
+            "new_per_s": new_rate,
+            "speedup": new_rate / old_rate,
+            "action_differs": sum(o["action"] != n["action"] for o, n in zip(old_res, new_res)),
+        })
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'chatter':>7} {'words':>5} {'old utt/s':>11} {'new utt/s':>11} {'speedup':>8} {'differs':>8}")
+    for r in rows:
+        print(f"{r['chatter']:>7} {r['chatter_words']:>5} {r['old_per_s']:>11.0f} {r['new_per_s']:>11.0f} "
+              f"{r['speedup']:>8.2f} {r['action_differs']:>8}")
+
+
+if __name__ == "__main__":
+    main()
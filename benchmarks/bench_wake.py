@@ -0,0 +1,110 @@
+"""
+Wake-word spotter benchmark on recorded WAV fixtures (runs fully offline).
+
+Fixtures layout (16-bit mono WAV, any sample rate):
+
+    benchmarks/fixtures/wake/positive/*.wav   clips that contain a wake phrase
+    benchmarks/fixtures/wake/negative/*.wav   speech / noise without one
+    benchmarks/fixtures/wake/labels.json      optional {"positive/x.wav": {"wake_end": 1.42}}
+
+`wake_end` is the time (seconds) at which the wake phrase finishes; when it
+is present the detection latency (fire time - wake_end) is reported.
+A small synthesized set is committed (benchmarks/make_fixtures.py).
+
+Usage:
+    python benchmarks/bench_wake.py --model models/vosk-model-small-en-in-0.4
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import wave
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.wake_word import WakeWordSpotter, benchmark_frames, load_vosk_model
+
+DEFAULT_PHRASES = ["hello leo", "leo", "lio", "hey leo", "hello lio"]
+FRAME_MS = 20
+
+
+def read_wav(path: Path):
+    with wave.open(str(path), "rb") as w:
+        if w.getsampwidth() != 2 or w.getnchannels() != 1:
+            raise ValueError(f"{path.name}: expected 16-bit mono")
+        return w.readframes(w.getnframes()), w.getframerate()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default=str(ROOT / "models" / "vosk-model-small-en-in-0.4"))
+    ap.add_argument("--fixtures", default=str(ROOT / "benchmarks" / "fixtures" / "wake"))
+    ap.add_argument("--phrases", nargs="*", default=DEFAULT_PHRASES)
+    ap.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = ap.parse_args()
+
+    fixtures = Path(args.fixtures)
+    clips = sorted(fixtures.glob("positive/*.wav")) + sorted(fixtures.glob("negative/*.wav"))
+    if not clips:
+        sys.exit(f"No WAV fixtures under {fixtures}/positive or {fixtures}/negative")
+
+    labels = {}
+    if (fixtures / "labels.json").exists():
+        labels = json.loads((fixtures / "labels.json").read_text())
+
+    model = load_vosk_model(args.model)
+    if model is None:
+        sys.exit(1)
+
+    spotters = {}
+    hits = misses = false_alarms = negatives = 0
+    latencies, cpu_total, audio_total = [], 0.0, 0.0
+
+    for clip in clips:
+        pcm, rate = read_wav(clip)
+        if rate not in spotters:
+            spotters[rate] = WakeWordSpotter(model, args.phrases, rate)
+        spotter = spotters[rate]
+
+        frame_bytes = rate * FRAME_MS // 1000 * 2
+        phrase, fired_at, cpu = benchmark_frames(spotter, pcm, frame_bytes)
+        rel = clip.relative_to(fixtures).as_posix()
+        cpu_total += cpu
+        audio_total += len(pcm) / 2 / rate
+
+        if rel.startswith("positive/"):
+            if phrase:
+                hits += 1
+                wake_end = labels.get(rel, {}).get("wake_end")
+                if wake_end is not None:
+                    latencies.append(fired_at - wake_end)
+            else:
+                misses += 1
+        else:
+            negatives += 1
+            if phrase:
+                false_alarms += 1
+
+        if not args.json:
+            print(f"{rel:40s} fired={phrase!r:12} at={fired_at}")
+
+    results = {
+        "clips": len(clips),
+        "detection_rate": hits / max(1, hits + misses),
+        "false_alarm_rate": false_alarms / max(1, negatives),
+        "latency_ms_p50": statistics.median(latencies) * 1000 if latencies else None,
+        "latency_ms_max": max(latencies) * 1000 if latencies else None,
+        "real_time_factor": cpu_total / max(audio_total, 1e-9),
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for k, v in results.items():
+            print(f"{k:18s} {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Throughput of PhraseMatcher vs the old difflib-based fuzzy_match().
+
+Transcripts of growing length are generated with the wake phrase at a
+random position (or absent). Reports microseconds per call and how often
+the two disagree.
+
+Usage:
+    python benchmarks/bench_wake_match.py [--n 2000] [--json]
+"""
+
+import argparse
+import difflib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.fuzzy import PhraseMatcher
+
+WAKE_VARIANTS = ["hello leo", "leo", "lio", "hey leo", "hello leo", "hello lio"]
+WORDS = ("what is the weather like today please open youtube and play some music "
+         "send a message to ashu tell me a joke set brightness to fifty").split()
+WAKES = ["hello leo", "hey leo", "leo", "hello lio", "helo leo", "hey lio", "hello lia"]
+
+
+def old_fuzzy_match(text: str, variants, cutoff: float = 0.7) -> bool:
+    text = text.lower().strip()
+    for v in variants:
+        v = v.lower().strip()
+        if v in text:
+            return True
+        ratio = difflib.SequenceMatcher(None, text, v).ratio()
+        if ratio >= cutoff:
+            return True
+    return False
+
+
+def make_corpus(n, length, rng):
+    out = []
+    for _ in range(n):
+        words = [rng.choice(WORDS) for _ in range(length)]
+        if rng.random() < 0.5:
+            words.insert(rng.randint(0, len(words)), rng.choice(WAKES))
+        out.append(" ".join(words))
+    return out
+
+
+def timed(fn, items):
+    t0 = time.perf_counter()
+    results = [fn(it) for it in items]
+    return (time.perf_counter() - t0) / len(items) * 1e6, results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=2000)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    matcher = PhraseMatcher(WAKE_VARIANTS, cutoff=0.7)
+    rows = []
+    for length in (0, 2, 5, 10, 20, 40):
+        items = make_corpus(args.n, length, rng)
+        old_us, old_res = timed(lambda t: old_fuzzy_match(t, WAKE_VARIANTS), items)
+        new_us, new_res = timed(lambda t: matcher.match(t) is not None, items)
+        rows.append({
+            "words": length,
+            "old_us": old_us,
+            "new_us": new_us,
+            "speedup": old_us / new_us if new_us else None,
+            "disagreements": sum(o != n for o, n in zip(old_res, new_res)),
+        })
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'words':>5} {'old us':>9} {'new us':>9} {'speedup':>8} {'disagree':>9}")
+    for r in rows:
+        print(f"{r['words']:>5} {r['old_us']:>9.1f} {r['new_us']:>9.1f} {r['speedup']:>8.1f} {r['disagreements']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Local stand-in for the Gemini REST API (and an OpenAI-compatible
+/v1/chat/completions) with injectable latency.
+
+Answers POST .../models/<model>:generateContent after sleeping
+`latency` seconds with a fixed reply text, so deadline / cancellation
+behaviour can be exercised without network access or an API key.
+:streamGenerateContent?alt=sse sends the same reply as server-sent
+events, `chunk_words` words per event, `token_delay` seconds apart
+(after the initial `latency`). /v1/chat/completions behaves the same
+way in the OpenAI wire format, with "stream": true for SSE.
+
+`responder(user_text) -> reply` makes the answer depend on the request,
+and `jitter` adds a deterministic per-text extra delay in [0, jitter),
+so runs are reproducible.
+
+Usage:
+    python benchmarks/fake_llm_server.py [--port 8089] [--latency 1.5] [--token-delay 0.05]
+    LEO_GEMINI_ENDPOINT=http://127.0.0.1:8089 python main.py
+    LEO_LLM_BACKEND=openai LEO_LLM_BASE_URL=http://127.0.0.1:8089/v1 python main.py
+
+Or in-process:
+    with FakeLLMServer(latency=0.5) as server:
+        llm_backend.register_backend("gemini", lambda: llm_backend.GeminiBackend(endpoint=server.url))
+"""
+
+import argparse
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = '{"action": "send_telegram", "target": "ashu", "message": "hi there"}'
+
+
+def _event(text: str) -> dict:
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+
+def _openai_reply(text: str) -> dict:
+    return {"object": "chat.completion",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}}]}
+
+
+def _openai_event(text: str) -> dict:
+    return {"object": "chat.completion.chunk",
+            "choices": [{"index": 0, "delta": {"content": text}}]}
+
+
+def _user_text(request: dict) -> str:
+    """Last user message of a Gemini or OpenAI style request body."""
+    try:
+        if "contents" in request:
+            return request["contents"][-1]["parts"][0]["text"]
+        return request["messages"][-1]["content"]
+    except (KeyError, IndexError, TypeError):
+        return ""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        owner = self.server.owner
+        owner.requests += 1
+        text = _user_text(request)
+        self._reply_text = owner.responder(text) if owner.responder else owner.reply
+        self._delay = owner.latency
+        if owner.jitter:
+            self._delay += owner.jitter * (zlib.crc32(text.encode()) % 1000) / 1000
+
+        path = self.path.split("?")[0]
+        if path.endswith(":streamGenerateContent"):
+            self._stream(_event)
+        elif path.endswith(":generateContent"):
+            self._reply(_event)
+        elif path.endswith("/chat/completions"):
+            if request.get("stream"):
+                self._stream(_openai_event, done=True)
+            else:
+                self._reply(_openai_reply)
+        else:
+            self.send_error(404)
+
+    def _reply(self, wrap):
+        time.sleep(self._delay)
+        body = json.dumps(wrap(self._reply_text)).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (deadline) before we answered
+
+    def _stream(self, wrap, done=False):
+        owner = self.server.owner
+        words = self._reply_text.split(" ")
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            time.sleep(self._delay)
+            for i in range(0, len(words), owner.chunk_words):
+                piece = " ".join(words[i:i + owner.chunk_words])
+                if i + owner.chunk_words < len(words):
+                    piece += " "
+                self.wfile.write(b"data: " + json.dumps(wrap(piece)).encode() + b"\r\n\r\n")
+                self.wfile.flush()
+                time.sleep(owner.token_delay)
+            if done:
+                self.wfile.write(b"data: [DONE]\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    owner: "FakeLLMServer"
+
+
+class FakeLLMServer:
+    def __init__(self, latency: float = 0.0, reply: str = DEFAULT_REPLY,
+                 host: str = "127.0.0.1", port: int = 0,
+                 token_delay: float = 0.0, chunk_words: int = 3,
+                 responder=None, jitter: float = 0.0):
+        self.latency = latency
+        self.reply = reply
+        self.responder = responder
+        self.jitter = jitter
+        self.token_delay = token_delay
+        self.chunk_words = chunk_words
+        self.requests = 0
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.owner = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds before each reply")
+    ap.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed chunks")
+    ap.add_argument("--chunk-words", type=int, default=3, help="words per streamed chunk")
+    ap.add_argument("--reply", default=DEFAULT_REPLY, help="text the model 'answers'")
+    args = ap.parse_args()
+
+    server = FakeLLMServer(args.latency, args.reply, port=args.port,
+                           token_delay=args.token_delay, chunk_words=args.chunk_words)
+    print(f"fake Gemini on {server.url} (latency {args.latency}s)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
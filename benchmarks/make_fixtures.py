@@ -0,0 +1,160 @@
+"""
+Synthesize the WAV fixtures used by bench_wake.py and bench_asr.py, so
+the benchmarks run without anyone recording clips. Speech comes from
+eSpeak NG (`pip install espeakng-loader`, which bundles the library and
+voices), resampled to 16 kHz mono with a little background hiss.
+Robotic, but stable: the same script always writes the same files.
+
+Wake clips put a second or two of other speech before the wake phrase,
+so it lands across the spotter's WINDOW_SECONDS boundary; labels.json
+records where each phrase ends. ASR clips are the commands Leo is
+usually given, each with its reference transcript in a .txt file.
+
+Usage:
+    python benchmarks/make_fixtures.py [--out benchmarks/fixtures]
+"""
+
+import argparse
+import array
+import ctypes
+import json
+import random
+import sys
+import wave
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+RATE = 16000
+NOISE = 40          # peak amplitude of the background hiss (int16)
+
+# (name, [(text or seconds of silence, is_wake_phrase)])
+WAKE_POSITIVE = [
+    ("hello_leo", [(0.6, False), ("hello leo", True), (0.5, False)]),
+    ("hey_leo_after_chatter", [(0.3, False), ("so anyway i was saying", False), ("hey leo", True), (0.5, False)]),
+    ("leo_mid_sentence", [(0.4, False), ("um okay", False), (0.3, False), ("leo", True), ("open youtube", False), (0.4, False)]),
+    ("hello_lio_slow", [(1.2, False), ("hello lio", True), (0.6, False)]),
+]
+WAKE_NEGATIVE = [
+    ("hello_there", [(0.4, False), ("hello there, how are you doing", False), (0.5, False)]),
+    ("youtube_video", [(0.3, False), ("the video is already on youtube", False), (0.5, False)]),
+    ("silence", [(3.0, False)]),
+]
+
+# (name, transcript)
+ASR_CLIPS = [
+    ("play_on_youtube", "play arijit singh on youtube"),
+    ("send_message", "send message to ashu saying i will be late"),
+    ("read_messages", "read messages from mom"),
+    ("brightness", "set the brightness to forty"),
+    ("question", "what is the capital of france"),
+    ("next_song", "next song"),
+]
+
+
+class Espeak:
+    """Just enough of the eSpeak NG C API to render text to PCM."""
+
+    def __init__(self, voice: str = "en-us", wpm: int = 160):
+        try:
+            import espeakng_loader
+        except ImportError:
+            sys.exit("espeakng-loader is not installed: pip install espeakng-loader")
+
+        self._lib = ctypes.CDLL(espeakng_loader.get_library_path())
+        self.rate = self._lib.espeak_Initialize(2, 0, espeakng_loader.get_data_path().encode(), 0)  # synchronous
+        self._chunks = []
+
+        @ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short), ctypes.c_int, ctypes.c_void_p)
+        def on_audio(wav, n, _events):
+            if wav and n > 0:
+                self._chunks.append(ctypes.string_at(wav, n * 2))
+            return 0
+
+        self._on_audio = on_audio   # keep a reference: the library calls it later
+        self._lib.espeak_SetSynthCallback(on_audio)
+        self._lib.espeak_SetVoiceByName(voice.encode())
+        self._lib.espeak_SetParameter(1, wpm, 0)    # espeakRATE
+
+    def say(self, text: str) -> array.array:
+        self._chunks = []
+        data = text.encode() + b"\0"
+        self._lib.espeak_Synth(data, len(data), 0, 0, 0, 0, None, None)
+        self._lib.espeak_Synchronize()
+        return _trim(_resample(array.array("h", b"".join(self._chunks)), self.rate, RATE))
+
+
+def _resample(samples: array.array, src: int, dst: int) -> array.array:
+    out = array.array("h")
+    step = src / dst
+    for i in range(int(len(samples) / step)):
+        x = i * step
+        j = int(x)
+        nxt = samples[min(j + 1, len(samples) - 1)]
+        out.append(int(samples[j] + (nxt - samples[j]) * (x - j)))
+    return out
+
+
+def _trim(samples: array.array, threshold: int = 200) -> array.array:
+    loud = [i for i, s in enumerate(samples) if abs(s) > threshold]
+    return samples[loud[0]:loud[-1] + 1] if loud else samples
+
+
+def render(tts: Espeak, parts, rng: random.Random):
+    """PCM bytes for one clip, and where its wake phrase ends (seconds, or None)."""
+    samples = array.array("h")
+    wake_end = None
+    for part, is_wake in parts:
+        if isinstance(part, str):
+            samples.extend(tts.say(part))
+            samples.extend(array.array("h", [0] * (RATE // 10)))   # gap between words said apart
+        else:
+            samples.extend(array.array("h", [0] * int(part * RATE)))
+        if is_wake:
+            wake_end = round((len(samples) - RATE // 10) / RATE, 3)
+    noisy = array.array("h", (max(-32768, min(32767, s + rng.randint(-NOISE, NOISE))) for s in samples))
+    return noisy.tobytes(), wake_end
+
+
+def write_wav(path: Path, pcm: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(pcm)
+
+
+def make_wake(tts: Espeak, out: Path):
+    rng = random.Random(3)
+    labels = {}
+    for folder, clips in (("positive", WAKE_POSITIVE), ("negative", WAKE_NEGATIVE)):
+        for name, parts in clips:
+            pcm, wake_end = render(tts, parts, rng)
+            rel = f"{folder}/{name}.wav"
+            write_wav(out / rel, pcm)
+            if wake_end is not None:
+                labels[rel] = {"wake_end": wake_end}
+    (out / "labels.json").write_text(json.dumps(labels, indent=2) + "\n")
+
+
+def make_asr(tts: Espeak, out: Path):
+    rng = random.Random(5)
+    for name, text in ASR_CLIPS:
+        pcm, _ = render(tts, [(0.3, False), (text, False), (0.5, False)], rng)
+        write_wav(out / f"{name}.wav", pcm)
+        (out / f"{name}.txt").write_text(text + "\n")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", default=str(ROOT / "benchmarks" / "fixtures"))
+    args = ap.parse_args()
+
+    tts = Espeak()
+    make_wake(tts, Path(args.out) / "wake")
+    make_asr(tts, Path(args.out) / "asr")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,40 @@
 import datetime
+import re
 import smtplib
 import time
-import difflib
 import os
+import sys
 import subprocess
+import threading
+import importlib
 from os import close
 from pathlib import Path
-import speech_recognition as sr
-from TTS.api import TTS
-from auth import faceauth
-from scripts.conversation_llm import chat
-from scripts.nlp_controller import parse
-from scripts.telegram_bot import send_message, init, read_latest_message, reply_message
+from scripts.startup import REPORT, WARMUP, since_start
+from scripts.asr import ASRServiceError, UnknownSpeech, VOSK_MODEL_PATH, get_backend
+from scripts.audio_capture import AudioCapture
+from scripts.commands import MAIN_COMMANDS, YOUTUBE_COMMANDS
+from scripts.fuzzy import PhraseMatcher
+from scripts.tts_cache import AudioCache
+from scripts.tts_stream import SentenceChunker, SpeechPipeline
+from scripts.wake_word import WakeWordSpotter, load_vosk_model
 import asyncio
 
+# Heavy modules (TTS/torch, cv2 + face_recognition, Gemini, Telethon) are
+# not imported here; start_warmups() loads them in background threads.
+REPORT.record("stage", "import core modules", 0.0, since_start())
+
 
 # Ensure DISPLAY exists
 if "DISPLAY" not in os.environ or not os.environ["DISPLAY"]:
     os.environ["DISPLAY"] = ":0"
 
-# Allow local connections so Xlib / pyautogui can work
-try:
-    subprocess.run(["xhost", "+local:"], check=False)
-except Exception:
-    pass
+
+def _allow_local_x():
+    # Allow local connections so Xlib / pyautogui can work
+    try:
+        subprocess.run(["xhost", "+local:"], check=False)
+    except Exception:
+        pass
 
 
 
@@ -31,20 +42,73 @@ except Exception:
 
 # ---------- CONFIG ----------
 
-LANG_CODE = "en-IN"
+ASR_BACKEND = None  # None = $LEO_ASR_BACKEND or "google"; "vosk" runs offline (language: scripts/asr.py)
 WAKE_DEVICE_INDEX = None  # or an int like 0/1/2
+# "google" sends each utterance to the ASR backend; "vosk" spots the wake word
+# offline, but hasn't been benchmarked on real recordings yet (bench_wake.py)
+WAKE_BACKEND = os.getenv("LEO_WAKE_BACKEND", "google")
 
 WAKE_VARIANTS = [
     "hello leo",
     "leo",
     "lio",
     "hey leo",
-    "hello leo",
     "hello lio",
 ]
 
 BASE_DIR = Path(__file__).resolve().parent
-VOICE_FILE = BASE_DIR / "leo.wav"
+TTS_MODEL = "tts_models/en/ljspeech/tacotron2-DDC"
+TTS_CACHE_DIR = BASE_DIR / "cache" / "tts"
+
+# Fixed phrases the handlers speak. FIXED_PHRASES is built from these, so
+# every one of them is synthesized into the audio cache at startup.
+
+# YouTube
+SAY_OPENING_YOUTUBE = "Opening YouTube."
+SAY_WHICH_SONG = "Which song do you want to listen?"
+SAY_NO_SONG = "I didn't get the song name."
+SAY_YOUTUBE_READY = "YouTube is ready. Say commands like pause, next, volume, or close YouTube."
+SAY_TOGGLED = "Playback toggled."
+SAY_NEXT_SONG = "Next song."
+SAY_PREVIOUS_SONG = "Previous song."
+SAY_AD_SKIPPED = "Ad skipped."
+SAY_FASTER = "Speed increased."
+SAY_SLOWER = "Speed decreased."
+SAY_ASK_SPEED = "Tell me a valid speed like 1.25 or 1.5."
+SAY_FORWARD = "Forward 10 seconds."
+SAY_BACKWARD = "Backward 10 seconds."
+SAY_ASK_VOLUME = "Tell me a number multiple of 10."
+SAY_MUTE_FAILED = "Unable to toggle mute."
+SAY_CLOSING_YOUTUBE = "Closing YouTube."
+SAY_NOT_UNDERSTOOD = "I didn't understand. Try again."
+
+# Telegram
+SAY_NO_CONTACT = "I couldn't find that contact on Telegram."
+SAY_WONT_SEND = "Okay, I won't."
+SAY_ASK_RECEIVER = "Whom should I send the message to?"
+SAY_ASK_MESSAGE = "What should I say?"
+SAY_MESSAGE_SENT = "Message sent."
+SAY_MESSAGE_FAILED = "Failed to send message."
+SAY_ASK_SENDER = "Whose message should I read?"
+SAY_ASK_REPLY = "What should I reply?"
+SAY_REPLY_SENT = "Reply sent."
+SAY_REPLY_FAILED = "Failed to send reply."
+
+# Brightness, listening, exit
+SAY_ASK_BRIGHTNESS = "Tell me a number between 1 and 100."
+SAY_AGAIN = "Say that again, please."
+SAY_ASR_ERROR = "Network error with speech service."
+SAY_GOODBYE = "Goodbye, have a nice day."
+
+FIXED_PHRASES = [
+    SAY_OPENING_YOUTUBE, SAY_WHICH_SONG, SAY_NO_SONG, SAY_YOUTUBE_READY, SAY_TOGGLED, SAY_NEXT_SONG,
+    SAY_PREVIOUS_SONG, SAY_AD_SKIPPED, SAY_FASTER, SAY_SLOWER, SAY_ASK_SPEED, SAY_FORWARD, SAY_BACKWARD,
+    SAY_ASK_VOLUME, SAY_MUTE_FAILED, SAY_CLOSING_YOUTUBE, SAY_NOT_UNDERSTOOD, SAY_NO_CONTACT, SAY_WONT_SEND,
+    SAY_ASK_RECEIVER, SAY_ASK_MESSAGE, SAY_MESSAGE_SENT, SAY_MESSAGE_FAILED, SAY_ASK_SENDER, SAY_ASK_REPLY,
+    SAY_REPLY_SENT, SAY_REPLY_FAILED, SAY_ASK_BRIGHTNESS, SAY_AGAIN, SAY_ASR_ERROR, SAY_GOODBYE,
+    "muted", "unmuted",     # what toggle_mute() returns
+] + [f"Volume set to {n} percent." for n in range(0, 101, 10)] \
+  + [f"Brightness set to {n} percent." for n in range(0, 101, 10)]
 
 
 # ---------- TTS (Friday-style) ----------
@@ -52,34 +116,120 @@ VOICE_FILE = BASE_DIR / "leo.wav"
 def _init_tts():
     try:
         print("[TTS] Initializing Friday voice model...")
-        return TTS(model_name="tts_models/en/ljspeech/tacotron2-DDC", progress_bar=False)
+        from TTS.api import TTS  # pulls in torch: the slowest import we have
+        return TTS(model_name=TTS_MODEL, progress_bar=False)
     except Exception as e:
         print(f"[TTS] Failed to initialize TTS: {e}")
         return None
 
 
-tts = _init_tts()
+def _init_speech():
+    tts = _init_tts()
+    if tts is None:
+        return None
+
+    speech = SpeechPipeline(tts, cache=AudioCache(TTS_CACHE_DIR, model=TTS_MODEL))
+    # the capture thread knows what we play, so our own voice (echo) isn't
+    # taken for the user, but real speech over it stops playback (barge-in)
+    speech.on_speaking = CAPTURE.set_playback
+    speech.on_chunk = CAPTURE.feed_playback
+    speech.on_first_audio = _on_first_audio
+    CAPTURE.on_barge_in = speech.cancel
+    speech.prewarm(FIXED_PHRASES)
+    return speech
 
 
-def speak(text: str):
+# wait=False text said before the voice model is ready, in order
+_EARLY_SPEECH = []
+_EARLY_SPEECH_LOCK = threading.Lock()
+
+
+def speak(text: str, wait: bool = True):
+    """
+    Speak `text` sentence by sentence: the first sentence starts playing
+    while the rest are still being synthesized (no temp file, no paplay).
+    With wait=False the text is only queued, so the caller can carry on
+    (Telegram, LLM, listening) while Leo is still talking; this never
+    blocks, even while the voice model is still loading, so it is safe
+    to call on the event loop.
+    """
     if not text:
         return
 
-    if tts is None:
+    if not wait:
+        with _EARLY_SPEECH_LOCK:
+            if _EARLY_SPEECH or not WARMUP.ready("speech"):
+                _EARLY_SPEECH.append(text)
+                if len(_EARLY_SPEECH) == 1:
+                    threading.Thread(target=_speak_early, name="speak-early", daemon=True).start()
+                return
+
+    speech = WARMUP.get("speech")
+    if speech is None:
         print(f"[SPEAK] {text}")
         return
 
-    try:
-        tts.tts_to_file(text=text, file_path=str(VOICE_FILE))
-        subprocess.run(
-            ["paplay", str(VOICE_FILE)],  # "-q"
-            check=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-    except Exception as e:
-        print(f"[WARN] TTS failed: {e}")
-        print(f"[SPEAK-FALLBACK] {text}")
+    speech.say(text, block=wait)
+
+
+def _speak_early():
+    """Wait for the voice model, then queue what was said meanwhile."""
+    speech = WARMUP.get("speech")
+    while True:
+        with _EARLY_SPEECH_LOCK:
+            text = _EARLY_SPEECH[0]
+        if speech is None:
+            print(f"[SPEAK] {text}")
+        else:
+            speech.say(text, block=False)
+        with _EARLY_SPEECH_LOCK:
+            # popped only now, so speak() keeps queueing behind it meanwhile
+            _EARLY_SPEECH.pop(0)
+            if not _EARLY_SPEECH:
+                return
+
+
+async def speak_async(text: str, wait: bool = True):
+    """speak() without blocking the event loop."""
+    if wait:
+        await asyncio.to_thread(speak, text)
+    else:
+        speak(text, wait=False)
+
+
+async def speak_stream(fragments):
+    """
+    Speak an LLM reply while it is still being generated: every sentence
+    goes to TTS as soon as it is complete. Stops reading the stream if the
+    user barges in.
+    """
+    chunker = SentenceChunker()
+    speech = None
+    spoken = []
+
+    def _say(sentence):
+        if speech is None:
+            print(f"[SPEAK] {sentence}")
+            return True
+        if spoken and spoken[-1].cancelled:
+            return False    # barge-in: the rest of the answer is not wanted
+        utt = speech.say(sentence, block=False)
+        if utt is not None:
+            spoken.append(utt)
+        return True
+
+    async for fragment in fragments:
+        sentences = chunker.feed(fragment)
+        if sentences and speech is None:
+            speech = await WARMUP.aget("speech")
+        for sentence in sentences:
+            if not _say(sentence):
+                await fragments.aclose()
+                return
+    for sentence in chunker.flush():
+        if speech is None:
+            speech = await WARMUP.aget("speech")
+        _say(sentence)
 
 
 def wishMe():
@@ -95,12 +245,9 @@ def wishMe():
 
 # ---------- Speech & Wake ----------
 
-def get_microphone():
-    if WAKE_DEVICE_INDEX is None:
-        return sr.Microphone()
-    return sr.Microphone(device_index=WAKE_DEVICE_INDEX)
-
 async def handle_youtube_mode():
+    # importing scripts.youtube boots Chrome; keep that off the event loop
+    await asyncio.to_thread(importlib.import_module, "scripts.youtube")
     from scripts.youtube import (
         youtube, search_song, skip_ad, pause_or_play, play_next_song,
         play_previous_song, increase_speed, decrease_speed,
@@ -108,249 +255,400 @@ async def handle_youtube_mode():
         close_youtube, set_volume, toggle_mute
     )
 
-    speak("Opening YouTube.")
-    youtube()
-    time.sleep(2)
+    speak(SAY_OPENING_YOUTUBE, wait=False)
+    await asyncio.to_thread(youtube)
+    await asyncio.sleep(2)
 
-    speak("Which song do you want to listen?")
-    song = takeCommand()
+    await speak_async(SAY_WHICH_SONG)
+    song = await listen_async()
     if not song:
-        speak("I didn't get the song name.")
+        speak(SAY_NO_SONG, wait=False)
         return
 
-    search_song(song)
-    time.sleep(5)
-    skip_ad()
+    await asyncio.to_thread(search_song, song)
+    await asyncio.sleep(5)
+    await asyncio.to_thread(skip_ad)
 
-    speak("YouTube is ready. Say commands like pause, next, volume, or close YouTube.")
+    speak(SAY_YOUTUBE_READY, wait=False)
+
+    def simple(fn, ack, *args):
+        async def run(m):
+            await asyncio.to_thread(fn, *args)
+            speak(ack, wait=False)
+        return run
+
+    async def speed(m):
+        value = m.slots["value"]
+        if value:
+            await asyncio.to_thread(set_playback_speed, float(value))
+            speak(f"Speed set to {value}.", wait=False)
+        else:
+            speak(SAY_ASK_SPEED, wait=False)
+
+    async def volume(m):
+        value = m.slots["value"]
+        if value is not None:
+            n = max(0, min(100, int(value)))
+            await asyncio.to_thread(set_volume, n / 100)
+            speak(f"Volume set to {n} percent.", wait=False)
+        else:
+            speak(SAY_ASK_VOLUME, wait=False)
+
+    async def mute(m):
+        status = await asyncio.to_thread(toggle_mute)
+        speak(status if status else SAY_MUTE_FAILED, wait=False)
+
+    actions = {
+        "toggle": simple(pause_or_play, SAY_TOGGLED),
+        "next": simple(play_next_song, SAY_NEXT_SONG),
+        "previous": simple(play_previous_song, SAY_PREVIOUS_SONG),
+        "skip_ad": simple(skip_ad, SAY_AD_SKIPPED),
+        "faster": simple(increase_speed, SAY_FASTER),
+        "slower": simple(decrease_speed, SAY_SLOWER),
+        "speed": speed,
+        "forward": simple(seek_forward, SAY_FORWARD, 10),
+        "rewind": simple(seek_backward, SAY_BACKWARD, 10),
+        "volume": volume,
+        "mute": mute,
+    }
 
     # ------------------------
     # YOUTUBE MODE LOOP ONLY
     # ------------------------
     while True:
-        cmd = takeCommand()
+        cmd = await listen_async()
         if not cmd:
             continue
-        cmd = cmd.lower().strip()
 
-        if "pause" in cmd or "play" in cmd:
-            pause_or_play()
-            speak("Playback toggled.")
+        m = YOUTUBE_COMMANDS.match(cmd)
+        if m is None:
+            speak(SAY_NOT_UNDERSTOOD, wait=False)
+            continue
 
-        elif "next" in cmd:
-            play_next_song()
-            speak("Next song.")
+        # ------------------------
+        # EXIT YOUTUBE ONLY HERE
+        # ------------------------
+        if m.name == "close":
+            await speak_async(SAY_CLOSING_YOUTUBE)
+            await asyncio.to_thread(close_youtube)
+            break
 
-        elif "previous" in cmd:
-            play_previous_song()
-            speak("Previous song.")
+        await actions[m.name](m)
 
-        elif "skip ad" in cmd or "skip the ad" in cmd or cmd.strip()=="skip":
-            skip_ad()
-            speak("Ad skipped.")
+YES_WORDS = {"yes", "yeah", "yep", "yup", "sure", "correct", "right", "haan", "ha"}
 
-        elif "faster" in cmd or "increase speed" in cmd:
-            increase_speed()
-            speak("Speed increased.")
 
-        elif "slower" in cmd or "decrease speed" in cmd:
-            decrease_speed()
-            speak("Speed decreased.")
+def is_yes(answer) -> bool:
+    words = (answer or "").lower().replace(",", " ").replace(".", " ").split()
+    return bool(words) and words[0] in YES_WORDS
 
-        elif "speed" in cmd:
-            nums = [float(s) for s in cmd.split() if s.replace(".", "").isdigit()]
-            if nums:
-                set_playback_speed(nums[0])
-                speak(f"Speed set to {nums[0]}.")
-            else:
-                speak("Tell me a valid speed like 1.25 or 1.5.")
-
-        elif "forward" in cmd:
-            seek_forward(10)
-            speak("Forward 10 seconds.")
-
-        elif "rewind" in cmd or "backward" in cmd:
-            seek_backward(10)
-            speak("Backward 10 seconds.")
-
-        elif "volume" in cmd:
-            nums = [int(s) for s in cmd.split() if s.isdigit()]
-            if nums:
-                n = max(0, min(100, nums[0]))
-                set_volume(n / 100)
-                speak(f"Volume set to {n} percent.")
-            else:
-                speak("Tell me a number multiple of 10.")
 
-        elif "mute" in cmd or "unmute" in cmd:
-            status = toggle_mute()
-            speak(status if status else "Unable to toggle mute.")
-
-        # ------------------------
-        # EXIT YOUTUBE ONLY HERE
-        # ------------------------
-        elif "exit youtube" in cmd or "close youtube" in cmd:
-            speak("Closing YouTube.")
-            close_youtube()
-            break
+async def confirm_contact(tg, target):
+    """
+    The DialogMatch for a spoken `target`, or None. A guess ("dude" for
+    "Dad") is only used after the user says yes to "Did you mean Dad?".
+    """
+    match = await tg.resolve_contact(target)
+    if match is None:
+        await speak_async(SAY_NO_CONTACT)
+        return None
+    if tg.needs_confirmation(match):
+        await speak_async(f"Did you mean {match.dialog.name}?")
+        if not is_yes(await listen_async()):
+            await speak_async(SAY_WONT_SEND)
+            return None
+    return match
 
-        else:
-            speak("I didn't understand. Try again.")
 
-async def handle_telegram_mode(query):
-    intent = parse(query)
+async def handle_telegram_mode(intent):
+    tg = await WARMUP.aget("telegram", required=True)
     action = intent.get("action", "none")
 
-    if action == "send_telegram":
+    # groups are dialogs too, send_message finds them by name
+    if action in ("send_telegram", "send_telegram_group"):
         target = intent.get("target")
         message = intent.get("message")
 
         if not target:
-            speak("Whom should I send the message to?")
-            target = takeCommand()
+            await speak_async(SAY_ASK_RECEIVER)
+            target = await listen_async()
+
+        match = await confirm_contact(tg, target)
+        if match is None:
+            return
 
         if not message:
-            speak("What should I say?")
-            message = takeCommand()
+            await speak_async(SAY_ASK_MESSAGE)
+            message = await listen_async()
 
-        ok, err = await send_message(target, message)
-        speak("Message sent." if ok else (err or "Failed to send message."))
+        # queued: "Message sent." comes from announce_delivery() once Telegram confirms
+        ok, err = await tg.send_message(match, message, wait=False)
+        if not ok:
+            speak(err or SAY_MESSAGE_FAILED, wait=False)
         return
 
     if action == "read_telegram":
         target = intent.get("target")
         if not target:
-            speak("Whose message should I read?")
-            target = takeCommand()
-        msg = await read_latest_message(target)
-        speak(msg or f"No messages from {target}")
+            await speak_async(SAY_ASK_SENDER)
+            target = await listen_async()
+        match = await confirm_contact(tg, target)
+        if match is None:
+            return
+        msg = await tg.read_latest_message(match)
+        speak(msg or f"No messages from {target}", wait=False)
         return
 
     if action == "reply_telegram":
         message = intent.get("message")
         if not message:
-            speak("What should I reply?")
-            message = takeCommand()
+            await speak_async(SAY_ASK_REPLY)
+            message = await listen_async()
 
-        ok, err = await reply_message(message)
-        speak("Reply sent." if ok else (err or "Failed to send reply."))
+        ok, err = await tg.reply_message(message, wait=False)
+        if not ok:
+            speak(err or SAY_REPLY_FAILED, wait=False)
         return
 
-async def handle_brightness(query):
+def announce_delivery(delivery):
+    """Telegram outbox status callback: say how a queued message went."""
+    reply = delivery.kind == "reply"
+    if delivery.status == "sent":
+        speak(SAY_REPLY_SENT if reply else SAY_MESSAGE_SENT, wait=False)
+    elif delivery.status == "failed":
+        speak(delivery.error or (SAY_REPLY_FAILED if reply else SAY_MESSAGE_FAILED), wait=False)
+    elif delivery.status == "retrying" and delivery.attempts == 1:
+        speak(delivery.error, wait=False)
+
+
+async def handle_intent(intent):
+    """Carry out an intent the LLM picked (see conversation_llm.ROUTE_PROMPT)."""
+    action = intent.get("action", "none")
+    if action in ("send_telegram", "send_telegram_group", "read_telegram", "reply_telegram"):
+        await handle_telegram_mode(intent)
+    elif action == "brightness_set":
+        await handle_brightness(intent.get("value"))
+    elif action == "open_youtube":
+        await handle_youtube_mode()
+    else:
+        speak(SAY_NOT_UNDERSTOOD, wait=False)
+
+
+async def handle_open_query(query, fallback=None):
+    """
+    Anything the local rules couldn't place costs a single LLM call that
+    either returns an action or starts answering (streamed into TTS).
+    With a `fallback` intent, the LLM gets LEO_PARSE_DEADLINE seconds to
+    decide before the fallback is used instead (llm.route_within).
+    """
+    llm = await WARMUP.aget("chat", required=True)
+    if fallback is not None and fallback.get("action", "none") != "none":
+        intent, answer = await llm.route_within(query, fallback)
+    else:
+        intent, answer = await llm.route_or_answer(query)
+
+    if answer is not None:
+        await speak_stream(answer)
+    else:
+        await handle_intent(intent)
+
+
+def brightness_percent(value):
+    """0-100 from an int or a string like "50" / "50%", else None ("fifty")."""
+    if isinstance(value, (int, float)):
+        return max(0, min(100, int(value)))
+    m = re.search(r"\d+", str(value or ""))
+    return max(0, min(100, int(m.group()))) if m else None
+
+
+async def handle_brightness(value):
     from scripts.brightness import set_brightness
-    nums = [int(s) for s in query.split() if s.isdigit()]
-    if nums:
-        value = max(0, min(100, nums[0]))
-        set_brightness(value)
-        speak(f"Brightness set to {value} percent.")
+    value = brightness_percent(value)
+    if value is not None:
+        await asyncio.to_thread(set_brightness, value)
+        speak(f"Brightness set to {value} percent.", wait=False)
     else:
-        speak("Tell me a number between 1 and 100.")
+        speak(SAY_ASK_BRIGHTNESS, wait=False)
 
 
+# one long-lived capture stream (the recognizer is warmed up as "asr")
+CAPTURE = AudioCapture(device_index=WAKE_DEVICE_INDEX)
 
-# global recognizer + mic
-RECOGNIZER = sr.Recognizer()
-MIC = get_microphone()
+# every command-style consumer reads VAD utterances from here; it is
+# subscribed once so speech between two takeCommand() calls isn't lost.
+# Nobody reads it while the offline wake spotter runs, so it only keeps
+# the last few (each holds up to MAX_UTTERANCE_SECONDS of audio)
+COMMAND_BACKLOG = 4
+COMMAND_QUEUE = CAPTURE.subscribe_utterances(maxsize=COMMAND_BACKLOG)
+
+# utterances that started before this (monotonic) time are stale
+_LISTEN_SINCE = 0.0
+
+# end-of-speech -> first audio of the reply, per turn (seconds)
+TURN_LATENCIES = []
+_TURN_STARTED = None
+
+
+def _on_first_audio(_utt):
+    global _TURN_STARTED
+    if _TURN_STARTED is None:
+        return
+    latency = time.monotonic() - _TURN_STARTED
+    _TURN_STARTED = None
+    TURN_LATENCIES.append(latency)
+    print(f"[TURN] end of speech -> first audio: {latency * 1000:.0f} ms")
+
+
+def start_warmups():
+    """
+    Kick off every heavy import / model load in the background, so the
+    wake-word listener comes up first and each model is ready (or nearly)
+    by the time it is first used.
+    """
+    WARMUP.start("speech", _init_speech)
+    WARMUP.start("asr", lambda: get_backend(ASR_BACKEND))
+    WARMUP.start_import("faceauth", "auth.faceauth")
+    WARMUP.start_import("nlp", "scripts.nlp_controller")
+    WARMUP.start_import("chat", "scripts.conversation_llm")
+    WARMUP.start_import("telegram", "scripts.telegram_bot")
+    WARMUP.start("xhost", _allow_local_x)
+
+    def _report_when_warm():
+        WARMUP.wait_all()
+        REPORT.print()
+        path = os.getenv("LEO_STARTUP_REPORT")
+        if path:
+            REPORT.dump(path)
+
+    threading.Thread(target=_report_when_warm, name="startup-report", daemon=True).start()
 
 
 def init_audio_calibration():
     """
-    Do a single, solid ambient noise calibration at startup
-    and then fix the energy threshold (no constant re-tuning).
+    Open the capture stream once, do a single ambient noise calibration
+    and then fix the VAD energy threshold (no constant re-tuning).
     """
     try:
-        with MIC as source:
-            print("[AUDIO] Calibrating for ambient noise...")
-            RECOGNIZER.dynamic_energy_threshold = True
-            RECOGNIZER.adjust_for_ambient_noise(source, duration=1.5)
-            print(f"[AUDIO] Initial energy threshold: {RECOGNIZER.energy_threshold}")
-
-        # lock the threshold in place for stability
-        RECOGNIZER.dynamic_energy_threshold = False
-        RECOGNIZER.energy_threshold *= 1.2  # slightly more tolerant
-        print(f"[AUDIO] Fixed energy threshold: {RECOGNIZER.energy_threshold}")
+        CAPTURE.start()
+        print("[AUDIO] Calibrating for ambient noise...")
+        threshold = CAPTURE.calibrate(seconds=1.5)
+        print(f"[AUDIO] Fixed energy threshold: {threshold:.0f}")
     except Exception as e:
         print(f"[AUDIO] Calibration failed: {e}")
         speak("I could not calibrate the microphone properly.")
 
 
-def fuzzy_match(text: str, variants, cutoff: float = 0.7) -> bool:
-    text = text.lower().strip()
-    for v in variants:
-        v = v.lower().strip()
-        if v in text:
-            return True
-        ratio = difflib.SequenceMatcher(None, text, v).ratio()
-        if ratio >= cutoff:
-            return True
-    return False
+# compiled once: variants normalized + de-duplicated, banded edit distance
+WAKE_MATCHER = PhraseMatcher(WAKE_VARIANTS, cutoff=0.7)
 
 
 def listen_for_wake_word():
     """
-    Uses global RECOGNIZER + MIC.
-    Doesn’t recalibrate each time, just listens in short chunks.
+    With WAKE_BACKEND = "vosk", offline wake word: keeps the mic open and
+    streams frames into a local Vosk keyword spotter, so nothing goes over
+    the network until Leo is actually addressed. Otherwise (or if Vosk is
+    unavailable) the Google loop.
+    """
+    model = load_vosk_model(VOSK_MODEL_PATH) if WAKE_BACKEND == "vosk" else None
+    if model is None:
+        return listen_for_wake_word_google()
+
+    global _LISTEN_SINCE
+    spotter = WakeWordSpotter(model, WAKE_VARIANTS, CAPTURE.sample_rate)
+    frames = CAPTURE.subscribe_frames()
+    print("Listening for wake word (offline)...")
+    try:
+        while True:
+            hit = spotter.accept(frames.get())
+            if hit:
+                print(f"[WAKE] Wake word detected: {hit!r}")
+                _LISTEN_SINCE = time.monotonic()
+                return hit
+    finally:
+        CAPTURE.unsubscribe(frames)
+
+
+def listen_for_wake_word_google():
+    """
+    Uses the shared capture stream and the configured ASR backend.
+    Sends every VAD utterance to the recognizer.
     Logs everything it hears so you can see what Google is actually returning.
     """
+    global _LISTEN_SINCE
+    print("Listening for wake word...")
     while True:
-        try:
-            with MIC as source:
-                print("Listening for wake word...")
-                # no adjust_for_ambient_noise here – already calibrated
-                audio = RECOGNIZER.listen(source, phrase_time_limit=3)
-        except Exception as e:
-            print(f"[ERROR] Microphone error while listening: {e}")
-            speak("I cannot access the microphone right now.")
-            time.sleep(1)
-            continue
+        utt = CAPTURE.next_utterance(COMMAND_QUEUE, since=_LISTEN_SINCE).wait()
 
         try:
             print("Recognizing wake word...")
-            text = RECOGNIZER.recognize_google(audio, language=LANG_CODE)
+            text = WARMUP.get("asr", required=True).transcribe(utt.pcm, utt.sample_rate)
             norm = text.lower().strip()
             print(f"[WAKE] Heard: {norm!r}")
 
-            if fuzzy_match(norm, WAKE_VARIANTS):
-                print("[WAKE] Wake word detected")
+            hit = WAKE_MATCHER.match(norm)
+            if hit:
+                print(f"[WAKE] Wake word detected: {hit.phrase!r} (score {hit.score:.2f})")
+                _LISTEN_SINCE = utt.end
                 return norm
 
-        except sr.UnknownValueError:
+        except UnknownSpeech:
             print("[WAKE] Could not understand audio.")
             continue
-        except sr.RequestError as e:
+        except ASRServiceError as e:
             print(f"[WAKE] Recognition service error: {e}")
             time.sleep(1)
             continue
 
-def takeCommand():
+def takeCommand(on_partial=None):
     """
-    Uses the same global recognizer & mic.
-    Slightly longer phrase_time_limit, no re-calibration, just listen & decode.
+    Takes the next utterance the capture thread cut out (including speech
+    that started while we weren't waiting yet) and decodes it while it is
+    still being spoken. Streaming backends report partial hypotheses to
+    `on_partial` before the user has finished talking.
     """
-    try:
-        with MIC as source:
-            print("Listening for command...")
-            audio = RECOGNIZER.listen(source, phrase_time_limit=7)
-    except Exception as e:
-        print(f"[ERROR] Microphone error in takeCommand: {e}")
-        speak("I cannot access the microphone right now.")
-        return None
+    print("Listening for command...")
+    utt = CAPTURE.next_utterance(COMMAND_QUEUE, since=_LISTEN_SINCE)
 
+    def _partial(text):
+        print(f"[CMD] ...{text}")
+        if on_partial:
+            on_partial(text)
+
+    global _TURN_STARTED
     try:
         print("Recognizing command...")
-        query = RECOGNIZER.recognize_google(audio, language=LANG_CODE)
+        asr = WARMUP.get("asr", required=True)
+        query = asr.recognize_stream(utt.frames(), utt.sample_rate, on_partial=_partial)
         query = query.strip()
         print(f"[CMD] User said: {query}")
+        _TURN_STARTED = utt.end
         return query
-    except sr.UnknownValueError:
+    except UnknownSpeech:
         print("[CMD] Could not understand audio.")
-        speak("Say that again, please.")
+        speak(SAY_AGAIN)
         return None
-    except sr.RequestError as e:
+    except ASRServiceError as e:
         print(f"[CMD] Speech recognition service error: {e}")
-        speak("Network error with speech service.")
+        speak(SAY_ASR_ERROR)
         return None
 
+async def listen_async(on_partial=None):
+    """takeCommand() in a worker thread so Telethon keeps running."""
+    return await asyncio.to_thread(takeCommand, on_partial)
+
+
+def prefetch_route(partial: str):
+    """
+    Called with partial transcripts: start expensive route setup before the
+    user has finished the sentence (importing scripts.youtube boots Chrome).
+    """
+    m = MAIN_COMMANDS.match(partial)
+    if m and m.name == "youtube" and "scripts.youtube" not in sys.modules:
+        threading.Thread(
+            target=importlib.import_module, args=("scripts.youtube",), daemon=True
+        ).start()
+
+
 def has_words(text: str, *words):
     text = text.lower()
     return all(w in text for w in words)
@@ -359,58 +657,103 @@ def has_words(text: str, *words):
 # ---------- Main ----------
 
 async def main():
-    init_audio_calibration()
+    start_warmups()
+
+    with REPORT.stage("audio calibration"):
+        await asyncio.to_thread(init_audio_calibration)
+    if WAKE_BACKEND == "vosk":
+        with REPORT.stage("wake model"):
+            await asyncio.to_thread(load_vosk_model, VOSK_MODEL_PATH)
+    REPORT.record("stage", "wake listener ready", 0.0, since_start())
 
-    wake = listen_for_wake_word()
-    if not fuzzy_match(wake, WAKE_VARIANTS):
+    wake = await asyncio.to_thread(listen_for_wake_word)
+    if not WAKE_MATCHER.match(wake):
         return
 
         # wishMe()
-    userName = faceauth.recognize_faces()
+    faceauth = await WARMUP.aget("faceauth", required=True)
+    faceauth.share_capture(CAPTURE, COMMAND_QUEUE, ASR_BACKEND)
+    tg = await WARMUP.aget("telegram", required=True)
+    # face auth runs in a worker thread while Telegram connects
+    userName, _ = await asyncio.gather(
+        asyncio.to_thread(faceauth.recognize_faces),
+        tg.init(),  #telegram init
+    )
     if not userName:
-        faceauth.Unknown_Face()
+        await asyncio.to_thread(faceauth.Unknown_Face)
         return
+    tg.OUTBOX.on_status = announce_delivery
 
-    speak(f"Hello {userName}, how may I assist you?")
-    await init()  #telegram init
+    speak(f"Hello {userName}, how may I assist you?", wait=False)
     while True:
-        query = takeCommand()
+        query = await listen_async(on_partial=prefetch_route)
         if not query:
             continue
         query = query.lower().strip()
+        m = MAIN_COMMANDS.match(query)
+        route = m.name if m else "chat"
 
         #youtube mode
-        if "youtube" in query or "play" in query:
+        if route == "youtube":
             await handle_youtube_mode()
             continue
 
                 # ==================================================
                 # -------------- TELEGRAM MODE ----------------------
                 # ==================================================
-        if "send" in query or "read" in query or "reply" in query:
-            await handle_telegram_mode(query)
+        if route == "telegram":
+            nlp = await WARMUP.aget("nlp", required=True)
+            intent = nlp.parse_local(query)
+            if intent is not None:
+                # the rules may be sure it's something else ("... saying set the brightness to 50")
+                await handle_intent(intent)
+            else:
+                # unsure: one LLM call decides between an action and a reply
+                await handle_open_query(query, fallback=nlp.rule_based_parse(query))
             continue
 
                 # ==================================================
                 # -------------- BRIGHTNESS -------------------------
                 # ==================================================
-        if "brightness" in query:
-            await handle_brightness(query)
+        if route == "brightness":
+            await handle_brightness(m.slots["value"])
             continue
 
                 # ==================================================
                 # -------------- GENERAL CONVERSATION ---------------
                 # ==================================================
-        if "good night" in query or "exit" in query:
-            speak("Goodbye, have a nice day.")
+        if route == "exit":
+            await speak_async(SAY_GOODBYE)
             break
 
-                # fallback normal chat
-        response = chat(query)
-        speak(response)
+                # fallback: normal chat, or an action the keywords missed
+        await handle_open_query(query)
+
+    if TURN_LATENCIES:
+        avg = sum(TURN_LATENCIES) / len(TURN_LATENCIES)
+        print(f"[TURN] {len(TURN_LATENCIES)} turns, avg end-to-end latency {avg * 1000:.0f} ms")
+    nlp = WARMUP.get("nlp") if WARMUP.ready("nlp") else None
+    if nlp and nlp.parse_stats()["parses"]:
+        st = nlp.parse_stats()
+        saved = f", ~{st['est_saved_ms']:.0f} ms of LLM time saved" if st["est_saved_ms"] is not None else ""
+        llm = f", {st['llm_calls']} LLM calls (avg {st['avg_llm_ms']:.0f} ms)" if st["llm_calls"] else ""
+        print(f"[NLP] {st['parses']} parses, {st['local_hit_ratio']:.0%} answered by rules{llm}, "
+              f"{st['deadline_misses']} deadline misses{saved}")
+    chat = WARMUP.get("chat") if WARMUP.ready("chat") else None
+    if chat:
+        st = chat.CACHE.stats()
+        print(f"[CHAT] response cache: {st['hits']} hits ({st['near_hits']} near-duplicate), "
+              f"{st['misses']} misses, {st['bypassed']} bypassed")
+
+    # let queued Telegram messages go out before the loop ends
+    tg = WARMUP.get("telegram") if WARMUP.ready("telegram") else None
+    if tg and tg.OUTBOX.pending():
+        await tg.OUTBOX.drain(timeout=10)
+
+    # the LLM backend keeps one HTTP session open on this loop
+    if "scripts.llm_backend" in sys.modules:
+        await sys.modules["scripts.llm_backend"].get_backend().aclose()
 
 
 if __name__ == "__main__":
     asyncio.run(main())
-
-
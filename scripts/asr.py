@@ -0,0 +1,174 @@
+# scripts/asr.py
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from scripts.wake_word import load_vosk_model
+
+# ---------- CONFIG ----------
+
+LANG_CODE = "en-IN"
+# "google" (online) or "vosk" (offline, streams partial results)
+DEFAULT_BACKEND = os.getenv("LEO_ASR_BACKEND", "google")
+VOSK_MODEL_PATH = Path(__file__).resolve().parent.parent / "models" / "vosk-model-small-en-in-0.4"
+
+
+class UnknownSpeech(Exception):
+    """The audio was heard but nothing intelligible came out of it."""
+
+
+class ASRServiceError(Exception):
+    """The backend itself failed (network, model, quota...)."""
+
+
+class ASRStream:
+    """
+    Incremental recognition of one utterance.
+    accept() returns a new partial hypothesis when it changed, finish()
+    returns the final transcript.
+
+    This default implementation just buffers and decodes at the end.
+    """
+
+    def __init__(self, backend: "ASRBackend", sample_rate: int):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self._chunks = []
+
+    def accept(self, frame: bytes) -> Optional[str]:
+        self._chunks.append(frame)
+        return None
+
+    def finish(self) -> str:
+        return self.backend.transcribe(b"".join(self._chunks), self.sample_rate)
+
+
+class ASRBackend:
+    name = "base"
+    streaming = False   # True if partial hypotheses are produced
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        """int16 mono PCM -> text. Raises UnknownSpeech / ASRServiceError."""
+        raise NotImplementedError
+
+    def start_stream(self, sample_rate: int) -> ASRStream:
+        return ASRStream(self, sample_rate)
+
+    def recognize_stream(self, frames: Iterable[bytes], sample_rate: int,
+                         on_partial: Optional[Callable[[str], None]] = None) -> str:
+        """Feed frames as they arrive, reporting partials, return the final text."""
+        stream = self.start_stream(sample_rate)
+        for frame in frames:
+            partial = stream.accept(frame)
+            if partial and on_partial:
+                on_partial(partial)
+        return stream.finish()
+
+
+# ---------- Google Web Speech ----------
+
+class GoogleBackend(ASRBackend):
+    name = "google"
+
+    def __init__(self, language: str = LANG_CODE):
+        import speech_recognition as sr
+        self._sr = sr
+        self.language = language
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        audio = self._sr.AudioData(pcm, sample_rate, 2)
+        try:
+            text = self.recognizer.recognize_google(audio, language=self.language)
+        except self._sr.UnknownValueError as e:
+            raise UnknownSpeech() from e
+        except self._sr.RequestError as e:
+            raise ASRServiceError(str(e)) from e
+        return text.strip()
+
+
+# ---------- Vosk (offline) ----------
+
+class _VoskStream(ASRStream):
+    def __init__(self, backend: "VoskBackend", sample_rate: int):
+        from vosk import KaldiRecognizer
+        super().__init__(backend, sample_rate)
+        self._rec = KaldiRecognizer(backend.model, sample_rate)
+        self._final_parts = []
+        self._last_partial = ""
+
+    def accept(self, frame: bytes) -> Optional[str]:
+        if self._rec.AcceptWaveform(frame):
+            text = json.loads(self._rec.Result()).get("text", "")
+            if text:
+                self._final_parts.append(text)
+            partial = ""
+        else:
+            partial = json.loads(self._rec.PartialResult()).get("partial", "")
+
+        hyp = " ".join(self._final_parts + ([partial] if partial else []))
+        if hyp and hyp != self._last_partial:
+            self._last_partial = hyp
+            return hyp
+        return None
+
+    def finish(self) -> str:
+        text = json.loads(self._rec.FinalResult()).get("text", "")
+        if text:
+            self._final_parts.append(text)
+        result = " ".join(self._final_parts).strip()
+        if not result:
+            raise UnknownSpeech()
+        return result
+
+
+class VoskBackend(ASRBackend):
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model_path=VOSK_MODEL_PATH):
+        self.model = load_vosk_model(model_path, tag="ASR")
+        if self.model is None:
+            raise ASRServiceError(f"Vosk model not available at {model_path}")
+
+    def start_stream(self, sample_rate: int) -> ASRStream:
+        return _VoskStream(self, sample_rate)
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        stream = self.start_stream(sample_rate)
+        stream.accept(pcm)
+        return stream.finish()
+
+
+# ---------- registry ----------
+
+BACKENDS: Dict[str, Callable[..., ASRBackend]] = {
+    "google": GoogleBackend,
+    "vosk": VoskBackend,
+}
+
+_INSTANCES: Dict[str, ASRBackend] = {}
+_INSTANCES_LOCK = threading.RLock()   # the fallback below re-enters get_backend()
+
+
+def register_backend(name: str, factory: Callable[..., ASRBackend]):
+    BACKENDS[name] = factory
+
+
+def get_backend(name: Optional[str] = None) -> ASRBackend:
+    """
+    Return a shared backend instance. If the offline backend can't load,
+    fall back to Google so the assistant keeps working.
+    """
+    name = name or DEFAULT_BACKEND
+    with _INSTANCES_LOCK:
+        if name not in _INSTANCES:
+            try:
+                _INSTANCES[name] = BACKENDS[name]()
+            except ASRServiceError as e:
+                print(f"[ASR] {name} unavailable ({e}), using google.")
+                return get_backend("google")
+        return _INSTANCES[name]
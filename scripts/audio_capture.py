@@ -0,0 +1,309 @@
+# scripts/audio_capture.py
+
+import math
+import queue
+import threading
+import time
+from array import array
+from collections import deque
+from typing import List, Optional
+
+# ---------- CONFIG ----------
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+RING_SECONDS = 10          # how much raw audio we always keep around
+PREROLL_MS = 300           # audio kept before speech onset (no clipped syllables)
+ONSET_FRAMES = 3           # consecutive voiced frames needed to start an utterance
+PAUSE_MS = 800             # trailing silence that ends an utterance
+MAX_UTTERANCE_SECONDS = 7
+
+# barge-in (user talks over Leo)
+BARGE_IN_FACTOR = 1.5      # raise the plain VAD threshold while we are playing
+ECHO_MARGIN = 3.0          # mic level must beat the expected echo by this much
+ECHO_TAIL_MS = 250         # room echo keeps ringing after playback stops
+
+
+def frame_rms(frame: bytes) -> float:
+    samples = array("h", frame)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class Utterance:
+    """
+    One VAD-delimited chunk of speech cut out of the ring buffer.
+
+    It is published as soon as speech starts and keeps growing while the
+    user talks: streaming consumers iterate frames() as they arrive, others
+    just wait() for the end of speech.
+    """
+
+    def __init__(self, sample_rate: int, start: float):
+        self.sample_rate = sample_rate
+        self.start = start   # time.monotonic() of the first frame
+        self.end: Optional[float] = None
+        self._frames: List[bytes] = []
+        self._cond = threading.Condition()
+
+    def _append(self, frame: bytes):
+        with self._cond:
+            self._frames.append(frame)
+            self._cond.notify_all()
+
+    def _finish(self, end: float):
+        with self._cond:
+            self.end = end
+            self._cond.notify_all()
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None
+
+    def wait(self, timeout: Optional[float] = None) -> "Utterance":
+        with self._cond:
+            self._cond.wait_for(lambda: self.end is not None, timeout=timeout)
+        return self
+
+    def frames(self):
+        """Yield frames as they are captured, until the utterance ends."""
+        i = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: i < len(self._frames) or self.end is not None)
+                chunk = self._frames[i:]
+                done = self.end is not None
+            for f in chunk:
+                yield f
+            i += len(chunk)
+            if done and i >= len(self._frames):
+                return
+
+    @property
+    def pcm(self) -> bytes:
+        with self._cond:
+            return b"".join(self._frames)
+
+    @property
+    def duration(self) -> float:
+        with self._cond:
+            return sum(len(f) for f in self._frames) / 2 / self.sample_rate
+
+    def audio_data(self):
+        import speech_recognition as sr
+        return sr.AudioData(self.pcm, self.sample_rate, 2)
+
+
+class AudioCapture:
+    """
+    One long-lived microphone stream.
+
+    A background thread reads fixed-size frames forever into a ring buffer.
+    An energy VAD cuts utterances (with pre-roll) out of that buffer and
+    publishes them to every utterance subscriber the moment speech starts;
+    raw frames are also published to frame subscribers (e.g. the wake-word
+    spotter).
+    """
+
+    def __init__(self, device_index: Optional[int] = None, sample_rate: int = SAMPLE_RATE,
+                 frame_ms: int = FRAME_MS, ring_seconds: int = RING_SECONDS):
+        self.device_index = device_index
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_ms = frame_ms
+        self.energy_threshold = 300.0
+        self.on_barge_in = None     # called when speech starts over our own playback
+
+        # echo awareness: what we're playing and how loud it comes back
+        self._playing = False
+        self._playback_until = 0.0
+        self._ref_levels = deque(maxlen=4)
+        self._echo_gain = 0.5       # mic rms / playback rms, learned online
+
+        self._ring = deque(maxlen=ring_seconds * 1000 // frame_ms)
+        self._frame_subs: List[queue.Queue] = []
+        self._utt_subs: List[queue.Queue] = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    # ---------- lifecycle ----------
+
+    def start(self):
+        if self._thread is not None:
+            return
+        import pyaudio
+
+        self._pa = pyaudio.PyAudio()
+        self._stream = self._pa.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.frame_samples,
+        )
+        self._thread = threading.Thread(target=self._run, name="audio-capture", daemon=True)
+        self._thread.start()
+        print(f"[AUDIO] Capture started ({self.sample_rate} Hz, {self.frame_ms} ms frames)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        try:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._pa.terminate()
+        except Exception:
+            pass
+
+    def calibrate(self, seconds: float = 1.5, factor: float = 1.5):
+        """Set the VAD threshold from the ambient noise currently in the ring."""
+        time.sleep(seconds)
+        with self._lock:
+            frames = list(self._ring)[-int(seconds * 1000 / self.frame_ms):]
+        if frames:
+            ambient = sum(frame_rms(f) for _, f in frames) / len(frames)
+            self.energy_threshold = max(100.0, ambient * factor)
+        return self.energy_threshold
+
+    # ---------- playback / echo ----------
+
+    def set_playback(self, active: bool):
+        """Told by the TTS pipeline when Leo starts / stops talking."""
+        self._playing = active
+        if not active:
+            self._playback_until = time.monotonic() + ECHO_TAIL_MS / 1000
+            self._ref_levels.clear()
+
+    def feed_playback(self, pcm: bytes):
+        """Reference signal: every chunk we are about to play."""
+        self._ref_levels.append(frame_rms(pcm))
+
+    def _in_playback(self, now: float) -> bool:
+        return self._playing or now < self._playback_until
+
+    def _is_voiced(self, frame: bytes, now: float) -> bool:
+        level = frame_rms(frame)
+        if not self._in_playback(now):
+            return level >= self.energy_threshold
+
+        ref = max(self._ref_levels, default=0.0)
+        expected_echo = self._echo_gain * ref
+        voiced = level >= max(self.energy_threshold * BARGE_IN_FACTOR, expected_echo * ECHO_MARGIN)
+        if not voiced and ref > self.energy_threshold:
+            # frames that are only echo teach us the speaker -> mic coupling
+            self._echo_gain = 0.95 * self._echo_gain + 0.05 * (level / ref)
+        return voiced
+
+    # ---------- subscriptions ----------
+
+    def subscribe_frames(self, maxsize: int = 200) -> queue.Queue:
+        q = queue.Queue(maxsize=maxsize)
+        with self._lock:
+            self._frame_subs.append(q)
+        return q
+
+    def subscribe_utterances(self, maxsize: int = 0) -> queue.Queue:
+        """With a maxsize, the oldest utterances are dropped when nobody reads the queue."""
+        q = queue.Queue(maxsize=maxsize)
+        with self._lock:
+            self._utt_subs.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            if q in self._frame_subs:
+                self._frame_subs.remove(q)
+            if q in self._utt_subs:
+                self._utt_subs.remove(q)
+
+    @staticmethod
+    def next_utterance(q: queue.Queue, since: float = 0.0,
+                       timeout: Optional[float] = None) -> Optional[Utterance]:
+        """Next utterance that started at or after `since` (monotonic time)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                utt = q.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if utt.start >= since:
+                return utt
+
+    # ---------- capture loop ----------
+
+    @staticmethod
+    def _offer(q: queue.Queue, item):
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            try:
+                q.get_nowait()  # drop the oldest, keep it live
+                q.put_nowait(item)
+            except (queue.Empty, queue.Full):
+                pass
+
+    def _publish_frame(self, frame: bytes):
+        for q in self._frame_subs:
+            self._offer(q, frame)
+
+    def _begin_utterance(self, frames) -> Utterance:
+        utt = Utterance(self.sample_rate, start=frames[0][0])
+        for _, f in frames:
+            utt._append(f)
+        with self._lock:
+            subs = list(self._utt_subs)
+        for q in subs:
+            self._offer(q, utt)
+        return utt
+
+    def _run(self):
+        preroll = max(1, PREROLL_MS // self.frame_ms)
+        pause_frames = max(1, PAUSE_MS // self.frame_ms)
+        max_frames = MAX_UTTERANCE_SECONDS * 1000 // self.frame_ms
+
+        voiced_run = 0
+        silence_run = 0
+        current = None   # Utterance while inside speech
+        length = 0
+
+        while not self._stop.is_set():
+            try:
+                frame = self._stream.read(self.frame_samples, exception_on_overflow=False)
+            except Exception as e:
+                print(f"[AUDIO] Capture read failed: {e}")
+                time.sleep(0.1)
+                continue
+
+            now = time.monotonic()
+            with self._lock:
+                self._ring.append((now, frame))
+                self._publish_frame(frame)
+
+            voiced = self._is_voiced(frame, now)
+
+            if current is None:
+                voiced_run = voiced_run + 1 if voiced else 0
+                if voiced_run >= ONSET_FRAMES:
+                    if self._playing and self.on_barge_in:
+                        print("[AUDIO] Barge-in detected")
+                        self.on_barge_in()
+                    with self._lock:
+                        onset = list(self._ring)[-(preroll + ONSET_FRAMES):]
+                    current = self._begin_utterance(onset)
+                    length = len(onset)
+                    silence_run = 0
+                continue
+
+            current._append(frame)
+            length += 1
+            silence_run = 0 if voiced else silence_run + 1
+            if silence_run >= pause_frames or length >= max_frames:
+                current._finish(now + self.frame_ms / 1000)
+                current = None
+                voiced_run = 0
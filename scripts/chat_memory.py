@@ -0,0 +1,133 @@
+# scripts/chat_memory.py
+
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+# ---------- CONFIG ----------
+
+TURN_BUDGET = 600      # tokens of verbatim recent turns sent with each request
+MAX_TURNS = 8          # ring size, whatever the budget
+DIGEST_BUDGET = 150    # tokens of running summary of everything older
+
+SUMMARY_PROMPT = """
+You maintain a short running summary of a voice conversation between a user and Leo.
+Merge the new exchanges into the summary. Keep names, places, dates, numbers and open requests.
+Drop small talk. Reply with the summary only, at most {words} words.
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token), good enough for budgeting."""
+    return len(text or "") // 4 + 1
+
+
+class ConversationMemory:
+    """
+    Session memory for chat().
+
+    The last few turns are kept verbatim in a ring that is bounded both by
+    MAX_TURNS and by a token budget. Turns pushed out of the ring are
+    folded into a running digest (by the LLM in the background, or by
+    plain truncation if that fails), which is itself capped. So the
+    prompt sent per turn is at most DIGEST_BUDGET + TURN_BUDGET tokens
+    plus the new question, however long the session runs.
+    """
+
+    def __init__(self, turn_budget: int = TURN_BUDGET, max_turns: int = MAX_TURNS,
+                 digest_budget: int = DIGEST_BUDGET,
+                 summarize: Optional[Callable[[str, str], str]] = None):
+        self.turn_budget = turn_budget
+        self.digest_budget = digest_budget
+        self.summarize = summarize          # (system, text) -> summary; None = truncation only
+        self.digest = ""
+        self._turns: Deque[Tuple[str, str, int]] = deque(maxlen=max_turns)
+        self._turn_tokens = 0
+        self._evicted: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._summarizing = False
+
+    # ---------- public ----------
+
+    def build(self, system: str, text: str) -> Tuple[str, List[Dict[str, str]]]:
+        """System prompt (with the digest) and messages for a new user turn."""
+        with self._lock:
+            digest = self.digest
+            turns = list(self._turns)
+
+        if digest:
+            system = f"{system}\nEarlier in this conversation: {digest}"
+        messages = []
+        for user, assistant, _ in turns:
+            messages.append({"role": "user", "content": user})
+            messages.append({"role": "assistant", "content": assistant})
+        messages.append({"role": "user", "content": text})
+        return system, messages
+
+    def add(self, user: str, assistant: str):
+        tokens = estimate_tokens(user) + estimate_tokens(assistant)
+        with self._lock:
+            if len(self._turns) == self._turns.maxlen:
+                self._evict_locked()
+            self._turns.append((user, assistant, tokens))
+            self._turn_tokens += tokens
+            # always keep the newest turn, even if it alone is over budget
+            while self._turn_tokens > self.turn_budget and len(self._turns) > 1:
+                self._evict_locked()
+            start = bool(self._evicted) and not self._summarizing
+            if start:
+                self._summarizing = True
+
+        if start:
+            threading.Thread(target=self._fold, name="chat-digest", daemon=True).start()
+
+    def clear(self):
+        with self._lock:
+            self._turns.clear()
+            self._turn_tokens = 0
+            self._evicted.clear()
+            self.digest = ""
+
+    def prompt_tokens(self) -> int:
+        with self._lock:
+            return estimate_tokens(self.digest) + self._turn_tokens
+
+    # ---------- digest ----------
+
+    def _evict_locked(self):
+        user, assistant, tokens = self._turns.popleft()
+        self._turn_tokens -= tokens
+        self._evicted.append((user, assistant))
+
+    def _fold(self):
+        while True:
+            with self._lock:
+                batch, self._evicted = self._evicted, []
+                digest = self.digest
+                if not batch:
+                    self._summarizing = False
+                    return
+
+            exchanges = "\n".join(f"User: {u}\nLeo: {a}" for u, a in batch)
+            new = None
+            if self.summarize is not None:
+                words = self.digest_budget * 3 // 4
+                try:
+                    new = self.summarize(SUMMARY_PROMPT.format(words=words),
+                                         f"Summary so far: {digest or '(empty)'}\n\nNew exchanges:\n{exchanges}")
+                except Exception as e:
+                    print(f"[MEMORY] summarizing failed, truncating instead: {e}")
+            if not new or not new.strip():
+                new = f"{digest} " + " ".join(f"User asked: {u} Leo said: {a}" for u, a in batch)
+
+            with self._lock:
+                self.digest = _clip_left(new.strip(), self.digest_budget)
+
+
+def _clip_left(text: str, budget: int) -> str:
+    """Keep the most recent part of `text` within `budget` tokens, cut at a word."""
+    if estimate_tokens(text) <= budget:
+        return text
+    keep = text[-budget * 4:]
+    space = keep.find(" ")
+    return keep[space + 1:] if space != -1 else keep
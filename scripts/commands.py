@@ -0,0 +1,170 @@
+# scripts/commands.py
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+_END = "\0"   # trie key marking "a phrase ends here"
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall((text or "").lower())
+
+
+# ---------- slot extractors ----------
+# (tokens, start, end) -> value ; start/end is the span of the matched phrase
+
+def _as_number(tok: str):
+    try:
+        return int(tok)
+    except ValueError:
+        try:
+            return float(tok)
+        except ValueError:
+            return None
+
+
+def slot_number(tokens: List[str], start: int, end: int):
+    """First number after the phrase, else the first number anywhere."""
+    for tok in tokens[end:] + tokens[:start]:
+        n = _as_number(tok)
+        if n is not None:
+            return n
+    return None
+
+
+def slot_rest(tokens: List[str], start: int, end: int) -> str:
+    """Everything said after the phrase."""
+    return " ".join(tokens[end:])
+
+
+SLOT_TYPES: Dict[str, Callable] = {
+    "number": slot_number,
+    "rest": slot_rest,
+}
+
+
+class Command:
+    def __init__(self, name: str, priority: int, slots: Dict[str, str], exact: bool):
+        self.name = name
+        self.priority = priority
+        self.slots = slots
+        self.exact = exact
+
+
+class CommandMatch:
+    def __init__(self, command: Command, phrase: str, span: Tuple[int, int], slots: Dict):
+        self.name = command.name
+        self.command = command
+        self.phrase = phrase
+        self.span = span
+        self.slots = slots
+
+    def __repr__(self):
+        return f"CommandMatch({self.name!r}, phrase={self.phrase!r}, slots={self.slots})"
+
+
+class CommandTable:
+    """
+    Registrable voice-command table.
+
+    Every phrase is stored in a token trie, so one left-to-right pass over
+    the transcript finds every phrase occurrence (whole words only, so
+    "read" no longer fires on "ready"). The winner is the highest priority,
+    then the longest phrase, then the earliest one. With first_wins=True
+    the earliest phrase wins and priority only breaks ties at the same
+    word, for tables where the leading command word is what the user
+    meant ("send ... saying play it" is a send). Slots are filled from
+    the tokens around the winning phrase.
+    """
+
+    def __init__(self, first_wins: bool = False):
+        self._trie: Dict = {}
+        self.commands: Dict[str, Command] = {}
+        self.first_wins = first_wins
+
+    def add(self, name: str, phrases: Iterable[str], priority: int = 0,
+            slots: Optional[Dict[str, str]] = None, exact: bool = False) -> "CommandTable":
+        slots = slots or {}
+        for slot_type in slots.values():
+            if slot_type not in SLOT_TYPES:
+                raise ValueError(f"Unknown slot type: {slot_type}")
+
+        cmd = Command(name, priority, slots, exact)
+        self.commands[name] = cmd
+        for phrase in phrases:
+            tokens = tokenize(phrase)
+            if not tokens:
+                raise ValueError(f"Empty phrase for command {name!r}")
+            node = self._trie
+            for tok in tokens:
+                node = node.setdefault(tok, {})
+            node.setdefault(_END, []).append((cmd, " ".join(tokens)))
+        return self
+
+    def match(self, text: str) -> Optional[CommandMatch]:
+        tokens = tokenize(text)
+        n = len(tokens)
+        best = None
+        best_key = None
+
+        for i in range(n):
+            node = self._trie
+            for j in range(i, n):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                for cmd, phrase in node.get(_END, ()):
+                    if cmd.exact and (i != 0 or j != n - 1):
+                        continue
+                    if self.first_wins:
+                        key = (-i, cmd.priority, j - i + 1)
+                    else:
+                        key = (cmd.priority, j - i + 1, -i)
+                    if best_key is None or key > best_key:
+                        best, best_key = (cmd, phrase, i, j + 1), key
+
+        if best is None:
+            return None
+
+        cmd, phrase, start, end = best
+        slots = {name: SLOT_TYPES[kind](tokens, start, end) for name, kind in cmd.slots.items()}
+        return CommandMatch(cmd, phrase, (start, end), slots)
+
+
+# ======================================
+# TOP-LEVEL COMMANDS
+# ======================================
+# the first command word said decides the route ("send message to ashu
+# saying play the song" is telegram); priorities keep the old order for
+# ties: youtube > telegram > brightness > exit
+
+MAIN_COMMANDS = (
+    CommandTable(first_wins=True)
+    .add("youtube", ["youtube", "play"], priority=40)
+    .add("telegram", ["send", "read", "reply"], priority=30)
+    .add("brightness", ["brightness"], priority=20, slots={"value": "number"})
+    .add("exit", ["good night", "exit"], priority=10)
+)
+
+# ======================================
+# YOUTUBE MODE COMMANDS
+# ======================================
+
+YOUTUBE_COMMANDS = (
+    CommandTable()
+    .add("close", ["exit youtube", "close youtube"], priority=100)
+    .add("next", ["next", "next song"], priority=20)
+    .add("previous", ["previous", "previous song"], priority=20)
+    .add("skip_ad", ["skip ad", "skip the ad"], priority=20)
+    .add("skip_ad", ["skip"], priority=20, exact=True)
+    .add("faster", ["faster", "increase speed"], priority=20)
+    .add("slower", ["slower", "decrease speed"], priority=20)
+    .add("speed", ["speed"], priority=10, slots={"value": "number"})
+    .add("forward", ["forward"], priority=20)
+    .add("rewind", ["rewind", "backward"], priority=20)
+    .add("volume", ["volume"], priority=20, slots={"value": "number"})
+    .add("mute", ["mute", "unmute"], priority=20)
+    # bare "play"/"pause" only toggles when nothing more specific matched
+    .add("toggle", ["pause", "play", "pause or play", "resume"], priority=0)
+)
@@ -3,11 +3,23 @@
 # import json
 # from typing import Optional, Dict
 # import openai
-import google.generativeai as genai
-from numba.typed.listobject import ListModel
+import asyncio
+import re
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple
 
-genai.configure(api_key= "gemini_api_key")
-ListModel
+from scripts.chat_memory import ConversationMemory
+from scripts.llm_backend import get_backend
+from scripts.nlp_controller import PARSE_DEADLINE, extract_json, record_route
+from scripts.response_cache import ResponseCache
+
+# a ```json fence the model adds despite being told not to
+_FENCE = re.compile(r"^\s*```[A-Za-z]*\s*")
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / "cache" / "chat" / "responses.json"
+
+# backend / model come from scripts.llm_backend (LEO_LLM_BACKEND, LEO_CHAT_MODEL)
 
 
 SYSTEM_PROMPT = """
@@ -24,28 +36,54 @@ When the user asks to sing, sing the lyrics "mera yeshuu yeshuu mera yeshuu yesh
 
 """
 
-model = genai.GenerativeModel(
+# route_or_answer(): same persona, plus the actions Leo can carry out.
+# SYSTEM_PROMPT stays the first thing in every request (chat and routing
+# alike, the conversation digest goes after it), so providers that cache
+# prompt prefixes can reuse it.
+ROUTE_PROMPT = SYSTEM_PROMPT + """
+If the user wants Leo to DO one of the following, reply with ONLY one JSON object
+(no text before or after, no backticks) and leave out fields you don't know:
+{"action": "send_telegram", "target": "contact", "message": "text"}
+{"action": "send_telegram_group", "target": "group name", "message": "text"}
+{"action": "read_telegram", "target": "contact"}
+{"action": "reply_telegram", "message": "text"}
+{"action": "brightness_set", "value": 0-100}
+{"action": "open_youtube"}
+Otherwise just answer in plain text, and never start a plain answer with "{".
+"""
+
+def _summarize(system: str, text: str) -> str:
+    backend = get_backend()
+    return backend.complete(system, [{"role": "user", "content": text}], backend.model_for("chat"))
+
+
+# recent turns verbatim + a running digest of older ones, so follow-ups
+# work while the prompt per turn stays bounded
+MEMORY = ConversationMemory(summarize=_summarize)
+
+# repeated small talk / facts ("who made you") are answered from disk
+CACHE = ResponseCache(CACHE_PATH)
 
-    model_name="gemini-2.0-flash",
-    system_instruction=SYSTEM_PROMPT
-)
 
 # --------------------------
 # CHAT FUNCTION
 # --------------------------
 def chat(text: str) -> str:
     try:
-        response = model.generate_content(
-            {
-                "role": "user",
-                "parts": [
-                    {"text": text}
-                ]
-            }
-        )
-
-        if hasattr(response, "text") and response.text:
-            return response.text.strip()
+        backend = get_backend()
+        model = backend.model_for("chat")
+        cached = CACHE.get(text, model)
+        if cached is not None:
+            MEMORY.add(text, cached)
+            return cached
+
+        system, messages = MEMORY.build(SYSTEM_PROMPT, text)
+        reply = backend.complete(system, messages, model)
+
+        if reply and reply.strip():
+            MEMORY.add(text, reply.strip())
+            CACHE.put(text, reply.strip(), model)
+            return reply.strip()
 
         return "I didn't get that."
 
@@ -54,6 +92,164 @@ def chat(text: str) -> str:
         return "I'm having trouble thinking right now."
 
 
+async def chat_stream(text: str) -> AsyncIterator[str]:
+    """
+    Like chat(), but yields the reply in fragments as the model produces
+    them, so speech can start before the whole answer exists.
+    """
+    try:
+        backend = get_backend()
+        model = backend.model_for("chat")
+        cached = CACHE.get(text, model)
+        if cached is None:
+            system, messages = MEMORY.build(SYSTEM_PROMPT, text)
+            fragments = backend.astream(system, messages, model)
+    except Exception as e:
+        print("Chat error:", e)
+        yield "I'm having trouble thinking right now."
+        return
+
+    if cached is not None:
+        MEMORY.add(text, cached)
+        yield cached
+        return
+
+    replies = _reply_stream(text, model, fragments)
+    try:
+        async for fragment in replies:
+            yield fragment
+    finally:
+        await replies.aclose()
+
+
+async def route_or_answer(text: str) -> Tuple[Optional[Dict], Optional[AsyncIterator[str]]]:
+    """
+    One LLM round trip for an utterance the local rules couldn't place:
+    the model either picks an action or simply answers.
+
+    Returns (intent, None) when it chose an action, else (None, fragments)
+    where fragments streams the answer like chat_stream(). Only the start
+    of the reply is awaited here: an answer never begins with "{" (after
+    any code fence), so the first characters decide, and the rest is
+    spoken as it arrives.
+    """
+    t0 = time.perf_counter()
+    try:
+        backend = get_backend()
+        model = backend.model_for("chat")
+        cached = CACHE.get(text, model)
+        if cached is not None:
+            MEMORY.add(text, cached)
+            return None, _replay(cached)
+
+        system, messages = MEMORY.build(ROUTE_PROMPT, text)
+        fragments = backend.astream(system, messages, model)
+    except Exception as e:
+        print("Chat error:", e)
+        record_route("failed")
+        return None, _replay("I'm having trouble thinking right now.")
+
+    head = ""
+    try:
+        async for fragment in fragments:
+            head += fragment
+            if _body(head):
+                break
+
+        if _body(head).startswith("{"):
+            async for fragment in fragments:
+                head += fragment
+            await fragments.aclose()
+            try:
+                intent = extract_json(head)
+            except ValueError:
+                intent = None
+            record_route("action", time.perf_counter() - t0)
+            if isinstance(intent, dict) and intent.get("action"):
+                return intent, None
+            return {"action": "none"}, None
+
+    except BaseException as e:
+        await fragments.aclose()
+        if not isinstance(e, Exception):
+            raise    # cancelled
+        print("Chat error:", e)
+        record_route("failed", time.perf_counter() - t0)
+        return None, _replay("I'm having trouble thinking right now.")
+
+    record_route("answer", time.perf_counter() - t0)
+    # a fenced answer is spoken (and cached) without its backticks
+    return None, _reply_stream(text, model, fragments, _body(head))
+
+
+async def route_within(text: str, fallback: Dict,
+                       deadline: Optional[float] = None) -> Tuple[Optional[Dict], Optional[AsyncIterator[str]]]:
+    """
+    route_or_answer() with a latency budget, for utterances the rules
+    already have a guess for: if the model hasn't decided within
+    `deadline` seconds (PARSE_DEADLINE) the request is cancelled and
+    (fallback, None) is returned instead.
+    """
+    deadline = PARSE_DEADLINE if deadline is None else deadline
+    try:
+        return await asyncio.wait_for(route_or_answer(text), deadline)
+    except asyncio.TimeoutError:
+        record_route("timeout")
+        print(f"[NLP] LLM missed the {deadline:.1f}s deadline, using rules: {fallback.get('action')}")
+        return fallback, None
+
+
+def _body(head: str) -> str:
+    """The reply so far without a leading code fence ("" while the fence line is incomplete)."""
+    stripped = head.lstrip()
+    if "```".startswith(stripped):
+        return ""       # could still become a fence
+    m = _FENCE.match(stripped)
+    return stripped[m.end():] if m else stripped
+
+
+def _said(parts) -> str:
+    """The streamed reply as one string, without the closing fence of a fenced answer."""
+    return "".join(parts).strip().removesuffix("```").rstrip()
+
+
+async def _replay(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def _reply_stream(text: str, model: str, fragments: AsyncIterator[str],
+                        head: str = "") -> AsyncIterator[str]:
+    """Yield `head` then `fragments`, and remember what was said."""
+    parts = []
+    complete = False
+    try:
+        if head:
+            parts.append(head)
+            yield head
+        async for fragment in fragments:
+            parts.append(fragment)
+            yield fragment
+        complete = True
+
+    except Exception as e:
+        print("Chat error:", e)
+        if not parts:
+            yield "I'm having trouble thinking right now."
+        return
+
+    finally:
+        await fragments.aclose()
+        # remember what was actually said, even if the user cut Leo off
+        if parts:
+            MEMORY.add(text, _said(parts))
+
+    # only whole answers are worth replaying; put() writes the cache file
+    if complete and parts:
+        await asyncio.to_thread(CACHE.put, text, _said(parts), model)
+    if not parts:
+        yield "I didn't get that."
+
+
 # --------------------------
 # TEST RUN
 # --------------------------
@@ -0,0 +1,277 @@
+# scripts/dialog_index.py
+
+import bisect
+import heapq
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from scripts.fuzzy import bounded_levenshtein, soundex
+
+_WORD = re.compile(r"\w+")
+
+# match kinds, best first, with the score each one reports;
+# "sounds_like" scales this by how close the spelling is
+SCORES = {"exact": 1.0, "token": 0.9, "prefix": 0.8, "substring": 0.7, "sounds_like": 0.6}
+
+# a misheard word ("ashoo", "aashu") must be at least this similar to a name word
+SOUNDS_LIKE_CUTOFF = 0.6
+
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def _deletes(token: str) -> Set[str]:
+    """`token` and every string one deletion away from it (SymSpell keys)."""
+    return {token} | {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _sound_key(token: str) -> str:
+    return soundex(token) if token.isascii() and token.isalpha() else ""
+
+
+def word_similarity(query: str, token: str, query_key: Optional[str] = None) -> float:
+    """
+    1.0 = same word. Words that sound the same (equal Soundex) and are
+    spelled within half their length of each other score at least 0.8.
+    """
+    longest = max(len(query), len(token))
+    same_sound = (query_key if query_key is not None else _sound_key(query)) == _sound_key(token) != ""
+    limit = longest // 2 if same_sound else max(1, longest // 3)
+    dist = bounded_levenshtein(query, token, limit)
+    if dist > limit:
+        return 0.0
+    score = 1 - dist / longest
+    return max(score, 0.8) if same_sound else score
+
+
+def normalize_name(name: str) -> str:
+    """Case-, accent- and punctuation-insensitive form ("Dad's 🚀 Café" -> "dads cafe")."""
+    text = unicodedata.normalize("NFKD", (name or "").replace("'", "").replace("\u2019", ""))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(_WORD.findall(text.casefold()))
+
+
+class DialogMatch(NamedTuple):
+    dialog: Any
+    name: str       # normalized dialog name
+    kind: str       # "exact" | "token" | "prefix" | "substring"
+    score: float
+
+
+class _Entry(NamedTuple):
+    dialog: Any
+    name: str
+    tokens: tuple
+    seq: int        # insertion order: get_dialogs() lists the most recent chats first
+
+
+class DialogIndex:
+    """
+    Name index over Telegram dialogs for find_dialog().
+
+    Names are normalized once and kept in four structures: full name ->
+    ids, token -> ids, a sorted token list for prefix lookups (bisect)
+    and token trigrams -> tokens for substrings. For names ASR spelled by
+    ear there are two more: Soundex code -> tokens and one-deletion keys
+    -> tokens, which give the few words worth an edit-distance check.
+
+    A query is tried as an exact name, then as whole tokens ("kumar" in
+    "Ashu Kumar"), then as token prefixes ("ash"), then as a substring
+    ("shu"), and finally by sound ("ashoo", "aashu" -> "Ashu"), scored
+    by spelling similarity. Ties go to the shorter name, then to the chat
+    that was listed first. add() / remove() update the index in place,
+    so nothing is rebuilt or scanned per lookup.
+    """
+
+    def __init__(self, dialogs: Iterable[Any] = ()):
+        self._entries: Dict[Any, _Entry] = {}      # dialog id -> entry
+        self._names: Dict[str, Set[Any]] = {}      # normalized name -> ids
+        self._tokens: Dict[str, Set[Any]] = {}     # token -> ids
+        self._sorted_tokens: List[str] = []
+        self._grams: Dict[str, Set[str]] = {}      # trigram -> tokens
+        self._sounds: Dict[str, Set[str]] = {}     # soundex -> tokens
+        self._near: Dict[str, Set[str]] = {}       # one-deletion key -> tokens
+        self._rank: Dict[Any, tuple] = {}          # id -> tie-break key
+        self._seq = 0
+        for d in dialogs:
+            self.add(d)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, dialog_id):
+        return dialog_id in self._entries
+
+    # ---------- updates ----------
+
+    def add(self, dialog, name: Optional[str] = None):
+        """Index (or re-index, e.g. after a rename) `dialog` under `name` or dialog.name."""
+        old = self._entries.get(dialog.id)
+        norm = normalize_name(dialog.name if name is None else name)
+        if old is not None:
+            if old.name == norm:
+                self._entries[dialog.id] = old._replace(dialog=dialog)
+                return
+            self.remove(dialog.id)
+        if not norm:
+            return
+
+        tokens = tuple(dict.fromkeys(norm.split()))
+        seq = old.seq if old else self._seq
+        self._seq += 1
+        self._entries[dialog.id] = _Entry(dialog, norm, tokens, seq)
+        self._rank[dialog.id] = (len(norm), seq)
+        self._names.setdefault(norm, set()).add(dialog.id)
+        for t in tokens:
+            ids = self._tokens.get(t)
+            if ids is None:
+                ids = self._tokens[t] = set()
+                bisect.insort(self._sorted_tokens, t)
+                for g in _trigrams(t):
+                    self._grams.setdefault(g, set()).add(t)
+                for k in _deletes(t):
+                    self._near.setdefault(k, set()).add(t)
+                key = _sound_key(t)
+                if key:
+                    self._sounds.setdefault(key, set()).add(t)
+            ids.add(dialog.id)
+
+    def remove(self, dialog_id):
+        entry = self._entries.pop(dialog_id, None)
+        if entry is None:
+            return
+        del self._rank[dialog_id]
+        self._discard(self._names, entry.name, dialog_id)
+        for t in entry.tokens:
+            if self._discard(self._tokens, t, dialog_id):
+                i = bisect.bisect_left(self._sorted_tokens, t)
+                del self._sorted_tokens[i]
+                for g in _trigrams(t):
+                    self._discard(self._grams, g, t)
+                for k in _deletes(t):
+                    self._discard(self._near, k, t)
+                self._discard(self._sounds, _sound_key(t), t)
+
+    def sync(self, dialogs: Iterable[Any]):
+        """Make the index match `dialogs`: add new / renamed ones, drop the missing."""
+        seen = set()
+        for d in dialogs:
+            seen.add(d.id)
+            self.add(d)
+        for dialog_id in [i for i in self._entries if i not in seen]:
+            self.remove(dialog_id)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[Any]], key: str, item) -> bool:
+        """Remove item from index[key]; True if the key is now gone."""
+        ids = index.get(key)
+        if ids is None:
+            return False
+        ids.discard(item)
+        if not ids:
+            del index[key]
+            return True
+        return False
+
+    # ---------- lookups ----------
+
+    def search(self, query: str, limit: int = 5) -> List[DialogMatch]:
+        """Best matches for `query`, best first (only the best kind that matched)."""
+        q = normalize_name(query)
+        if not q:
+            return []
+        tokens = q.split()
+
+        kind, ids = "exact", self._names.get(q, set())
+        if not ids:
+            kind, ids = "token", self._all_tokens(tokens)
+        if not ids:
+            kind, ids = "prefix", self._all_prefixes(tokens)
+        if not ids:
+            # rare: the query starts mid-word ("shu" for "Ashu")
+            kind, ids = "substring", self._substring(q, tokens)
+        if not ids:
+            return self._sounds_like(tokens, limit)
+
+        best = heapq.nsmallest(limit, ids, key=self._rank.__getitem__)
+        return [DialogMatch(self._entries[i].dialog, self._entries[i].name, kind, SCORES[kind]) for i in best]
+
+    def best(self, query: str) -> Optional[DialogMatch]:
+        matches = self.search(query, limit=1)
+        return matches[0] if matches else None
+
+    def _all_tokens(self, tokens: List[str]) -> Set[Any]:
+        ids = None
+        for t in tokens:
+            found = self._tokens.get(t)
+            if not found:
+                return set()
+            ids = set(found) if ids is None else ids & found
+        return ids or set()
+
+    def _with_prefix(self, prefix: str) -> Set[Any]:
+        ids = set()
+        i = bisect.bisect_left(self._sorted_tokens, prefix)
+        while i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(prefix):
+            ids |= self._tokens[self._sorted_tokens[i]]
+            i += 1
+        return ids
+
+    def _all_prefixes(self, tokens: List[str]) -> Set[Any]:
+        ids = None
+        for t in tokens:
+            found = self._with_prefix(t)
+            if not found:
+                return set()
+            ids = found if ids is None else ids & found
+        return ids or set()
+
+    def _substring(self, q: str, tokens: List[str]) -> Set[Any]:
+        # candidate tokens share every trigram of the longest query token;
+        # queries too short for a trigram don't get substring matches
+        longest = max(tokens, key=len)
+        grams = _trigrams(longest)
+        if not grams:
+            return set()
+        candidates = set.intersection(*(self._grams.get(g, set()) for g in grams))
+        ids = set()
+        for t in candidates:
+            if longest in t:
+                ids |= self._tokens[t]
+        return {i for i in ids if q in self._entries[i].name}
+
+    def _sounds_like(self, tokens: List[str], limit: int) -> List[DialogMatch]:
+        # every query word has to resemble some word of the name; the
+        # dialog scores the mean similarity of its best-matching words
+        per_word = []
+        for q in tokens:
+            key = _sound_key(q)
+            candidates = set(self._sounds.get(key, ()))
+            for k in _deletes(q):
+                candidates |= self._near.get(k, set())
+            words = [(t, sim) for t in candidates for sim in (word_similarity(q, t, key),) if sim >= SOUNDS_LIKE_CUTOFF]
+            if not words:
+                return []
+            per_word.append(words)
+
+        # start from the rarest word, so common surnames only filter
+        per_word.sort(key=lambda words: sum(len(self._tokens[t]) for t, _ in words))
+        totals: Dict[Any, float] = {}
+        for t, sim in per_word[0]:
+            for i in self._tokens[t]:
+                if sim > totals.get(i, 0.0):
+                    totals[i] = sim
+        for words in per_word[1:]:
+            kept = {}
+            for i, total in totals.items():
+                sim = max((sim for t, sim in words if i in self._tokens[t]), default=0.0)
+                if sim:
+                    kept[i] = total + sim
+            totals = kept
+
+        n = len(tokens)
+        best = heapq.nsmallest(limit, totals, key=lambda i: (-totals[i], self._rank[i]))
+        return [DialogMatch(self._entries[i].dialog, self._entries[i].name, "sounds_like",
+                            SCORES["sounds_like"] * totals[i] / n) for i in best]
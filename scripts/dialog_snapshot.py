@@ -0,0 +1,82 @@
+# scripts/dialog_snapshot.py
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+# ---------- CONFIG ----------
+
+VERSION = 1
+FULL_SYNC_EVERY = 24 * 3600   # seconds; in between, only chats active since the last sync are fetched
+
+
+class DialogRef:
+    """The part of a Telegram dialog Leo needs: marked id, display name, last activity."""
+
+    __slots__ = ("id", "name", "date")
+
+    def __init__(self, id: int, name: str, date: float = 0.0):
+        self.id = id
+        self.name = name
+        self.date = date        # unix time of the newest message
+
+    def __repr__(self):
+        return f"DialogRef({self.id}, {self.name!r})"
+
+
+class DialogSnapshot:
+    """
+    The dialog list, saved as compact JSON so it is usable the moment Leo
+    starts, before Telegram has answered anything.
+
+    `synced_until` is the activity date of the newest dialog seen by the
+    last completed sync: dialogs are listed newest first, so the next
+    sync can stop as soon as it reaches one that old. `full_sync_at` is
+    when every dialog was last listed (the only way to notice chats that
+    were left or deleted while Leo wasn't running).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.dialogs: Dict[int, DialogRef] = {}
+        self.synced_until = 0.0
+        self.full_sync_at = 0.0
+        self.loaded = False
+        self._save_lock = threading.Lock()
+
+    def load(self):
+        self.loaded = True
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get("version") != VERSION:
+                return
+            dialogs = {row[0]: DialogRef(*row) for row in data["dialogs"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        self.dialogs = dialogs
+        self.synced_until = data.get("synced_until", 0.0)
+        self.full_sync_at = data.get("full_sync_at", 0.0)
+
+    def rows(self) -> dict:
+        """What save() writes; build it on the event loop, save it anywhere."""
+        return {
+            "version": VERSION,
+            "synced_until": self.synced_until,
+            "full_sync_at": self.full_sync_at,
+            "dialogs": [[d.id, d.name, d.date] for d in self.dialogs.values()],
+        }
+
+    def save(self, rows: dict):
+        tmp = self.path.with_suffix(".tmp")
+        with self._save_lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps(rows, ensure_ascii=False, separators=(",", ":")))
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"[TG] Could not write {self.path.name}: {e}")
+
+    def missing(self, seen) -> List[int]:
+        return [i for i in self.dialogs if i not in seen]
@@ -0,0 +1,156 @@
+# scripts/fuzzy.py
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    return " ".join(_WORD.findall((text or "").lower()))
+
+
+def bounded_levenshtein(a: str, b: str, limit: int) -> int:
+    """
+    Edit distance restricted to a diagonal band of width `limit`.
+    Returns limit + 1 as soon as the distance is known to exceed `limit`,
+    so hopeless comparisons stop after a row or two.
+    """
+    la, lb = len(a), len(b)
+    if abs(la - lb) > limit:
+        return limit + 1
+    if a == b:
+        return 0
+    if not a or not b:
+        return max(la, lb)
+
+    over = limit + 1
+    prev = [j if j <= limit else over for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        cur = [over] * (lb + 1)
+        cur[0] = i if i <= limit else over
+        row_best = cur[0]
+        ca = a[i - 1]
+        for j in range(max(1, i - limit), min(lb, i + limit) + 1):
+            v = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < v:
+                v = prev[j] + 1
+            if cur[j - 1] + 1 < v:
+                v = cur[j - 1] + 1
+            cur[j] = v
+            if v < row_best:
+                row_best = v
+        if row_best > limit:
+            return over
+        prev = cur
+    return min(prev[lb], over)
+
+
+# ---------- phonetic keys ----------
+
+_SOUNDEX = {}
+for _letters, _code in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"),
+                        ("l", "4"), ("mn", "5"), ("r", "6")):
+    for _ch in _letters:
+        _SOUNDEX[_ch] = _code
+
+
+def soundex(word: str) -> str:
+    """Classic 4-char Soundex ("ashu" / "ashoo" / "aashu" -> A200)."""
+    word = "".join(ch for ch in word.lower() if ch.isalpha())
+    if not word:
+        return ""
+    out = word[0].upper()
+    last = _SOUNDEX.get(word[0], "")
+    for ch in word[1:]:
+        code = _SOUNDEX.get(ch, "")
+        if code and code != last:
+            out += code
+            if len(out) == 4:
+                break
+        if ch not in "hw":
+            last = code
+    return out.ljust(4, "0")
+
+
+def phonetic_key(text: str) -> str:
+    return " ".join(soundex(w) for w in normalize(text).split())
+
+
+# ---------- phrase matcher ----------
+
+class PhraseMatch(NamedTuple):
+    phrase: str
+    start: int      # token index in the normalized text
+    end: int
+    score: float    # 1.0 = exact
+
+
+class PhraseMatcher:
+    """
+    Precompiled fuzzy phrase spotter.
+
+    Variants are normalized and de-duplicated once. match() first looks for
+    exact hits (set lookups, returns immediately), then slides a window of
+    the same token length as each variant over the transcript and scores it
+    with a banded edit distance that gives up as soon as the score can't
+    reach the cutoff. Cost grows linearly with transcript length.
+    """
+
+    def __init__(self, variants: Iterable[str], cutoff: float = 0.7, phonetic: bool = False):
+        self.cutoff = cutoff
+        self.phonetic = phonetic
+        self.variants: List[str] = []
+        for v in variants:
+            v = normalize(v)
+            if v and v not in self.variants:
+                self.variants.append(v)
+
+        # group by token count: one window size per group. Exact hits are a
+        # set lookup; only variants that allow edits go through the DP.
+        self._exact: Dict[int, set] = {}
+        self._fuzzy: Dict[int, List[tuple]] = {}
+        for v in self.variants:
+            size = len(v.split())
+            self._exact.setdefault(size, set()).add(v)
+            limit = int(len(v) * (1 - cutoff))
+            key = phonetic_key(v) if phonetic else None
+            if limit > 0 or key is not None:
+                self._fuzzy.setdefault(size, []).append((v, len(v), set(v), limit, key))
+
+    def _windows(self, tokens: List[str], size: int):
+        for start in range(0, len(tokens) - size + 1):
+            yield start, (" ".join(tokens[start:start + size]) if size > 1 else tokens[start])
+
+    def match(self, text: str) -> Optional[PhraseMatch]:
+        tokens = normalize(text).split()
+
+        # pass 1: exact hits are set lookups and end the search
+        for size, exact in self._exact.items():
+            for start, window in self._windows(tokens, size):
+                if window in exact:
+                    return PhraseMatch(window, start, start + size, 1.0)
+
+        # pass 2: fuzzy scoring
+        best: Optional[PhraseMatch] = None
+        for size, fuzzy in self._fuzzy.items():
+            for start, window in self._windows(tokens, size):
+                wlen = len(window)
+                wchars = set(window)
+                wkey = phonetic_key(window) if self.phonetic else None
+                for v, vlen, vchars, limit, vkey in fuzzy:
+                    score = 0.0
+                    # cheap lower bounds before the DP: every edit changes the
+                    # length by at most one and adds at most one unseen letter
+                    if (abs(wlen - vlen) <= limit
+                            and len(wchars - vchars) <= limit
+                            and len(vchars - wchars) <= limit):
+                        dist = bounded_levenshtein(window, v, limit)
+                        if dist <= limit:
+                            score = 1 - dist / max(wlen, vlen)
+                    if vkey is not None and vkey == wkey:
+                        # sounds the same, however ASR happened to spell it
+                        score = max(score, self.cutoff)
+                    if score >= self.cutoff and (best is None or score > best.score):
+                        best = PhraseMatch(v, start, start + size, score)
+        return best
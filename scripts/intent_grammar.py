@@ -0,0 +1,239 @@
+# scripts/intent_grammar.py
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ---------- template syntax ----------
+#   word          literal (whole word)
+#   (a|b)         one of several words
+#   [word]        optional word, [(a|b)] optional choice
+#   ~             up to MAX_GAP filler words
+#   {name:type}   slot, see SLOT_TYPES
+#   ^  $          start / end of the utterance
+
+MAX_GAP = 3
+
+SLOT_TYPES: Dict[str, str] = {
+    "number": r"\d{1,3}",
+    "name": r"\w+",                      # one-word contact ("ashu")
+    # up to three words ("ashu college"), never running into "and" / a separator
+    "names": r"\w+(?: (?!(?:and|then|saying|that)\b)\w+){0,2}",
+    "text": r".+",                       # the rest of the utterance
+}
+
+# possessive: a filler word is always taken whole, so there is nothing
+# to backtrack into when the next word doesn't fit
+_GAP = r"(?: \S++){0,%d}?" % MAX_GAP
+_PUNCT = r"[^\w\s]*+"   # "brightness, 40" / "youtube." - trailing punctuation after a keyword
+_SLOT = re.compile(r"\{(\w+):(\w+)\}")
+
+
+class IntentRule:
+    def __init__(self, action: str, template: str, confidence: float, defaults: Optional[Dict] = None):
+        self.action = action
+        self.template = template
+        self.confidence = confidence
+        self.defaults = defaults or {}
+        self.slots: Dict[str, str] = {}   # slot name -> type
+
+
+def _compile_token(tok: str, rule: IntentRule, group_prefix: str) -> str:
+    if tok == "~":
+        return _GAP
+    if tok == "^":
+        return "^"
+    if tok == "$":
+        return r"\s*$"
+
+    optional = tok.startswith("[") and tok.endswith("]")
+    if optional:
+        tok = tok[1:-1]
+
+    m = _SLOT.fullmatch(tok)
+    if m:
+        name, kind = m.groups()
+        if kind not in SLOT_TYPES:
+            raise ValueError(f"Unknown slot type {kind!r} in {rule.template!r}")
+        rule.slots[name] = kind
+        # a trailing comma/colon after a name is not part of it
+        tail = "[,:]?" if kind in ("name", "names") else ""
+        piece = f" (?P<{group_prefix}{name}>{SLOT_TYPES[kind]}){tail}"
+    elif tok.startswith("(") and tok.endswith(")"):
+        words = [re.escape(w) for w in tok[1:-1].split("|")]
+        piece = r" (?:%s)\b%s" % ("|".join(words), _PUNCT)
+    else:
+        piece = r" %s\b%s" % (re.escape(tok), _PUNCT)
+
+    return f"(?:{piece})?" if optional else piece
+
+
+def _guard_length(tokens: List[str]) -> int:
+    """
+    Number of leading tokens that form a rule's opening: up to and
+    including the first required word after the keyword, stopping before
+    any slot. A prefix of a pattern is implied by the whole pattern, so it
+    is safe to reject on.
+    """
+    seen_keyword = False
+    for n, tok in enumerate(tokens):
+        if tok.startswith("{") or tok.startswith("[{"):
+            return n
+        if tok in ("^", "~", "$") or tok.startswith("["):
+            continue
+        if seen_keyword:
+            return n + 1
+        seen_keyword = True
+    return len(tokens)
+
+
+class IntentGrammar:
+    """
+    Declarative intent grammar, compiled once.
+
+    Every rule starts with a keyword. All keywords go into one trigger
+    pattern, so a single left-to-right scan finds every place a rule could
+    start; only the rules indexed under that keyword are then tried there.
+    The command that starts earliest wins and the scan stops at it; at
+    the same position rules are tried in priority order ("send message
+    to ashu saying set the brightness to 50" is a send). Fillers between
+    keywords are bounded (MAX_GAP words) and free text only appears as
+    the last slot, so nothing backtracks across the whole transcript and
+    matching stays linear in its length.
+    """
+
+    def __init__(self, rules: Iterable[IntentRule]):
+        self.rules: List[IntentRule] = list(rules)
+        branches: Dict[str, List[Tuple[str, str]]] = {}    # keyword -> [(guard, rule pattern)]
+        for i, rule in enumerate(self.rules):
+            tokens = rule.template.split()
+            first = tokens[1] if tokens[0] == "^" else tokens[0]
+            if first.startswith(("[", "{", "~")):
+                raise ValueError(f"Rule must start with a keyword: {rule.template!r}")
+
+            pieces = [_compile_token(tok, rule, f"r{i}_") for tok in tokens]
+            guard = "".join(pieces[:_guard_length(tokens)])
+            for word in first.strip("()").split("|"):
+                branches.setdefault(word, []).append((guard, f"(?P<r{i}>{''.join(pieces)})"))
+
+        # one pattern per keyword: its rules as alternatives in priority
+        # order, so the first branch that matches is the best one there
+        self._by_keyword = {word: re.compile("|".join(self._guarded(alts))) for word, alts in branches.items()}
+        words = sorted(branches, key=len, reverse=True)
+        self._trigger = re.compile(r" (%s)\b" % "|".join(re.escape(w) for w in words))
+
+    @staticmethod
+    def _guarded(branches: List[Tuple[str, str]]) -> List[str]:
+        """
+        A keyword's rules in priority order, each run of rules that share
+        an opening ("send ~ to", "send ~ message") behind one lookahead
+        of it, so a keyword that is just chatter is rejected after a
+        couple of checks instead of one per rule.
+        """
+        runs: List[Tuple[str, List[str]]] = []
+        for guard, rule in branches:
+            if runs and runs[-1][0] == guard:
+                runs[-1][1].append(rule)
+            else:
+                runs.append((guard, [rule]))
+        return ["(?=%s)(?:%s)" % (guard, "|".join(rules)) for guard, rules in runs]
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        # leading space: every compiled token starts with one
+        t = " " + (text or "").lower()
+        if "  " in t or "\t" in t or "\n" in t:
+            t = " " + " ".join(t.split())
+        return t
+
+    def _match_first_word(self, t: str):
+        """
+        Most commands are said on their own ("play believer"): when the
+        first word is a keyword, try its rules right there before paying
+        for the trigger scan. A match at the start is the earliest there
+        can be, so this never changes the result.
+        """
+        end = t.find(" ", 1)
+        pattern = self._by_keyword.get(t[1:end] if end > 0 else t[1:])
+        return pattern.match(t, 0) if pattern is not None else None
+
+    def match(self, text: str) -> Tuple[Dict, float]:
+        """Returns (intent, confidence); ({"action": "none"}, 0.0) when no rule fits."""
+        t = self.normalize(text)
+        m = self._match_first_word(t)
+        if m is None:
+            for hit in self._trigger.finditer(t):
+                m = self._by_keyword[hit.group(1)].match(t, hit.start())
+                if m:
+                    break
+            else:
+                return {"action": "none"}, 0.0
+
+        i = int(m.lastgroup[1:])
+        rule = self.rules[i]
+        intent = {"action": rule.action, **rule.defaults}
+        for name, kind in rule.slots.items():
+            value = m.group(f"r{i}_{name}")
+            if value is None:
+                continue
+            if kind == "number":
+                value = max(0, min(100, int(value)))
+            else:
+                value = value.strip()
+            intent[name] = value
+        return intent, rule.confidence
+
+
+# ======================================
+# ASSISTANT INTENTS
+# ======================================
+# priority order: brightness > read > group send > send > reply > youtube.
+# Within an action the more specific phrasings come first; the looser
+# ones carry a low confidence so parse() asks the LLM about them. A
+# contact name followed straight by the message ("to ashu kumar hello")
+# has no clear end, so only a separator word ("saying", "that") or the
+# end of the utterance earns 0.8 or more.
+
+INTENT_GRAMMAR = IntentGrammar([
+    # ----- brightness -----
+    IntentRule("brightness_set", "brightness ~ {value:number}", 0.95),
+    IntentRule("brightness_increase", "(increase|raise) [the] brightness", 0.9, {"step": 10}),
+    IntentRule("brightness_increase", "brightness up", 0.9, {"step": 10}),
+    IntentRule("brightness_decrease", "(decrease|lower|reduce) [the] brightness", 0.9, {"step": 10}),
+    IntentRule("brightness_decrease", "brightness down", 0.9, {"step": 10}),
+
+    # ----- read -----
+    IntentRule("read_telegram", "(read|check) ~ (message|messages) ~ from {target:names} $", 0.9),
+    IntentRule("read_telegram", "(read|check) ~ (message|messages) ~ from {target:text}", 0.6),
+
+    # ----- send to a group -----
+    IntentRule("send_telegram_group",
+               "(send|message|text) ~ to [the] group {target:names} (saying|that) {message:text}", 0.9),
+    IntentRule("send_telegram_group", "(send|message|text) ~ to [the] group {target:name} {message:text}", 0.7),
+    IntentRule("send_telegram_group", "(send|message|text) ~ to [the] group {target:name} $", 0.5,
+               {"message": ""}),
+
+    # ----- send -----
+    # send message to Ashu saying hello bro
+    IntentRule("send_telegram", "(send|message|text) ~ to [the] {target:names} (saying|that) {message:text}", 0.9),
+    # send a telegram message to Ashu hello bro / send to Ashu hi there
+    # ("ashu hello" could be a two-word name)
+    IntentRule("send_telegram", "(send|text) ~ (message|telegram) ~ to {target:name} {message:text}", 0.7),
+    IntentRule("send_telegram", "(send|message|text) ~ to {target:name} {message:text}", 0.7),
+    IntentRule("send_telegram", "(send|message|text) ~ to {target:name} $", 0.5, {"message": ""}),
+
+    # ----- reply -----
+    # "reply to this message saying yes" answers the last chat, it doesn't name one
+    IntentRule("reply_telegram", "reply to [(this|that|the|his|her|their|last)] (message|text) [(saying|that)] "
+                                 "{message:text}", 0.85, {"target": None}),
+    IntentRule("reply_telegram", "reply to {target:names} (saying|that) {message:text}", 0.85),
+    IntentRule("reply_telegram", "reply to {target:name} {message:text}", 0.7),
+    IntentRule("reply_telegram", "reply to {target:name} $", 0.5, {"message": ""}),
+    IntentRule("reply_telegram", "reply {message:text}", 0.85, {"target": None}),
+
+    # ----- youtube -----
+    IntentRule("open_youtube", "play {query:text} on youtube $", 0.9),
+    IntentRule("open_youtube", "^ play {query:text}", 0.9),
+    IntentRule("open_youtube", "(open|start|launch) youtube $", 0.9, {"query": ""}),
+    IntentRule("open_youtube", "play {query:text}", 0.6),
+    IntentRule("open_youtube", "youtube", 0.6, {"query": ""}),
+])
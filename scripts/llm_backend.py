@@ -0,0 +1,249 @@
+# scripts/llm_backend.py
+
+import asyncio
+import json
+import os
+import threading
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+# ---------- CONFIG ----------
+
+# "gemini" (Google, online) or "openai" (any OpenAI-compatible server:
+# Ollama, llama.cpp, vLLM, LM Studio... for fully offline use)
+DEFAULT_BACKEND = os.getenv("LEO_LLM_BACKEND", "gemini")
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "gemini_api_key")
+GEMINI_ENDPOINT = os.getenv("LEO_GEMINI_ENDPOINT", "https://generativelanguage.googleapis.com")
+
+OPENAI_BASE_URL = os.getenv("LEO_LLM_BASE_URL", "http://127.0.0.1:11434/v1")   # Ollama default
+OPENAI_API_KEY = os.getenv("LEO_LLM_API_KEY", "")
+
+# model per role; LEO_CHAT_MODEL / LEO_PARSE_MODEL override the backend default
+ROLE_ENV = {"chat": "LEO_CHAT_MODEL", "parse": "LEO_PARSE_MODEL"}
+
+MAX_CONCURRENCY = int(os.getenv("LEO_LLM_CONCURRENCY", "4"))   # requests in flight per backend
+TIMEOUT = 30.0   # seconds, whole request
+
+Messages = List[Dict[str, str]]   # [{"role": "user" | "assistant", "content": "..."}]
+
+
+class LLMError(Exception):
+    """The backend failed (network, HTTP error, unexpected response...)."""
+
+
+class LLMBackend:
+    """
+    One LLM provider. Holds a persistent HTTP session per calling style
+    (requests for sync callers, aiohttp for the event loop) so connections
+    are reused, and a semaphore that caps requests in flight.
+    """
+
+    name = "base"
+    default_models: Dict[str, str] = {}
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._sync_session = None
+        self._sync_slots = threading.BoundedSemaphore(max_concurrency)
+        self._session_lock = threading.Lock()
+        self._loop_state: Dict[asyncio.AbstractEventLoop, tuple] = {}
+
+    # ---------- to implement ----------
+
+    def _request(self, system: str, messages: Messages, model: str,
+                 json_mode: bool, stream: bool) -> tuple:
+        """-> (url, headers, body)"""
+        raise NotImplementedError
+
+    def _parse_reply(self, data: dict) -> str:
+        raise NotImplementedError
+
+    def _parse_event(self, data: dict) -> str:
+        """Text carried by one streamed event ("" if none)."""
+        raise NotImplementedError
+
+    # ---------- public ----------
+
+    def model_for(self, role: str) -> str:
+        return os.getenv(ROLE_ENV.get(role, ""), "") or self.default_models[role]
+
+    def complete(self, system: str, messages: Messages, model: str, json_mode: bool = False) -> str:
+        url, headers, body = self._request(system, messages, model, json_mode, stream=False)
+        with self._sync_slots:
+            try:
+                resp = self._session().post(url, headers=headers, json=body, timeout=TIMEOUT)
+                resp.raise_for_status()
+                return self._parse_reply(resp.json())
+            except LLMError:
+                raise
+            except Exception as e:
+                raise LLMError(f"{self.name}: {e}") from e
+
+    async def acomplete(self, system: str, messages: Messages, model: str, json_mode: bool = False) -> str:
+        url, headers, body = self._request(system, messages, model, json_mode, stream=False)
+        session, slots = self._async_state()
+        async with slots:
+            try:
+                async with session.post(url, headers=headers, json=body) as resp:
+                    resp.raise_for_status()
+                    return self._parse_reply(await resp.json(content_type=None))
+            except (LLMError, asyncio.CancelledError):
+                raise
+            except Exception as e:
+                raise LLMError(f"{self.name}: {e}") from e
+
+    async def astream(self, system: str, messages: Messages, model: str) -> AsyncIterator[str]:
+        """Yield reply text fragments as the server produces them (SSE)."""
+        url, headers, body = self._request(system, messages, model, False, stream=True)
+        session, slots = self._async_state()
+        async with slots:
+            try:
+                async with session.post(url, headers=headers, json=body) as resp:
+                    resp.raise_for_status()
+                    async for line in resp.content:
+                        line = line.strip()
+                        if not line.startswith(b"data:"):
+                            continue
+                        payload = line[5:].strip()
+                        if payload == b"[DONE]":
+                            break
+                        text = self._parse_event(json.loads(payload))
+                        if text:
+                            yield text
+            except (LLMError, asyncio.CancelledError, GeneratorExit):
+                raise
+            except Exception as e:
+                raise LLMError(f"{self.name}: {e}") from e
+
+    async def aclose(self):
+        """Close the aiohttp session of the running loop (call before the loop ends)."""
+        state = self._loop_state.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].close()
+
+    # ---------- sessions ----------
+
+    def _session(self):
+        if self._sync_session is None:
+            with self._session_lock:
+                if self._sync_session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    s = requests.Session()
+                    adapter = HTTPAdapter(pool_maxsize=self.max_concurrency)
+                    s.mount("http://", adapter)
+                    s.mount("https://", adapter)
+                    self._sync_session = s
+        return self._sync_session
+
+    def _async_state(self):
+        # aiohttp sessions and asyncio semaphores belong to one event loop
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None:
+            import aiohttp
+
+            session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            )
+            state = (session, asyncio.Semaphore(self.max_concurrency))
+            self._loop_state[loop] = state
+        return state
+
+
+# ---------- Gemini (REST) ----------
+
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+    default_models = {"chat": "gemini-2.0-flash", "parse": "gemini-1.5-flash"}
+
+    def __init__(self, api_key: str = GEMINI_API_KEY, endpoint: str = GEMINI_ENDPOINT, **kw):
+        super().__init__(**kw)
+        self.api_key = api_key
+        self.endpoint = endpoint.rstrip("/")
+
+    def _request(self, system, messages, model, json_mode, stream):
+        method = "streamGenerateContent?alt=sse" if stream else "generateContent"
+        body = {
+            "system_instruction": {"parts": [{"text": system}]},
+            "contents": [
+                {"role": "model" if m["role"] == "assistant" else "user", "parts": [{"text": m["content"]}]}
+                for m in messages
+            ],
+        }
+        if json_mode:
+            body["generationConfig"] = {"responseMimeType": "application/json"}
+        url = f"{self.endpoint}/v1beta/models/{model}:{method}"
+        return url, {"x-goog-api-key": self.api_key}, body
+
+    def _parse_event(self, data):
+        try:
+            parts = data["candidates"][0]["content"].get("parts", [])
+        except (KeyError, IndexError):
+            return ""
+        return "".join(p.get("text", "") for p in parts)
+
+    def _parse_reply(self, data):
+        if not data.get("candidates"):
+            raise LLMError(f"gemini: no candidates ({data.get('promptFeedback')})")
+        return self._parse_event(data)
+
+
+# ---------- OpenAI-compatible (local / offline) ----------
+
+class OpenAICompatBackend(LLMBackend):
+    name = "openai"
+    default_models = {"chat": "llama3.2", "parse": "llama3.2"}
+
+    def __init__(self, base_url: str = OPENAI_BASE_URL, api_key: str = OPENAI_API_KEY, **kw):
+        super().__init__(**kw)
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+
+    def _request(self, system, messages, model, json_mode, stream):
+        body = {
+            "model": model,
+            "messages": [{"role": "system", "content": system}] + list(messages),
+            "stream": stream,
+        }
+        if json_mode:
+            body["response_format"] = {"type": "json_object"}
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        return f"{self.base_url}/chat/completions", headers, body
+
+    def _parse_event(self, data):
+        try:
+            return data["choices"][0]["delta"].get("content") or ""
+        except (KeyError, IndexError):
+            return ""
+
+    def _parse_reply(self, data):
+        try:
+            return data["choices"][0]["message"]["content"] or ""
+        except (KeyError, IndexError) as e:
+            raise LLMError(f"openai: unexpected reply {data}") from e
+
+
+# ---------- registry ----------
+
+BACKENDS: Dict[str, Callable[..., LLMBackend]] = {
+    "gemini": GeminiBackend,
+    "openai": OpenAICompatBackend,
+}
+
+_INSTANCES: Dict[str, LLMBackend] = {}
+
+
+def register_backend(name: str, factory: Callable[..., LLMBackend]):
+    BACKENDS[name] = factory
+    _INSTANCES.pop(name, None)
+
+
+def get_backend(name: Optional[str] = None) -> LLMBackend:
+    """Shared backend instance (one session + concurrency limit per backend)."""
+    name = name or DEFAULT_BACKEND
+    if name not in _INSTANCES:
+        _INSTANCES[name] = BACKENDS[name]()
+    return _INSTANCES[name]
@@ -1,17 +1,21 @@
+import asyncio
 import json
+import os
 import re
-from typing import Dict, Optional
+import time
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
-import google.generativeai as genai
+from scripts.intent_grammar import INTENT_GRAMMAR
+from scripts.llm_backend import get_backend
 
 # ======================================
 # CONFIG
 # ======================================
-genai.configure(api_key="gemini_api_key")
+# backend / model come from scripts.llm_backend (LEO_LLM_BACKEND, LEO_PARSE_MODEL)
+# how long route_within() waits for the LLM before settling for the rules
+PARSE_DEADLINE = float(os.getenv("LEO_PARSE_DEADLINE", "2.0"))
 
-model = genai.GenerativeModel(
-    model_name="gemini-1.5-flash",
-    system_instruction="""
+SYSTEM_PROMPT = """
 You ALWAYS return a single JSON object with the following format:
 
 {
@@ -41,135 +45,207 @@ Supported actions:
 - system
 - none
 """
-)
 
 # ======================================
 # LLM PARSER – bulletproof
 # ======================================
-def call_llm_parse(text: str) -> Optional[Dict]:
-    try:
-        response = model.generate_content(text)
+def extract_json(raw: str) -> Optional[Dict]:
+    raw = raw.strip()
+
+    # Unwrap markdown fences like ```json ... ```
+    raw = re.sub(r"```[A-Za-z]*", "", raw).strip()
+
+    # Extract first JSON block safely
+    m = re.search(r"\{[\s\S]*\}", raw)
+    if not m:
+        return None
 
-        if not hasattr(response, "text"):
-            return None
+    json_block = m.group(0)
 
-        raw = response.text.strip()
+    try:
+        return json.loads(json_block)
 
-        # Remove markdown like ```json etc.
-        raw = re.sub(r"```.*?```", "", raw, flags=re.DOTALL).strip()
+    except json.JSONDecodeError:
+        # fix trailing commas
+        cleaned = re.sub(r",\s*}", "}", json_block)
+        cleaned = re.sub(r",\s*]", "]", cleaned)
+        return json.loads(cleaned)
 
-        # Extract first JSON block safely
-        m = re.search(r"\{[\s\S]*\}", raw)
-        if not m:
-            return None
 
-        json_block = m.group(0)
+def _parse_request(text: str):
+    backend = get_backend()
+    return backend, [{"role": "user", "content": text}], backend.model_for("parse")
 
-        try:
-            return json.loads(json_block)
 
-        except json.JSONDecodeError:
-            # fix trailing commas
-            cleaned = re.sub(r",\s*}", "}", json_block)
-            cleaned = re.sub(r",\s*]", "]", cleaned)
-            return json.loads(cleaned)
+def call_llm_parse(text: str) -> Optional[Dict]:
+    try:
+        backend, messages, model = _parse_request(text)
+        raw = backend.complete(SYSTEM_PROMPT, messages, model, json_mode=True)
+        return extract_json(raw)
 
     except Exception as e:
         print("LLM parse error:", e)
         return None
 
 
+async def _llm_parse_raw(text: str) -> Dict:
+    """LLM intent for `text`; raises on any failure (used where errors are reported)."""
+    backend, messages, model = _parse_request(text)
+    raw = await backend.acomplete(SYSTEM_PROMPT, messages, model, json_mode=True)
+    intent = extract_json(raw)
+    if not isinstance(intent, dict) or "action" not in intent:
+        raise ValueError(f"no intent in LLM reply: {raw[:80]!r}")
+    return intent
+
+
 # ======================================
-# RULE-BASED PARSER – improved
+# RULE-BASED PARSER – precompiled grammar
 # ======================================
+# parse() answers locally when the rules are at least this sure
+CONFIDENCE_THRESHOLD = 0.8
+
+
+def rule_parse_scored(text: str) -> Tuple[Dict, float]:
+    """
+    Returns (intent, confidence). Confidence is high only when the pattern
+    is unambiguous and every slot the action needs is filled.
+    The rules themselves live in scripts.intent_grammar.
+    """
+    return INTENT_GRAMMAR.match(text)
+
+
 def rule_based_parse(text: str) -> Dict:
-    t = text.lower().strip()
-
-    # ----------------------------------------
-    # Brightness
-    # ----------------------------------------
-    m = re.search(r"brightness.*?(\d{1,3})", t)
-    if m:
-        v = max(0, min(100, int(m.group(1))))
-        return {"action": "brightness_set", "value": v}
-
-    if "increase brightness" in t or "brightness up" in t:
-        return {"action": "brightness_increase", "step": 10}
-
-    if "decrease brightness" in t or "brightness down" in t:
-        return {"action": "brightness_decrease", "step": 10}
-
-    # ----------------------------------------
-    # Read message
-    # ----------------------------------------
-    m = re.search(r"(?:read|check).*(?:message|messages).*from\s+([a-zA-Z0-9\s]+)", t)
-    if m:
-        return {"action": "read_telegram", "target": m.group(1).strip()}
-
-    # ----------------------------------------
-    # Send message
-    # ----------------------------------------
-    # send message to Ashu hello bro
-    m = re.search(r"(?:send|message|text).*to\s+([a-zA-Z0-9\s]+)\s+(.*)", t)
-    if m:
-        return {
-            "action": "send_telegram",
-            "target": m.group(1).strip(),
-            "message": m.group(2).strip()
-        }
-
-    # send to Ashu hi
-    m = re.search(r"send\s+to\s+([a-zA-Z0-9\s]+)\s+(.*)", t)
-    if m:
-        return {
-            "action": "send_telegram",
-            "target": m.group(1).strip(),
-            "message": m.group(2).strip()
-        }
-
-    # ----------------------------------------
-    # Reply
-    # ----------------------------------------
-    # reply to Ashu hi
-    m = re.search(r"reply\s+to\s+([a-zA-Z0-9\s]+)\s+(.*)", t)
-    if m:
-        return {
-            "action": "reply_telegram",
-            "target": m.group(1).strip(),
-            "message": m.group(2).strip()
-        }
-
-    # reply hi (auto last contact)
-    m = re.search(r"reply\s+(.*)", t)
-    if m:
-        return {
-            "action": "reply_telegram",
-            "target": None,
-            "message": m.group(1).strip()
-        }
-
-    # ----------------------------------------
-    # YouTube
-    # ----------------------------------------
-    if "youtube" in t or "play" in t:
-        q = t.replace("play", "").replace("on youtube", "").strip()
-        return {"action": "open_youtube", "query": q}
-
-    # ----------------------------------------
-    # Default
-    # ----------------------------------------
-    return {"action": "none"}
+    return rule_parse_scored(text)[0]
+
+
+# ======================================
+# METRICS
+# ======================================
+_STATS = {
+    "local": 0,             # answered by rules, no LLM call
+    "llm": 0,               # LLM produced the intent
+    "llm_failed": 0,        # LLM was asked but rules had to answer anyway
+    "routed": 0,            # route_or_answer() picked an action
+    "routed_answer": 0,     # route_or_answer() answered instead
+    "route_failed": 0,      # route_or_answer() call failed
+    "route_timeout": 0,     # routed call missed the deadline, rules answered
+    "llm_seconds": 0.0,     # total time spent waiting on the LLM
+}
+
+_ROUTE_OUTCOMES = {"action": "routed", "answer": "routed_answer", "failed": "route_failed", "timeout": "route_timeout"}
+
+
+def record_route(outcome: str, seconds: float = 0.0):
+    """Count one route_or_answer() call: "action", "answer", "failed" or "timeout"."""
+    _STATS[_ROUTE_OUTCOMES[outcome]] += 1
+    _STATS["llm_seconds"] += seconds
+
+
+def parse_stats() -> Dict:
+    routed = _STATS["routed"] + _STATS["routed_answer"] + _STATS["route_failed"]
+    total = _STATS["local"] + _STATS["llm"] + _STATS["llm_failed"] + routed + _STATS["route_timeout"]
+    llm_calls = _STATS["llm"] + _STATS["llm_failed"] + routed
+    avg_llm = _STATS["llm_seconds"] / llm_calls if llm_calls else None
+    return {
+        "parses": total,
+        "llm_calls": llm_calls,
+        "deadline_misses": _STATS["route_timeout"],
+        "local_hit_ratio": _STATS["local"] / total if total else 0.0,
+        "avg_llm_ms": avg_llm * 1000 if avg_llm is not None else None,
+        # each local hit skipped one LLM round trip of average length
+        "est_saved_ms": _STATS["local"] * avg_llm * 1000 if avg_llm is not None else None,
+        **{k: v for k, v in _STATS.items() if k != "llm_seconds"},
+    }
 
 
 # ======================================
 # PUBLIC PARSE FUNCTION
 # ======================================
+def parse_local(text: str) -> Optional[Dict]:
+    """The rule result if the rules are sure of it, else None (no LLM call)."""
+    rule, confidence = rule_parse_scored(text or "")
+    if confidence >= CONFIDENCE_THRESHOLD:
+        _STATS["local"] += 1
+        return rule
+    return None
+
+
 def parse(text: str) -> Dict:
     if not text or not text.strip():
         return {"action": "none"}
 
+    rule, confidence = rule_parse_scored(text)
+    if confidence >= CONFIDENCE_THRESHOLD:
+        _STATS["local"] += 1
+        return rule
+
+    t0 = time.perf_counter()
     llm = call_llm_parse(text)
+    _STATS["llm_seconds"] += time.perf_counter() - t0
     if isinstance(llm, dict) and "action" in llm:
+        _STATS["llm"] += 1
         return llm
 
-    return rule_based_parse(text)
+    _STATS["llm_failed"] += 1
+    return rule
+
+
+# ======================================
+# BATCH PARSING
+# ======================================
+class ParseResult(NamedTuple):
+    index: int              # position in the input
+    text: str
+    intent: Dict
+    source: str             # "rules" or "llm"
+    error: Optional[str]    # why the LLM failed (intent is then the rule result)
+
+
+async def parse_many(texts: Iterable[str], concurrency: int = 8,
+                     use_llm: bool = True) -> AsyncIterator[ParseResult]:
+    """
+    Parse a batch of utterances (transcript logs, evaluation sets).
+
+    The rules run over everything first and confident results are yielded
+    straight away. The remaining texts are de-duplicated (case and
+    whitespace), sent to the LLM at most `concurrency` at a time (the
+    backend's own limit also applies), and yielded as each answer comes
+    back. Results therefore arrive out of order; use .index.
+
+        async for r in parse_many(lines):
+            print(r.index, r.intent, r.error or "")
+    """
+    pending: Dict[str, List[Tuple[int, str, Dict]]] = {}
+    for i, text in enumerate(texts):
+        rule, confidence = rule_parse_scored(text or "")
+        if not use_llm or not (text or "").strip() or confidence >= CONFIDENCE_THRESHOLD:
+            yield ParseResult(i, text, rule, "rules", None)
+            continue
+        key = " ".join(text.lower().split())
+        pending.setdefault(key, []).append((i, text, rule))
+
+    if not pending:
+        return
+
+    slots = asyncio.Semaphore(concurrency)
+
+    async def _one(key: str):
+        async with slots:
+            try:
+                return key, await _llm_parse_raw(pending[key][0][1]), None
+            except Exception as e:
+                return key, None, f"{type(e).__name__}: {e}"
+
+    tasks = [asyncio.ensure_future(_one(key)) for key in pending]
+    try:
+        for done in asyncio.as_completed(tasks):
+            key, intent, error = await done
+            for i, text, rule in pending[key]:
+                if intent is not None:
+                    yield ParseResult(i, text, dict(intent), "llm", None)
+                else:
+                    yield ParseResult(i, text, rule, "rules", error)
+    finally:
+        # consumer stopped early: don't leave requests running
+        for t in tasks:
+            t.cancel()
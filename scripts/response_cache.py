@@ -0,0 +1,232 @@
+# scripts/response_cache.py
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+# ---------- CONFIG ----------
+
+MAX_ENTRIES = 500
+DEFAULT_TTL = 7 * 24 * 3600      # seconds
+SIMILARITY = 0.6                 # word-bigram Jaccard needed for a near-duplicate hit
+
+FILLER_WORDS = {
+    "um", "uh", "erm", "hmm", "hey", "hi", "hello", "leo", "lio", "please", "okay", "ok",
+    "well", "just", "actually", "basically", "kindly",
+}
+# words that don't count towards similarity ("what is the capital of india"
+# is "capital of india")
+STOP_WORDS = {"a", "an", "the", "is", "are", "was", "were", "am", "be", "all", "really", "exactly", "ever",
+              "what", "whats", "what's", "me"}
+# a near-duplicate that adds or drops one of these means the opposite
+NEGATIONS = {"not", "no", "never", "without", "dont", "don't", "isnt", "isn't", "cant", "can't"}
+# polite openers that don't change the question ("can you tell me a joke")
+POLITE_PREFIX = re.compile(r"^(?:(?:can|could|would|will) you |do you know |tell me )+(?=\S)")
+
+# (pattern, ttl seconds); ttl None = never cached. First match wins.
+TTL_RULES = [
+    # answers that change with time or place
+    (re.compile(r"\b(?:time|today|tonight|tomorrow|yesterday|now|date|day|weather|temperature|"
+                r"news|latest|current|currently|score|price|stock|traffic|this week|weekend)\b"), None),
+    # the user wants something new every time
+    (re.compile(r"\b(?:joke|another|random|story|surprise)\b"), None),
+    # follow-ups that only make sense with the conversation so far
+    (re.compile(r"^(?:and|also|what about|how about|then|why)\b"), None),
+    (re.compile(r"\b(?:it|that|this|he|she|they|him|her|them|those|these)\b"), None),
+    # "who is the ceo of ..." style facts go stale eventually
+    (re.compile(r"\b(?:who is|who's|president|prime minister|ceo|champion|record)\b"), 24 * 3600),
+]
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def normalize_query(text: str) -> str:
+    t = " ".join(w for w in _WORD.findall((text or "").lower()) if w not in FILLER_WORDS)
+    return POLITE_PREFIX.sub("", t)
+
+
+def ttl_for(normalized: str) -> Optional[float]:
+    for pattern, ttl in TTL_RULES:
+        if pattern.search(normalized):
+            return ttl
+    return DEFAULT_TTL
+
+
+def content_words(normalized: str) -> Tuple[str, ...]:
+    """The query without stop words (empty = too vague to match loosely)."""
+    return tuple(w for w in normalized.split() if w not in STOP_WORDS)
+
+
+def similarity(a: Tuple[str, ...], b: Tuple[str, ...]) -> float:
+    """
+    Word-bigram Jaccard of two content_words() tuples, or 0.0 when they
+    can't be the same question: the numbers differ, a negation was added,
+    or each has a word the other lacks ("india" / "indiana"). So a
+    near-duplicate only adds or drops words, and only a few of them.
+    """
+    if not a or not b:
+        return 0.0
+    wa, wb = set(a), set(b)
+    if not (wa <= wb or wb <= wa):
+        return 0.0
+    if [w for w in a if w[0].isdigit()] != [w for w in b if w[0].isdigit()]:
+        return 0.0
+    if (wa ^ wb) & NEGATIONS:
+        return 0.0
+    ga = set(zip(("^",) + a, a + ("$",)))
+    gb = set(zip(("^",) + b, b + ("$",)))
+    return len(ga & gb) / len(ga | gb)
+
+
+class ResponseCache:
+    """
+    Cache of chat replies keyed on the normalized question.
+
+    Exact hits are a dict lookup. Otherwise near-duplicates ("what is the
+    capital of india" / "capital of india") are looked up through an index
+    of content words and scored with similarity(); the best one at or
+    above SIMILARITY answers. "25 times 4" never answers "25 times 5" and
+    "india" never answers "indiana". Entries expire after a per-query TTL (TTL_RULES decides;
+    time-sensitive and context-dependent questions bypass the cache
+    entirely), the cache is LRU-capped, and it is saved to a JSON file so
+    it survives restarts; put() writes that file, so callers on the event
+    loop run it in a thread.
+    """
+
+    def __init__(self, path, max_entries: int = MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()   # key -> entry
+        self._index: Dict[str, Set[str]] = {}                     # model + content word -> keys
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._load()
+
+    # ---------- public ----------
+
+    def get(self, text: str, model: str = "") -> Optional[str]:
+        query = normalize_query(text)
+        if not query or ttl_for(query) is None:
+            with self._lock:
+                self.bypassed += 1
+            return None
+
+        now = time.time()
+        with self._lock:
+            key = f"{model}\0{query}"
+            entry = self._entries.get(key)
+            if entry is None:
+                key = self._nearest_locked(query, model)
+                entry = self._entries.get(key) if key else None
+                if entry is not None:
+                    self.near_hits += 1
+
+            if entry is None or entry["expires"] < now:
+                if entry is not None:
+                    self._drop_locked(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["reply"]
+
+    def put(self, text: str, reply: str, model: str = ""):
+        query = normalize_query(text)
+        ttl = ttl_for(query) if query else None
+        if ttl is None or not reply:
+            return
+
+        with self._lock:
+            key = f"{model}\0{query}"
+            self._drop_locked(key)
+            self._entries[key] = {"query": query, "model": model, "reply": reply,
+                                  "expires": time.time() + ttl}
+            self._index_locked(key, query, model)
+            while len(self._entries) > self.max_entries:
+                self._drop_locked(next(iter(self._entries)))
+        self._save()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    # ---------- internals ----------
+
+    def _index_locked(self, key: str, query: str, model: str):
+        for word in set(content_words(query)):
+            self._index.setdefault(f"{model}\0{word}", set()).add(key)
+
+    def _nearest_locked(self, query: str, model: str) -> Optional[str]:
+        words = content_words(query)
+        if not words:
+            return None
+        # only entries sharing a content word with us can score above zero
+        candidates = set()
+        for word in set(words):
+            candidates |= self._index.get(f"{model}\0{word}", set())
+
+        best, best_score = None, SIMILARITY
+        for key in candidates:
+            score = similarity(words, content_words(self._entries[key]["query"]))
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+    def _drop_locked(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for word in set(content_words(entry["query"])):
+            near = f"{entry['model']}\0{word}"
+            keys = self._index.get(near)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[near]
+
+    def _load(self):
+        try:
+            entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for entry in entries:   # saved oldest -> newest, so LRU order survives
+            try:
+                if entry["expires"] < now:
+                    continue
+                key = f"{entry['model']}\0{entry['query']}"
+                self._entries[key] = entry
+                self._index_locked(key, entry["query"], entry["model"])
+            except (KeyError, TypeError):
+                continue
+
+    def _save(self):
+        tmp = self.path.with_suffix(".tmp")
+        # snapshot and write under one lock, so an older snapshot can't land last
+        with self._save_lock:
+            with self._lock:
+                entries = list(self._entries.values())
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps(entries))
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"[CHAT-CACHE] Could not write {self.path.name}: {e}")
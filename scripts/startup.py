@@ -0,0 +1,137 @@
+# scripts/startup.py
+
+import asyncio
+import importlib
+import json
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+_T0 = time.perf_counter()
+
+
+def since_start() -> float:
+    return time.perf_counter() - _T0
+
+
+class StartupReport:
+    """
+    Collects startup stage timings (foreground stages, background warm-ups,
+    and how long callers had to wait for a model that wasn't ready yet).
+    """
+
+    def __init__(self):
+        self.rows = []
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, start: float, duration: float):
+        with self._lock:
+            self.rows.append({"kind": kind, "name": name,
+                              "start_ms": round(start * 1000), "ms": round(duration * 1000)})
+
+    def stage(self, name: str):
+        """with REPORT.stage("calibration"): ..."""
+        return _Stage(self, name)
+
+    def print(self):
+        with self._lock:
+            rows = sorted(self.rows, key=lambda r: r["start_ms"])
+        print("[STARTUP] ---------------- startup report ----------------")
+        for r in rows:
+            print(f"[STARTUP] {r['kind']:8s} {r['name']:28s} at {r['start_ms']:6d} ms  took {r['ms']:6d} ms")
+        print("[STARTUP] -------------------------------------------------")
+
+    def dump(self, path):
+        with self._lock:
+            rows = list(self.rows)
+        with open(path, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+class _Stage:
+    def __init__(self, report: StartupReport, name: str):
+        self.report = report
+        self.name = name
+
+    def __enter__(self):
+        self.start = since_start()
+        return self
+
+    def __exit__(self, *exc):
+        self.report.record("stage", self.name, self.start, since_start() - self.start)
+        return False
+
+
+REPORT = StartupReport()
+
+
+class Warmup:
+    """
+    Background loaders for heavy modules / models.
+
+    start() runs a loader in a daemon thread right away; get() returns its
+    result, blocking only if it isn't ready yet (and the wait is reported).
+    A loader that raises yields None, so callers can degrade gracefully;
+    callers that can't pass required=True and get the loader's error
+    raised instead.
+    """
+
+    def __init__(self, report: StartupReport = REPORT):
+        self.report = report
+        self._results: Dict[str, object] = {}
+        self._errors: Dict[str, Exception] = {}
+        self._events: Dict[str, threading.Event] = {}
+
+    def start(self, name: str, loader: Callable[[], object]):
+        if name in self._events:
+            return
+        done = threading.Event()
+        self._events[name] = done
+
+        def _run():
+            t0 = since_start()
+            try:
+                self._results[name] = loader()
+            except Exception as e:
+                print(f"[STARTUP] warm-up {name!r} failed: {e}")
+                self._results[name] = None
+                self._errors[name] = e
+            finally:
+                self.report.record("warm", name, t0, since_start() - t0)
+                done.set()
+
+        threading.Thread(target=_run, name=f"warm-{name}", daemon=True).start()
+
+    def start_import(self, name: str, module: str):
+        self.start(name, lambda: importlib.import_module(module))
+
+    def ready(self, name: str) -> bool:
+        ev = self._events.get(name)
+        return ev is not None and ev.is_set()
+
+    def get(self, name: str, timeout: Optional[float] = None, required: bool = False):
+        ev = self._events[name]
+        if not ev.is_set():
+            t0 = since_start()
+            print(f"[STARTUP] waiting for {name!r}...")
+            ev.wait(timeout)
+            self.report.record("waited", name, t0, since_start() - t0)
+        return self._result(name, required)
+
+    async def aget(self, name: str, required: bool = False):
+        """get() that doesn't block the event loop."""
+        if self.ready(name):
+            return self._result(name, required)
+        return await asyncio.to_thread(self.get, name, None, required)
+
+    def _result(self, name: str, required: bool):
+        if required and name in self._errors:
+            raise RuntimeError(f"warm-up {name!r} failed: {self._errors[name]}") from self._errors[name]
+        return self._results.get(name)
+
+    def wait_all(self):
+        for ev in list(self._events.values()):
+            ev.wait()
+
+
+WARMUP = Warmup()
@@ -1,141 +1,314 @@
 # scripts/telegram_bot.py
 
-from typing import Optional, Tuple
+import asyncio
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Set, Tuple, Union
 
-from telethon import TelegramClient
+from telethon import TelegramClient, events, utils
 from telethon.errors import FloodWaitError, RPCError
 
+from scripts.dialog_index import DialogIndex, DialogMatch
+from scripts.dialog_snapshot import FULL_SYNC_EVERY, DialogRef, DialogSnapshot
+from scripts.telegram_outbox import Delivery, Outbox
+
 API_ID = 35010936
 API_HASH = "ebea5ed66cad2c023c000cc7e284ac21"
 SESSION = "leo_telegram"
 
 client = TelegramClient(SESSION, API_ID, API_HASH)
 
-# Simple in-memory cache so we don't spam Telegram
-DIALOG_CACHE = None   # will become a list of dialogs
-LAST_CONTACT: Optional[str] = None
+# Dialogs are kept on disk and reconciled with Telegram in the background,
+# so lookups work from the first second and don't spam get_dialogs()
+SNAPSHOT_PATH = Path(__file__).resolve().parent.parent / "cache" / "telegram" / "dialogs.json"
+SNAPSHOT = DialogSnapshot(SNAPSHOT_PATH)
+DIALOG_INDEX = DialogIndex()   # name lookups over SNAPSHOT.dialogs
+SAVE_DELAY = 5.0               # seconds; snapshot writes after events are batched
+RESYNC_AFTER = 15 * 60         # seconds; a lookup after this long starts another sync
+LAST_CONTACT: Optional[int] = None   # dialog id of the chat last sent to / read
+
+# a match scoring below this (every "sounds_like" one) may well be the
+# wrong person: callers confirm it before acting on it
+CONFIRM_BELOW = 0.7
+
+_SYNC_TASK: Optional[asyncio.Task] = None
+_SYNCED_AT = 0.0               # monotonic time the last sync finished
+_SAVE_TASK: Optional[asyncio.Task] = None
+
+# Outgoing messages go through a paced queue (FloodWait is retried there);
+# set OUTBOX.on_status to hear about deliveries sent with wait=False.
+OUTBOX = Outbox(lambda chat_id, text: client.send_message(chat_id, text))
+
+# Recent incoming messages per chat, kept current by the NewMessage handler
+# so read_latest_message() doesn't need an RPC per request.
+RECENT_PER_CHAT = 20
+RECENT: Dict[int, Deque] = {}   # chat id -> messages, oldest -> newest
+_HISTORY_LOADED: Set[int] = set()   # chats whose buffer also covers history from before startup
+
+
+def _load_snapshot():
+    if not SNAPSHOT.loaded:
+        SNAPSHOT.load()
+        DIALOG_INDEX.sync(SNAPSHOT.dialogs.values())
 
 
 async def _ensure_client():
     """Make sure the client is connected & logged in."""
     if not client.is_connected():
+        # the event handlers update SNAPSHOT.dialogs as soon as the client
+        # runs, so the snapshot must be in place before (load() replaces it)
+        _load_snapshot()
         await client.start()
 
 
-async def _load_dialogs(force: bool = False):
+async def _load_dialogs():
     """
-    Load dialogs once and reuse them.
-    This avoids calling get_dialogs() on every send/read.
+    Make the dialog index usable. The snapshot from disk is loaded at
+    once and a background task reconciles it with Telegram, again on the
+    first lookup after RESYNC_AFTER. Only when there is no snapshot yet
+    do callers wait for that first sync.
     """
-    global DIALOG_CACHE
+    global _SYNC_TASK
+    _load_snapshot()
     await _ensure_client()
+    stale = time.monotonic() - _SYNCED_AT > RESYNC_AFTER
+    if _SYNC_TASK is None or (_SYNC_TASK.done() and (stale or not SNAPSHOT.dialogs)):
+        _SYNC_TASK = asyncio.get_running_loop().create_task(_reconcile())
+    if not SNAPSHOT.dialogs:
+        await asyncio.shield(_SYNC_TASK)
 
-    if DIALOG_CACHE is None or force:
-        # limit=200 is usually enough; avoids unnecessary load
-        DIALOG_CACHE = await client.get_dialogs(limit=200)
 
+def _upsert(ref: DialogRef):
+    known = SNAPSHOT.dialogs.get(ref.id)
+    if known is not None and known.name == ref.name:
+        known.date = max(known.date, ref.date)
+        return
+    SNAPSHOT.dialogs[ref.id] = ref
+    DIALOG_INDEX.add(ref)
 
-async def find_dialog(name: str):
-    """Return dialog whose name contains the given text (case-insensitive)."""
+
+async def _reconcile():
+    """
+    Bring the snapshot up to date. Dialogs are paged newest first (no
+    cap); normally the walk stops at the first one that hasn't been
+    active since the last sync. Once every FULL_SYNC_EVERY the whole
+    list is walked, to also drop chats that are gone.
+    """
+    global _SYNCED_AT
+    full = time.time() - SNAPSHOT.full_sync_at > FULL_SYNC_EVERY or not SNAPSHOT.dialogs
+    newest = SNAPSHOT.synced_until
+    seen = set()
+    t0 = time.perf_counter()
+    try:
+        async for d in client.iter_dialogs():
+            date = d.date.timestamp() if d.date else 0.0
+            # pinned chats come first whatever their date
+            if not full and not d.pinned and date <= SNAPSHOT.synced_until and d.id in SNAPSHOT.dialogs:
+                break
+            _upsert(DialogRef(d.id, d.name or "", date))
+            seen.add(d.id)
+            newest = max(newest, date)
+    except Exception as e:
+        print(f"[TG] Dialog sync stopped: {e}")
+        return
+
+    if full:
+        for dialog_id in SNAPSHOT.missing(seen):
+            del SNAPSHOT.dialogs[dialog_id]
+            DIALOG_INDEX.remove(dialog_id)
+        SNAPSHOT.full_sync_at = time.time()
+    SNAPSHOT.synced_until = newest
+    _SYNCED_AT = time.monotonic()
+    print(f"[TG] Dialogs synced ({'full' if full else 'incremental'}): {len(seen)} fetched, "
+          f"{len(SNAPSHOT.dialogs)} known, {(time.perf_counter() - t0) * 1000:.0f} ms")
+    await asyncio.to_thread(SNAPSHOT.save, SNAPSHOT.rows())
+
+
+def _schedule_save():
+    global _SAVE_TASK
+    if _SAVE_TASK is not None and not _SAVE_TASK.done():
+        return
+
+    async def _later():
+        await asyncio.sleep(SAVE_DELAY)
+        await asyncio.to_thread(SNAPSHOT.save, SNAPSHOT.rows())
+
+    _SAVE_TASK = asyncio.get_running_loop().create_task(_later())
+
+
+@client.on(events.ChatAction)
+async def _on_chat_action(event):
+    # a group / channel was renamed: re-index it under the new title
+    ref = SNAPSHOT.dialogs.get(event.chat_id)
+    if event.new_title and ref is not None:
+        _upsert(DialogRef(ref.id, event.new_title, ref.date))
+        _schedule_save()
+
+
+def _remember(chat_id: int, messages):
+    """Merge incoming `messages` into the chat's buffer (by id, bounded)."""
+    buf = RECENT.get(chat_id)
+    if buf is None:
+        buf = RECENT[chat_id] = deque(maxlen=RECENT_PER_CHAT)
+    known = {m.id: i for i, m in enumerate(buf)}
+    merged = list(buf)
+    for m in messages:
+        if m.id in known:
+            merged[known[m.id]] = m     # edited
+        else:
+            merged.append(m)
+    merged.sort(key=lambda m: m.id)
+    buf.clear()
+    buf.extend(merged)
+
+
+@client.on(events.NewMessage)
+async def _on_new_message(event):
+    if not event.out:
+        _remember(event.chat_id, [event.message])
+
+    # a chat we have never seen (new contact, just added to a group):
+    # the update carries the entity, so this needs no extra request
+    if event.chat_id not in SNAPSHOT.dialogs:
+        chat = await event.get_chat()
+        if chat is not None:
+            _upsert(DialogRef(event.chat_id, utils.get_display_name(chat), event.date.timestamp()))
+            _schedule_save()
+
+
+@client.on(events.MessageEdited(incoming=True))
+async def _on_message_edited(event):
+    # only keep edits of messages we still hold, don't let them grow the buffer
+    buf = RECENT.get(event.chat_id)
+    if buf and any(m.id == event.message.id for m in buf):
+        _remember(event.chat_id, [event.message])
+
+
+async def resolve_contact(name: str) -> Optional[DialogMatch]:
+    """
+    Best dialog for a spoken `name`, with how it matched and a score:
+    exact name, then whole words, then word prefixes, then substring,
+    then by sound for names ASR spelled by ear (see DialogIndex).
+    """
     if not name:
         return None
 
     await _load_dialogs()
-    name = name.lower().strip()
+    match = DIALOG_INDEX.best(name)
+    if match and match.kind != "exact":
+        print(f"[TG] {name!r} -> {match.dialog.name!r} ({match.kind}, score {match.score:.2f})")
+    return match
+
 
-    for d in DIALOG_CACHE:
-        if d.name and name in d.name.lower():
-            return d
+def needs_confirmation(match: DialogMatch) -> bool:
+    """True if `match` is only a guess ("dude" -> "Dad") the user should confirm."""
+    return match.kind == "sounds_like" or match.score < CONFIRM_BELOW
 
-    return None
+
+async def find_dialog(name: str):
+    """The dialog resolve_contact() picks for `name`, or None."""
+    match = await resolve_contact(name)
+    return match.dialog if match else None
 
 
-async def send_message(receiver: str, text: str) -> Tuple[bool, Optional[str]]:
+async def _confirmed_dialog(receiver: Union[str, DialogMatch]):
     """
-    Send a message to a contact or chat whose name contains `receiver`.
-    Returns (ok, error_message_or_None).
+    (dialog, None); (None, None) if nothing matches; (None, question) if
+    a name only resolves to a guess. A DialogMatch counts as confirmed.
+    """
+    match = receiver if isinstance(receiver, DialogMatch) else await resolve_contact(receiver)
+    if match is None:
+        return None, None
+    if match is not receiver and needs_confirmation(match):
+        return None, f"I'm not sure who {receiver} is. Did you mean {match.dialog.name}?"
+    return match.dialog, None
+
+
+async def send_message(receiver: Union[str, DialogMatch], text: str,
+                       wait: bool = True) -> Tuple[bool, Optional[str]]:
+    """
+    Send a message to the contact or chat that best matches `receiver`.
+    A name that only resolves to a guess (see needs_confirmation()) is
+    not sent to: resolve_contact() it, confirm it, and pass the match.
+    Returns (ok, error_message_or_None). With wait=False it returns as
+    soon as the message is queued; the outcome goes to OUTBOX.on_status.
     """
     global LAST_CONTACT
     await _ensure_client()
 
-    dlg = await find_dialog(receiver)
+    dlg, err = await _confirmed_dialog(receiver)
     if not dlg:
-        return False, "I couldn't find that contact on Telegram."
+        return False, err or "I couldn't find that contact on Telegram."
+
+    LAST_CONTACT = dlg.id
+    return await _submit(dlg, text, wait)
 
-    try:
-        await client.send_message(dlg.id, text)
-    except FloodWaitError as e:
-        return False, f"Telegram is rate-limiting us. Try again after {e.seconds} seconds."
-    except RPCError as e:
-        return False, f"Telegram error: {e}"
-    except Exception as e:
-        return False, f"Unexpected Telegram error: {e}"
 
-    LAST_CONTACT = dlg.name
-    return True, None
+async def _submit(dlg, text: str, wait: bool, kind: str = "message") -> Tuple[bool, Optional[str]]:
+    delivery: Delivery = OUTBOX.submit(dlg.id, text, label=dlg.name, kind=kind)
+    if not wait:
+        return True, None
+    return await delivery.wait()
 
 
-async def read_latest_message(target: str) -> Optional[str]:
+async def read_latest_message(target: Union[str, DialogMatch]) -> Optional[str]:
     """
-    Read the latest incoming message from `target`.
-    Returns the text, or a friendly string, or None if not found.
+    Read the latest incoming message from `target` (a name, or a match
+    as in send_message()). Returns the text, or a friendly string, or
+    None if not found.
     """
     global LAST_CONTACT
     await _ensure_client()
 
-    dlg = await find_dialog(target)
+    dlg, question = await _confirmed_dialog(target)
     if not dlg:
-        return None
+        return question
+
+    # messages that arrived while we were running are already in RECENT;
+    # older history is fetched once per chat, the first time it is read
+    if dlg.id not in _HISTORY_LOADED:
+        try:
+            msgs = await client.get_messages(dlg.id, limit=RECENT_PER_CHAT)
+        except FloodWaitError as e:
+            return f"Telegram is rate-limiting us. Try again after {e.seconds} seconds."
+        except RPCError as e:
+            return f"Telegram error: {e}"
+        except Exception as e:
+            return f"Unexpected Telegram error: {e}"
 
-    try:
-        msgs = await client.get_messages(dlg.id, limit=5)
-    except FloodWaitError as e:
-        return f"Telegram is rate-limiting us. Try again after {e.seconds} seconds."
-    except RPCError as e:
-        return f"Telegram error: {e}"
-    except Exception as e:
-        return f"Unexpected Telegram error: {e}"
-
-    for m in msgs:
         # incoming only
-        if not m.out:
-            LAST_CONTACT = dlg.name
-            return m.text or "(message without text)"
+        _remember(dlg.id, [m for m in msgs if not m.out])
+        _HISTORY_LOADED.add(dlg.id)
 
-    LAST_CONTACT = dlg.name
+    LAST_CONTACT = dlg.id
+    buf = RECENT.get(dlg.id)
+    if buf:
+        return buf[-1].text or "(message without text)"
     return "No incoming messages."
 
 
-async def reply_message(text: str) -> Tuple[bool, Optional[str]]:
+async def reply_message(text: str, wait: bool = True) -> Tuple[bool, Optional[str]]:
     """
-    Reply to the LAST_CONTACT.
-    Returns (ok, error_message_or_None).
+    Reply to the LAST_CONTACT (by dialog id, so no name lookup can pick
+    someone else).
+    Returns (ok, error_message_or_None); wait as in send_message().
     """
-    global LAST_CONTACT
     await _ensure_client()
 
-    if not LAST_CONTACT:
+    if LAST_CONTACT is None:
         return False, "There is no recent contact to reply to."
 
-    dlg = await find_dialog(LAST_CONTACT)
+    dlg = SNAPSHOT.dialogs.get(LAST_CONTACT)
     if not dlg:
         return False, "I can't find the last contact anymore."
 
-    try:
-        await client.send_message(dlg.id, text)
-    except FloodWaitError as e:
-        return False, f"Telegram is rate-limiting us. Try again after {e.seconds} seconds."
-    except RPCError as e:
-        return False, f"Telegram error: {e}"
-    except Exception as e:
-        return False, f"Unexpected Telegram error: {e}"
-
-    return True, None
+    return await _submit(dlg, text, wait, kind="reply")
 
 
 async def init():
     """
-    Call this once in main.py before using send/read/reply.
+    Call this once in main.py before using send/read/reply. Returns as
+    soon as the saved dialogs are loaded; syncing carries on behind.
     """
-    await _ensure_client()
-    await _load_dialogs(force=True)
+    await _load_dialogs()
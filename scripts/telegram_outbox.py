@@ -0,0 +1,211 @@
+# scripts/telegram_outbox.py
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from telethon.errors import FloodWaitError, RPCError, ServerError
+
+# ---------- CONFIG ----------
+
+# Telegram allows about one message per second in a chat and ~30 per second
+# overall; stay a little under that so FloodWait is the exception.
+PER_CHAT_RATE = 1.0      # messages per second, per chat
+PER_CHAT_BURST = 3
+GLOBAL_RATE = 20.0       # messages per second, all chats together
+GLOBAL_BURST = 20
+
+MAX_ATTEMPTS = 4         # network errors / flood waits before giving up
+MAX_FLOOD_WAIT = 300     # seconds; a longer FloodWait fails the message
+RETRY_BACKOFF = 2.0      # seconds, doubled per attempt (network errors)
+
+# worth sending again: the connection dropped or Telegram had a hiccup
+# (5xx). Anything else (an RPC rejection, telethon's ValueError for an
+# unknown entity) fails the message at once.
+TRANSIENT_ERRORS = (OSError, asyncio.TimeoutError, ServerError)
+
+
+class TokenBucket:
+    """`rate` tokens per second, up to `burst` saved up; hold() blocks it for a while."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._blocked_until = 0.0
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+            self.tokens = min(self.capacity, self.tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def hold(self, seconds: float):
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def full(self) -> bool:
+        now = time.monotonic()
+        return now >= self._blocked_until and self.tokens + (now - self._stamp) * self.rate >= self.capacity
+
+
+class Delivery:
+    """One queued message and what happened to it."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, chat_id, text: str, label: str = "", kind: str = "message"):
+        self.id = next(self._ids)
+        self.chat_id = chat_id
+        self.text = text
+        self.label = label              # chat name, for messages to the user
+        self.kind = kind                # message | reply
+        self.status = "queued"          # queued | sending | retrying | sent | failed
+        self.error: Optional[str] = None
+        self.retry_in: Optional[float] = None
+        self.attempts = 0
+        self.message = None             # the sent telethon Message
+        self._done = asyncio.get_running_loop().create_future()
+
+    @property
+    def done(self) -> bool:
+        return self._done.done()
+
+    async def wait(self, timeout: Optional[float] = None) -> Tuple[bool, Optional[str]]:
+        """(ok, error_message_or_None) once the message is sent or has failed."""
+        try:
+            await asyncio.wait_for(asyncio.shield(self._done), timeout)
+        except asyncio.TimeoutError:
+            return False, "Telegram hasn't confirmed the message yet."
+        return self.status == "sent", self.error
+
+    def __repr__(self):
+        return f"<Delivery {self.id} to {self.label or self.chat_id}: {self.status}>"
+
+
+class Outbox:
+    """
+    Outgoing message queue.
+
+    submit() returns at once with a Delivery; the message is sent in the
+    background, in order per chat, paced by a token bucket per chat and
+    one for all chats. A FloodWaitError pauses sending for the time
+    Telegram asks (all chats: the limit is per account) and the message
+    is retried; TRANSIENT_ERRORS are retried with backoff, anything else
+    fails the message at once. Status changes
+    are reported through `on_status(delivery)`, and Delivery.wait()
+    gives the final result to callers that want it.
+    """
+
+    def __init__(self, send: Callable[..., Awaitable],
+                 per_chat_rate: float = PER_CHAT_RATE, per_chat_burst: int = PER_CHAT_BURST,
+                 global_rate: float = GLOBAL_RATE, global_burst: int = GLOBAL_BURST,
+                 max_attempts: int = MAX_ATTEMPTS, max_flood_wait: float = MAX_FLOOD_WAIT,
+                 on_status: Optional[Callable[[Delivery], None]] = None):
+        self.send = send                    # async (chat_id, text) -> message
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self.max_attempts = max_attempts
+        self.max_flood_wait = max_flood_wait
+        self.on_status = on_status
+        self._global = TokenBucket(global_rate, global_burst)
+        self._buckets: Dict[object, TokenBucket] = {}
+        self._queues: Dict[object, Deque[Delivery]] = {}
+        self._workers: Dict[object, asyncio.Task] = {}
+
+    # ---------- public ----------
+
+    def submit(self, chat_id, text: str, label: str = "", kind: str = "message") -> Delivery:
+        """Queue `text` for `chat_id` (call from the event loop)."""
+        delivery = Delivery(chat_id, text, label, kind)
+        self._queues.setdefault(chat_id, deque()).append(delivery)
+        if chat_id not in self._workers:
+            self._workers[chat_id] = asyncio.get_running_loop().create_task(self._drain_chat(chat_id))
+        return delivery
+
+    def pending(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait for queued messages to go out (e.g. before exiting)."""
+        workers = list(self._workers.values())
+        if workers:
+            await asyncio.wait(workers, timeout=timeout)
+
+    # ---------- internals ----------
+
+    def _set(self, delivery: Delivery, status: str, error: Optional[str] = None):
+        delivery.status = status
+        delivery.error = error
+        if status in ("sent", "failed") and not delivery._done.done():
+            delivery._done.set_result(status)
+        if self.on_status is not None:
+            try:
+                self.on_status(delivery)
+            except Exception as e:
+                print(f"[TG-OUTBOX] status callback failed: {e}")
+
+    async def _drain_chat(self, chat_id):
+        queue = self._queues[chat_id]
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._buckets[chat_id] = TokenBucket(self.per_chat_rate, self.per_chat_burst)
+        try:
+            while queue:
+                await self._deliver(queue[0], bucket)
+                queue.popleft()
+        finally:
+            del self._workers[chat_id]
+            del self._queues[chat_id]
+            for delivery in queue:      # cancelled: don't leave anyone waiting
+                if not delivery.done:
+                    self._set(delivery, "failed", "Sending was cancelled.")
+            if bucket.full():
+                del self._buckets[chat_id]   # idle chats don't keep state
+
+    async def _deliver(self, delivery: Delivery, bucket: TokenBucket):
+        while True:
+            await bucket.acquire()
+            await self._global.acquire()
+            delivery.attempts += 1
+            self._set(delivery, "sending")
+            try:
+                delivery.message = await self.send(delivery.chat_id, delivery.text)
+                self._set(delivery, "sent")
+                return
+            except FloodWaitError as e:
+                if e.seconds > self.max_flood_wait or delivery.attempts >= self.max_attempts:
+                    self._set(delivery, "failed",
+                              f"Telegram is rate-limiting us. Try again after {e.seconds} seconds.")
+                    return
+                wait = e.seconds + 1
+                self._global.hold(wait)
+                delivery.retry_in = wait
+                self._set(delivery, "retrying", f"Telegram is rate-limiting us, retrying in {wait} seconds.")
+            except TRANSIENT_ERRORS as e:
+                if delivery.attempts >= self.max_attempts:
+                    self._set(delivery, "failed", f"Couldn't reach Telegram: {e}")
+                    return
+                wait = RETRY_BACKOFF * 2 ** (delivery.attempts - 1)
+                delivery.retry_in = wait
+                self._set(delivery, "retrying", f"Couldn't reach Telegram, retrying in {wait:.0f} seconds.")
+                await asyncio.sleep(wait)
+            except RPCError as e:
+                # the request itself was rejected; sending it again won't help
+                self._set(delivery, "failed", f"Telegram error: {e}")
+                return
+            except asyncio.CancelledError:
+                self._set(delivery, "failed", "Sending was cancelled.")
+                raise
+            except Exception as e:
+                self._set(delivery, "failed", f"Unexpected Telegram error: {e}")
+                return
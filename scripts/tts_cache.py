@@ -0,0 +1,127 @@
+# scripts/tts_cache.py
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+# ---------- CONFIG ----------
+
+DISK_LIMIT_BYTES = 200 * 1024 * 1024
+MEMORY_LIMIT_BYTES = 32 * 1024 * 1024
+
+
+def normalize_text(text: str) -> str:
+    """Case and whitespace don't change what the model says."""
+    return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+
+class AudioCache:
+    """
+    Content-addressed cache of synthesized PCM.
+
+    Key = sha256(model, voice, normalized text). Entries live in memory
+    (LRU, byte-capped) and on disk as raw PCM files (LRU by mtime, byte-capped),
+    so fixed phrases survive restarts.
+    """
+
+    def __init__(self, directory, model: str, voice: str = "default",
+                 disk_limit: int = DISK_LIMIT_BYTES,
+                 memory_limit: int = MEMORY_LIMIT_BYTES):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.model = model
+        self.voice = voice
+        self.disk_limit = disk_limit
+        self.memory_limit = memory_limit
+
+        self._mem: "OrderedDict[str, bytes]" = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        raw = f"{self.model}\0{self.voice}\0{normalize_text(text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.pcm"
+
+    def get(self, text: str) -> Optional[bytes]:
+        k = self.key(text)
+        with self._lock:
+            pcm = self._mem.get(k)
+            if pcm is not None:
+                self._mem.move_to_end(k)
+                self.hits += 1
+                return pcm
+
+        path = self._path(k)
+        try:
+            pcm = path.read_bytes()
+            os.utime(path)  # mark as recently used for disk LRU
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._remember(k, pcm)
+        return pcm
+
+    def contains(self, text: str) -> bool:
+        k = self.key(text)
+        with self._lock:
+            if k in self._mem:
+                return True
+        return self._path(k).exists()
+
+    def put(self, text: str, pcm: bytes):
+        if not pcm:
+            return
+        k = self.key(text)
+        path = self._path(k)
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_bytes(pcm)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[TTS-CACHE] Could not write {path.name}: {e}")
+
+        with self._lock:
+            self._remember(k, pcm)
+        self._trim_disk()
+
+    # ---------- LRU ----------
+
+    def _remember(self, key: str, pcm: bytes):
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._mem_bytes -= len(old)
+        self._mem[key] = pcm
+        self._mem_bytes += len(pcm)
+        while self._mem_bytes > self.memory_limit and len(self._mem) > 1:
+            _, evicted = self._mem.popitem(last=False)
+            self._mem_bytes -= len(evicted)
+
+    def _trim_disk(self):
+        try:
+            files = [(f.stat().st_mtime, f.stat().st_size, f) for f in self.dir.glob("*.pcm")]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        if total <= self.disk_limit:
+            return
+        for _, size, f in sorted(files):
+            try:
+                f.unlink()
+            except OSError:
+                continue
+            total -= size
+            if total <= self.disk_limit:
+                break
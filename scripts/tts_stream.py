@@ -0,0 +1,313 @@
+# scripts/tts_stream.py
+
+import queue
+import re
+import threading
+import time
+from typing import Iterable, List, Optional
+
+# ---------- CONFIG ----------
+
+CHUNK_FRAMES = 1024          # frames written to the sound card per call
+MAX_READY_SENTENCES = 2      # how far synthesis may run ahead of playback
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+|\n+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split a reply into sentence-sized pieces for synthesis.
+    Very short fragments ("Ok.") are glued to the next one so the
+    model doesn't produce clipped, unnatural audio.
+    """
+    parts = [p.strip() for p in _SENTENCE_END.split(text or "") if p and p.strip()]
+    out = []
+    carry = ""
+    for p in parts:
+        p = f"{carry} {p}".strip() if carry else p
+        if len(p) < 12:
+            carry = p
+            continue
+        out.append(p)
+        carry = ""
+    if carry:
+        if out:
+            out[-1] = f"{out[-1]} {carry}"
+        else:
+            out.append(carry)
+    return out
+
+
+class SentenceChunker:
+    """
+    Turns a stream of text fragments (LLM tokens) into whole sentences as
+    soon as they are complete, using the same rules as split_sentences().
+    """
+
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = min_chars
+        self._buf = ""
+
+    def feed(self, fragment: str) -> List[str]:
+        self._buf += fragment
+        parts = _SENTENCE_END.split(self._buf)
+        # the last part may still be growing
+        self._buf = parts.pop()
+        out = []
+        carry = ""
+        for p in parts:
+            p = f"{carry} {p.strip()}".strip() if carry else p.strip()
+            if not p:
+                continue
+            if len(p) < self.min_chars:
+                carry = p
+                continue
+            out.append(p)
+            carry = ""
+        if carry:
+            self._buf = f"{carry} {self._buf.lstrip()}"
+        return out
+
+    def flush(self) -> List[str]:
+        rest, self._buf = self._buf.strip(), ""
+        return [rest] if rest else []
+
+
+def to_pcm16(wav) -> bytes:
+    """Float samples in [-1, 1] (list or ndarray) -> little-endian int16 PCM."""
+    import numpy as np
+
+    samples = np.clip(np.asarray(wav, dtype=np.float32), -1.0, 1.0)
+    return (samples * 32767).astype("<i2").tobytes()
+
+
+class _Utterance:
+    def __init__(self, text: str, sentences: List[str], generation: int):
+        self.text = text
+        self.generation = generation
+        self.cancelled = False
+        self.remaining = len(sentences)
+        self.started = time.perf_counter()
+        self.first_audio: Optional[float] = None
+        self.done = threading.Event()
+
+
+class SpeechPipeline:
+    """
+    Sentence-level streaming TTS.
+
+    One thread synthesizes sentences into in-memory PCM buffers, another
+    writes them to a single long-lived PyAudio output stream. While sentence
+    N is playing, sentence N+1 is already being synthesized.
+    With an AudioCache attached, known sentences skip synthesis entirely.
+    cancel() stops playback within one chunk (barge-in).
+    """
+
+    def __init__(self, tts, sample_rate: Optional[int] = None, cache=None):
+        self.tts = tts
+        self.sample_rate = sample_rate or _tts_sample_rate(tts)
+        self.cache = cache
+        self._tts_lock = threading.Lock()  # the model is not thread-safe
+        self._text_q: "queue.Queue" = queue.Queue()
+        self._pcm_q: "queue.Queue" = queue.Queue(maxsize=MAX_READY_SENTENCES)
+        self._pa = None
+        self._stream = None
+        self._pending = 0                         # sentences queued but not played yet
+        self._pending_lock = threading.Lock()
+        self._generation = 0                      # bumped by cancel(); older work is dropped
+        self._active = set()
+        self.last_ttfa: Optional[float] = None   # seconds
+
+        # hooks: on_speaking(bool) when playback starts / drains,
+        # on_first_audio(utterance) when an utterance becomes audible,
+        # on_chunk(pcm) right before each chunk goes to the sound card
+        self.on_speaking = None
+        self.on_first_audio = None
+        self.on_chunk = None
+
+        threading.Thread(target=self._synth_loop, name="tts-synth", daemon=True).start()
+        threading.Thread(target=self._play_loop, name="tts-play", daemon=True).start()
+
+    # ---------- public ----------
+
+    def say(self, text: str, block: bool = True):
+        sentences = split_sentences(text)
+        if not sentences:
+            return None
+
+        with self._pending_lock:
+            utt = _Utterance(text, sentences, self._generation)
+            self._active.add(utt)
+            self._add_pending_locked(len(sentences))
+        for s in sentences:
+            self._text_q.put((utt, s))
+
+        if block:
+            utt.done.wait()
+        return utt
+
+    def cancel(self) -> bool:
+        """
+        Drop everything queued or playing. Sentences already handed to the
+        synthesizer are discarded when they come out. Returns False if
+        nothing was playing.
+        """
+        with self._pending_lock:
+            if self._pending == 0:
+                return False
+            self._generation += 1
+            stale = list(self._active)
+            self._active.clear()
+            self._add_pending_locked(-self._pending)
+
+        for utt in stale:
+            utt.cancelled = True
+            utt.done.set()
+        print("[TTS] Playback interrupted")
+        return True
+
+    @property
+    def speaking(self) -> bool:
+        return self._pending > 0
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far has been played."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self._pending > 0:
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+            time.sleep(0.02)
+        return True
+
+    def prewarm(self, phrases: Iterable[str]):
+        """Synthesize phrases into the cache in the background."""
+        if self.cache is None:
+            return None
+
+        def _run():
+            t0 = time.perf_counter()
+            added = 0
+            for phrase in phrases:
+                for sentence in split_sentences(phrase):
+                    if self.cache.contains(sentence):
+                        continue
+                    try:
+                        self._synthesize(sentence)
+                        added += 1
+                    except Exception as e:
+                        print(f"[TTS-CACHE] Pre-warm failed for {sentence!r}: {e}")
+            print(f"[TTS-CACHE] Pre-warmed {added} phrases in {time.perf_counter() - t0:.1f}s")
+
+        t = threading.Thread(target=_run, name="tts-prewarm", daemon=True)
+        t.start()
+        return t
+
+    def close(self):
+        if self._stream is not None:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+        if self._pa is not None:
+            self._pa.terminate()
+            self._pa = None
+
+    # ---------- workers ----------
+
+    def _synth_loop(self):
+        while True:
+            utt, sentence = self._text_q.get()
+            if utt.generation != self._generation:
+                continue
+            try:
+                pcm = self._synthesize(sentence)
+            except Exception as e:
+                print(f"[WARN] TTS failed: {e}")
+                print(f"[SPEAK-FALLBACK] {sentence}")
+                pcm = b""
+            self._pcm_q.put((utt, pcm))
+
+    def _synthesize(self, sentence: str) -> bytes:
+        if self.cache is not None:
+            pcm = self.cache.get(sentence)
+            if pcm is not None:
+                return pcm
+
+        with self._tts_lock:
+            pcm = to_pcm16(self.tts.tts(text=sentence))
+
+        if self.cache is not None:
+            self.cache.put(sentence, pcm)
+        return pcm
+
+    def _play_loop(self):
+        while True:
+            utt, pcm = self._pcm_q.get()
+            if utt.generation != self._generation:
+                continue
+            try:
+                if pcm:
+                    self._play(utt, pcm)
+            except Exception as e:
+                print(f"[WARN] Audio playback failed: {e}")
+            finally:
+                self._sentence_done(utt)
+
+    def _sentence_done(self, utt: _Utterance):
+        with self._pending_lock:
+            if utt.generation != self._generation:
+                return  # cancelled while playing; cancel() did the bookkeeping
+            utt.remaining -= 1
+            if utt.remaining <= 0:
+                self._active.discard(utt)
+                utt.done.set()
+            self._add_pending_locked(-1)
+
+    def _add_pending_locked(self, n: int):
+        # called under _pending_lock so start/stop notifications stay ordered
+        before = self._pending
+        self._pending += n
+        if self.on_speaking and (before == 0) != (self._pending == 0):
+            try:
+                self.on_speaking(self._pending > 0)
+            except Exception as e:
+                print(f"[TTS] on_speaking hook failed: {e}")
+
+    def _play(self, utt: _Utterance, pcm: bytes):
+        stream = self._ensure_stream()
+        step = CHUNK_FRAMES * 2  # int16 mono
+        for i in range(0, len(pcm), step):
+            if utt.generation != self._generation:
+                return  # barge-in: stop within one chunk
+            chunk = pcm[i:i + step]
+            if utt.first_audio is None:
+                utt.first_audio = time.perf_counter()
+                self.last_ttfa = utt.first_audio - utt.started
+                print(f"[TTS] time-to-first-audio: {self.last_ttfa * 1000:.0f} ms")
+                if self.on_first_audio:
+                    self.on_first_audio(utt)
+            if self.on_chunk:
+                self.on_chunk(chunk)
+            stream.write(chunk)
+
+    def _ensure_stream(self):
+        if self._stream is None:
+            import pyaudio
+            self._pa = pyaudio.PyAudio()
+            self._stream = self._pa.open(
+                format=pyaudio.paInt16,
+                channels=1,
+                rate=self.sample_rate,
+                output=True,
+                frames_per_buffer=CHUNK_FRAMES,
+            )
+        return self._stream
+
+
+def _tts_sample_rate(tts) -> int:
+    try:
+        return int(tts.synthesizer.output_sample_rate)
+    except Exception:
+        return 22050  # ljspeech models
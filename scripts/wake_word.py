@@ -0,0 +1,131 @@
+# scripts/wake_word.py
+
+import json
+import threading
+import time
+from typing import Iterable, List, Optional
+
+# ---------- CONFIG ----------
+
+WINDOW_SECONDS = 2.0        # idle decoder (empty partial result) is reset after this much audio
+MAX_WINDOW_SECONDS = 20.0   # hard cap for speech that never reaches an endpoint
+
+_MODELS = {}
+_MODELS_LOCK = threading.Lock()   # startup and the "asr" warm-up may ask for the same model at once
+
+
+def load_vosk_model(path, tag: str = "WAKE"):
+    """
+    Load a Vosk model once (shared by the wake spotter and the offline ASR).
+    Returns None (and logs why, under `tag`) when vosk or the model
+    directory is missing, so callers can fall back.
+    """
+    key = str(path)
+    with _MODELS_LOCK:
+        if key not in _MODELS:
+            _MODELS[key] = _load_vosk_model(key, tag)
+        return _MODELS[key]
+
+
+def _load_vosk_model(path: str, tag: str):
+    try:
+        from vosk import Model, SetLogLevel
+    except ImportError:
+        print(f"[{tag}] vosk is not installed, offline recognition disabled.")
+        return None
+
+    SetLogLevel(-1)
+    try:
+        return Model(path)
+    except Exception as e:
+        print(f"[{tag}] Could not load Vosk model at {path}: {e}")
+        return None
+
+
+class WakeWordSpotter:
+    """
+    Offline keyword spotter.
+
+    Audio frames are pushed in continuously; a Vosk recognizer restricted
+    to a grammar of the wake phrases decodes them, and the partial
+    hypothesis is checked after every frame, so it fires mid-utterance
+    instead of waiting for end of speech. The decoder is reset after a
+    final result (Vosk's endpoint, i.e. a pause), or once WINDOW_SECONDS
+    have gone by with nothing in the partial result, so it is never cut
+    off in the middle of a phrase; MAX_WINDOW_SECONDS bounds CPU and
+    memory when speech never pauses.
+    """
+
+    def __init__(self, model, phrases: Iterable[str], sample_rate: int,
+                 window_seconds: float = WINDOW_SECONDS, max_window_seconds: float = MAX_WINDOW_SECONDS):
+        from vosk import KaldiRecognizer
+
+        self.phrases = _unique_phrases(phrases)
+        self.sample_rate = sample_rate
+        self.window_bytes = int(window_seconds * sample_rate) * 2  # int16 mono
+        self.max_window_bytes = int(max_window_seconds * sample_rate) * 2
+        grammar = json.dumps(self.phrases + ["[unk]"])
+        self._rec = KaldiRecognizer(model, sample_rate, grammar)
+        self._fed = 0
+
+    def reset(self):
+        self._rec.Reset()
+        self._fed = 0
+
+    def accept(self, frame: bytes) -> Optional[str]:
+        """Feed one frame of int16 mono PCM. Returns the phrase when it fires."""
+        final = self._rec.AcceptWaveform(frame)
+        self._fed += len(frame)
+
+        if final:
+            text = json.loads(self._rec.Result()).get("text", "")
+        else:
+            text = json.loads(self._rec.PartialResult()).get("partial", "")
+
+        hit = self._match(text)
+        idle = not text and self._fed >= self.window_bytes
+        if hit or final or idle or self._fed >= self.max_window_bytes:
+            self.reset()
+        return hit
+
+    def listen(self, frames: Iterable[bytes]) -> Optional[str]:
+        """Consume frames until a wake phrase is heard (or frames run out)."""
+        for frame in frames:
+            hit = self.accept(frame)
+            if hit:
+                return hit
+        return None
+
+    def _match(self, text: str) -> Optional[str]:
+        if not text:
+            return None
+        text = f" {text} "
+        # longest phrase first so "hey leo" wins over "leo"
+        for p in self.phrases:
+            if f" {p} " in text:
+                return p
+        return None
+
+
+def _unique_phrases(phrases: Iterable[str]) -> List[str]:
+    seen = []
+    for p in phrases:
+        p = " ".join(p.lower().split())
+        if p and p not in seen:
+            seen.append(p)
+    return sorted(seen, key=len, reverse=True)
+
+
+def benchmark_frames(spotter: WakeWordSpotter, pcm: bytes, frame_bytes: int):
+    """
+    Run a whole PCM clip through the spotter as if it were live.
+    Returns (phrase_or_None, fire_time_seconds_into_clip, cpu_seconds).
+    """
+    spotter.reset()
+    cpu0 = time.process_time()
+    for i in range(0, len(pcm), frame_bytes):
+        hit = spotter.accept(pcm[i:i + frame_bytes])
+        if hit:
+            fired_at = (i + frame_bytes) / 2 / spotter.sample_rate
+            return hit, fired_at, time.process_time() - cpu0
+    return None, None, time.process_time() - cpu0
@@ -0,0 +1,13 @@
+from scripts.commands import MAIN_COMMANDS, YOUTUBE_COMMANDS
+
+
+def test_leading_command_word_picks_the_route():
+    assert MAIN_COMMANDS.match("send message to ashu saying play the new song").name == "telegram"
+    assert MAIN_COMMANDS.match("reply to ashu i'll watch it on youtube").name == "telegram"
+    assert MAIN_COMMANDS.match("play believer and send it to ashu").name == "youtube"
+    assert MAIN_COMMANDS.match("set the brightness to 40").slots == {"value": 40}
+
+
+def test_youtube_mode_keeps_priority_order():
+    assert YOUTUBE_COMMANDS.match("play the next song").name == "next"
+    assert YOUTUBE_COMMANDS.match("skip").name == "skip_ad"
@@ -0,0 +1,38 @@
+from scripts.intent_grammar import INTENT_GRAMMAR
+
+
+def test_earliest_command_wins():
+    intent, _ = INTENT_GRAMMAR.match("send message to ashu saying set the brightness to 50")
+    assert intent == {"action": "send_telegram", "target": "ashu", "message": "set the brightness to 50"}
+
+    intent, _ = INTENT_GRAMMAR.match("reply to ashu play believer on youtube")
+    assert intent["action"] == "reply_telegram"
+
+
+def test_priority_breaks_ties_at_the_same_word():
+    assert INTENT_GRAMMAR.match("play believer on youtube")[0] == {"action": "open_youtube", "query": "believer"}
+    assert INTENT_GRAMMAR.match("send message to the group family dinner at 8")[0]["action"] == "send_telegram_group"
+
+
+def test_chatter_before_the_command_is_skipped():
+    intent, confidence = INTENT_GRAMMAR.match("i read the text message and then send message to mom saying hi")
+    assert intent == {"action": "send_telegram", "target": "mom", "message": "hi"}
+    assert confidence == 0.9
+
+
+def test_only_a_separator_makes_the_target_certain():
+    from scripts.nlp_controller import CONFIDENCE_THRESHOLD
+
+    for text in ("send message to ashu kumar hello", "send a telegram message to rahul hello bro",
+                 "reply to ashu ok", "read the message from ashu and reply"):
+        assert INTENT_GRAMMAR.match(text)[1] < CONFIDENCE_THRESHOLD, text
+
+    intent, confidence = INTENT_GRAMMAR.match("send a message to the family group saying hi")
+    assert intent["target"] == "family group" and confidence >= CONFIDENCE_THRESHOLD
+    intent, _ = INTENT_GRAMMAR.match("send message to ashu kumar saying hi")
+    assert intent == {"action": "send_telegram", "target": "ashu kumar", "message": "hi"}
+
+
+def test_reply_to_this_message_names_no_contact():
+    intent, _ = INTENT_GRAMMAR.match("reply to this message saying yes")
+    assert intent == {"action": "reply_telegram", "target": None, "message": "yes"}
@@ -0,0 +1,52 @@
+from scripts.response_cache import ResponseCache, normalize_query
+
+
+def make_cache(tmp_path):
+    return ResponseCache(tmp_path / "responses.json")
+
+
+def test_numbers_must_match(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("what is 25 times 4", "100")
+    cache.put("square root of 144", "12")
+    assert cache.get("what is 25 times 4") == "100"
+    assert cache.get("what is 25 times 5") is None
+    assert cache.get("square root of 169") is None
+    assert cache.get("square root of 14") is None
+
+
+def test_near_duplicates_hit(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("capital of india", "New Delhi")
+    assert cache.get("what is the capital of india") == "New Delhi"
+    assert cache.get("what's the capital of india") == "New Delhi"
+    assert cache.stats()["near_hits"] == 2
+
+
+def test_different_content_words_miss(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("capital of india", "New Delhi")
+    cache.put("how do i make pasta", "Boil it.")
+    assert cache.get("capital of indiana") is None
+    assert cache.get("capital of india in 1900") is None
+    assert cache.get("history and capital of india") is None   # below SIMILARITY
+    assert cache.get("how do i not make pasta") is None
+
+
+def test_stop_words_may_differ(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("what can you do", "I can open apps and send messages.")
+    assert cache.get("what all can you do") == "I can open apps and send messages."
+    assert cache.get("um what can you really do") == "I can open apps and send messages."
+    assert cache.stats()["near_hits"] == 2
+
+
+def test_near_duplicates_survive_reload(tmp_path):
+    make_cache(tmp_path).put("who made you", "Nashed did.")
+    assert make_cache(tmp_path).get("who all made you") == "Nashed did."
+
+
+def test_meaningful_words_are_kept():
+    assert normalize_query("I like pizza") == "i like pizza"
+    assert normalize_query("so what is it") == "so what is it"
+    assert normalize_query("um hey Leo, please open chrome") == "open chrome"
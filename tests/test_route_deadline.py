@@ -0,0 +1,43 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from fake_llm_server import FakeLLMServer
+from scripts import conversation_llm, llm_backend, nlp_controller
+from scripts.response_cache import ResponseCache
+
+UTTERANCE = "send to ashu hi there"   # rules: confidence 0.7, asks the LLM
+LLM_REPLY = '{"action": "send_telegram", "target": "ashu", "message": "from the llm"}'
+
+
+def route(tmp_path, latency, deadline):
+    conversation_llm.CACHE = ResponseCache(tmp_path / "responses.json", max_entries=0)
+    conversation_llm.MEMORY.clear()
+    fallback = nlp_controller.rule_based_parse(UTTERANCE)
+
+    async def run():
+        with FakeLLMServer(latency=latency, reply=LLM_REPLY) as server:
+            llm_backend.register_backend("gemini", lambda: llm_backend.GeminiBackend(endpoint=server.url))
+            try:
+                return await conversation_llm.route_within(UTTERANCE, fallback, deadline=deadline)
+            finally:
+                await llm_backend.get_backend().aclose()
+
+    return asyncio.run(run())
+
+
+def test_llm_wins_within_the_deadline(tmp_path):
+    intent, answer = route(tmp_path, latency=0.05, deadline=2.0)
+    assert answer is None
+    assert intent["message"] == "from the llm"
+
+
+def test_rules_win_after_the_deadline(tmp_path):
+    misses = nlp_controller.parse_stats()["deadline_misses"]
+    intent, answer = route(tmp_path, latency=1.0, deadline=0.2)
+    assert answer is None
+    assert intent == nlp_controller.rule_based_parse(UTTERANCE)
+    assert intent["message"] == "hi there"
+    assert nlp_controller.parse_stats()["deadline_misses"] == misses + 1